@@ -0,0 +1,131 @@
+# ruff: noqa: INP001
+"""partition feed_post by published_at
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2023-09-12 21:17:43.103529
+
+"""
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# the monthly partitions are created for this many months back, the older posts
+# are left in the default partition, `retention partitions` takes it from there
+MONTHS_BACK = 12
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, feed_id, title, summary, url, guid, published_at, created_at"
+
+
+def _create_feed_post_table(*constraints: sa.Constraint, **kwargs: Any) -> None:
+    op.create_table(
+        "feed_post",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('feed_post_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("feed_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("guid", sa.Text(), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["feed_id"], ["feed.id"], name="feed_post_feed_id_fkey"),
+        *constraints,
+        **kwargs,
+    )
+
+
+def _rename_feed_post_table(new_name: str, unique_constraint: str) -> None:
+    op.rename_table("feed_post", new_name)
+    # the indexes share the namespace with the tables, so they are out of the way as well
+    op.execute(f"ALTER INDEX feed_post_pkey RENAME TO {new_name}_pkey")
+    op.execute(f"ALTER INDEX ix_feed_post_feed_id RENAME TO ix_{new_name}_feed_id")
+    op.execute(f"ALTER INDEX {unique_constraint} RENAME TO {new_name}_key")
+
+
+def _replace_feed_post_table(old_name: str) -> None:
+    op.execute("ALTER SEQUENCE feed_post_id_seq OWNED BY feed_post.id")
+    op.drop_table(old_name)
+    op.create_index(op.f("ix_feed_post_feed_id"), "feed_post", ["feed_id"], unique=False)
+
+
+def upgrade() -> None:
+    # the post id alone is not unique across the partitions, so it can't be referenced
+    op.drop_constraint("user_post_post_id_fkey", "user_post", type_="foreignkey")
+
+    _rename_feed_post_table("feed_post_unpartitioned", "feed_post_feed_id_guid_key")
+    _create_feed_post_table(
+        sa.PrimaryKeyConstraint("id", "published_at", name="feed_post_pkey"),
+        sa.UniqueConstraint(
+            "feed_id", "guid", "published_at", name="feed_post_feed_id_guid_published_at_key"
+        ),
+        postgresql_partition_by="RANGE (published_at)",
+    )
+    op.execute("CREATE TABLE feed_post_default PARTITION OF feed_post DEFAULT")
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            this_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC');
+            month timestamp;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    this_month - interval '{MONTHS_BACK} months',
+                    this_month + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF feed_post FOR VALUES FROM (%L) TO (%L)',
+                    'feed_post_' || to_char(month, '"y"YYYY"m"MM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute(f"INSERT INTO feed_post ({COLUMNS}) SELECT {COLUMNS} FROM feed_post_unpartitioned")
+    _replace_feed_post_table("feed_post_unpartitioned")
+
+
+def downgrade() -> None:
+    _rename_feed_post_table("feed_post_partitioned", "feed_post_feed_id_guid_published_at_key")
+    _create_feed_post_table(
+        sa.PrimaryKeyConstraint("id", name="feed_post_pkey"),
+        sa.UniqueConstraint("feed_id", "guid", name="feed_post_feed_id_guid_key"),
+    )
+    # the posts with the same guid published at different times are merged into the latest one
+    op.execute(
+        f"""
+        INSERT INTO feed_post ({COLUMNS})
+        SELECT DISTINCT ON (feed_id, guid) {COLUMNS}
+        FROM feed_post_partitioned
+        ORDER BY feed_id, guid, published_at DESC
+        """
+    )
+    _replace_feed_post_table("feed_post_partitioned")
+
+    op.execute("DELETE FROM user_post WHERE post_id NOT IN (SELECT id FROM feed_post)")
+    op.create_foreign_key("user_post_post_id_fkey", "user_post", "feed_post", ["post_id"], ["id"])
@@ -0,0 +1,35 @@
+# ruff: noqa: INP001
+"""index feed_post by feed_id, published_at and id
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2023-09-15 19:42:08.331207
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # the index over the feed id alone is a prefix of the new one, so it's not needed anymore
+    op.create_index(
+        "ix_feed_post_feed_id_published_at_id",
+        "feed_post",
+        ["feed_id", sa.text("published_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.drop_index("ix_feed_post_feed_id", table_name="feed_post")
+
+
+def downgrade() -> None:
+    op.create_index("ix_feed_post_feed_id", "feed_post", ["feed_id"], unique=False)
+    op.drop_index("ix_feed_post_feed_id_published_at_id", table_name="feed_post")
@@ -0,0 +1,51 @@
+# ruff: noqa: INP001
+"""add feed_post.search_vector
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2023-09-17 12:08:51.640193
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# the same expression as the one of the model at the time of the migration
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, title), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, left(coalesce(summary, ''), 2000)), 'B')"
+)
+
+
+def upgrade() -> None:
+    # the stored column is computed for the existing posts right away, rewriting every partition
+    op.add_column(
+        "feed_post",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_feed_post_search_vector",
+        "feed_post",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feed_post_search_vector", table_name="feed_post")
+    op.drop_column("feed_post", "search_vector")
@@ -0,0 +1,31 @@
+# ruff: noqa: INP001
+"""add feed.version
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2023-09-18 14:02:11.907346
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # the column has a constant default, so it is added without rewriting the table
+    op.add_column(
+        "feed",
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("feed", "version")
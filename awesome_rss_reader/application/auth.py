@@ -0,0 +1,126 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from jose import JWTError
+from jose import jwt as jose_jwt
+
+from awesome_rss_reader.application.settings import AuthSettings
+from awesome_rss_reader.core.entity.user import User
+
+
+class TokenVerificationError(Exception):
+    ...
+
+
+class TokenDecoder(ABC):
+    @abstractmethod
+    def decode(self, token: str, *, key: str, algorithm: str) -> dict[str, Any]:
+        """
+        Verify the token signature and the registered claims, and return the claims.
+        Raise TokenVerificationError if the token is not valid.
+        """
+
+
+class JoseTokenDecoder(TokenDecoder):
+    def decode(self, token: str, *, key: str, algorithm: str) -> dict[str, Any]:
+        try:
+            return jose_jwt.decode(token, key, algorithms=[algorithm])
+        except JWTError as exc:
+            raise TokenVerificationError(str(exc)) from exc
+
+
+class PyJWTTokenDecoder(TokenDecoder):
+    """
+    PyJWT does considerably less work per token than python-jose,
+    it takes about half the time to verify an HS256 token.
+    """
+
+    def __init__(self) -> None:
+        # PyJWT is an optional dependency, the pyjwt extra must be installed to use this backend
+        import jwt
+
+        self._jwt = jwt
+
+    def decode(self, token: str, *, key: str, algorithm: str) -> dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._jwt.InvalidTokenError as exc:
+            raise TokenVerificationError(str(exc)) from exc
+
+
+def init_token_decoder(settings: AuthSettings) -> TokenDecoder:
+    match settings.jwt_backend:
+        case "jose":
+            return JoseTokenDecoder()
+        case "pyjwt":
+            return PyJWTTokenDecoder()
+        case _:
+            raise ValueError(f"Unknown jwt backend: {settings.jwt_backend}")
+
+
+@dataclass
+class _CachedUser:
+    user: User
+    expires_at: float
+
+
+@dataclass
+class TokenVerifier:
+    """
+    Verify access tokens, remembering the users of recently verified tokens.
+    A token is remembered until it expires, but for no longer than the configured ttl.
+    """
+
+    settings: AuthSettings
+    decoder: TokenDecoder
+
+    _cache: OrderedDict[str, _CachedUser] = field(default_factory=OrderedDict, init=False)
+
+    def verify(self, token: str) -> User:
+        if user := self._get_cached(token):
+            return user
+
+        claims = self.decoder.decode(
+            token,
+            key=self.settings.secret_key,
+            algorithm=self.settings.algorithm,
+        )
+
+        if not (user_uid := claims.get("sub")):
+            raise TokenVerificationError(f"Token has no subject, claims: {sorted(claims)}")
+
+        user = User(uid=user_uid)
+        self._cache_user(token, user, expires_at=claims.get("exp"))
+
+        return user
+
+    def _get_cached(self, token: str) -> User | None:
+        if (cached := self._cache.get(token)) is None:
+            return None
+
+        if cached.expires_at <= time.monotonic():
+            del self._cache[token]
+            return None
+
+        self._cache.move_to_end(token)
+        return cached.user
+
+    def _cache_user(self, token: str, user: User, *, expires_at: int | None) -> None:
+        if self.settings.token_cache_size <= 0:
+            return
+
+        ttl_s = float(self.settings.token_cache_ttl_s)
+        # exp is a wall clock timestamp, while the cache works with the monotonic clock
+        if expires_at is not None:
+            ttl_s = min(ttl_s, expires_at - time.time())
+        if ttl_s <= 0:
+            return
+
+        self._cache[token] = _CachedUser(user=user, expires_at=time.monotonic() + ttl_s)
+        self._cache.move_to_end(token)
+
+        while len(self._cache) > self.settings.token_cache_size:
+            self._cache.popitem(last=False)
@@ -1,30 +1,55 @@
 # mypy: disable-error-code="assignment"
 from dependency_injector import containers, providers
 
-from awesome_rss_reader.application.settings import ApplicationSettings, AuthSettings
+from awesome_rss_reader.application.auth import TokenVerifier, init_token_decoder
+from awesome_rss_reader.application.settings import (
+    ApplicationSettings,
+    AuthSettings,
+    ProfilingSettings,
+    TracingSettings,
+)
 from awesome_rss_reader.core.usecase.authenticate_user import AuthenticateUserUseCase
 from awesome_rss_reader.core.usecase.create_feed import CreateFeedUseCase
+from awesome_rss_reader.core.usecase.delete_outdated_posts import DeleteOutdatedPostsUseCase
 from awesome_rss_reader.core.usecase.follow_feed import FollowFeedUseCase
 from awesome_rss_reader.core.usecase.list_feed_posts import ListFeedPostsUseCase
 from awesome_rss_reader.core.usecase.list_user_feeds import ListUserFollowedFeedsUseCase
+from awesome_rss_reader.core.usecase.manage_feed_post_partitions import (
+    ManageFeedPostPartitionsUseCase,
+)
 from awesome_rss_reader.core.usecase.read_post import ReadPostUseCase
 from awesome_rss_reader.core.usecase.refresh_feed import RefreshFeedUseCase
 from awesome_rss_reader.core.usecase.schedule_feed_update import ScheduleFeedUpdateUseCase
+from awesome_rss_reader.core.usecase.search_feed_posts import SearchFeedPostsUseCase
+from awesome_rss_reader.core.usecase.stream_feed_posts import StreamFeedPostsUseCase
 from awesome_rss_reader.core.usecase.unfollow_feed import UnfollowFeedUseCase
 from awesome_rss_reader.core.usecase.unread_post import UnreadPostUseCase
 from awesome_rss_reader.core.usecase.update_feed_content import UpdateFeedContentUseCase
 from awesome_rss_reader.data.external.feed_content import ExternalFeedContentRepository
+from awesome_rss_reader.data.external.parsers import init_feed_content_parser
 from awesome_rss_reader.data.noop.users import NoopUserRepository
 from awesome_rss_reader.data.postgres.database import (
     PostgresSettings,
     init_async_engine,
+    init_async_listener_engine,
+    init_async_replica_engine,
+    init_replica_router,
 )
 from awesome_rss_reader.data.postgres.repositories.atomic import PostgresAtomicProvider
+from awesome_rss_reader.data.postgres.repositories.feed_post_events import (
+    PostgresFeedPostEventRepository,
+)
+from awesome_rss_reader.data.postgres.repositories.feed_post_partitions import (
+    PostgresFeedPostPartitionRepository,
+)
 from awesome_rss_reader.data.postgres.repositories.feed_posts import PostgresFeedPostRepository
 from awesome_rss_reader.data.postgres.repositories.feed_refresh_jobs import (
     PostgresFeedRefreshJobRepository,
 )
 from awesome_rss_reader.data.postgres.repositories.feeds import PostgresFeedRepository
+from awesome_rss_reader.data.postgres.repositories.replication import (
+    PostgresReplicationRepository,
+)
 from awesome_rss_reader.data.postgres.repositories.user_feeds import (
     PostgresUserFeedRepository,
 )
@@ -35,100 +60,161 @@ class Settings(containers.DeclarativeContainer):
     app = providers.Singleton(ApplicationSettings)
     auth = providers.Singleton(AuthSettings)
     postgres = providers.Singleton(PostgresSettings)
+    tracing = providers.Singleton(TracingSettings)
+    profiling = providers.Singleton(ProfilingSettings)
+
+
+class Auth(containers.DeclarativeContainer):
+    settings: Settings = providers.DependenciesContainer()
+
+    token_decoder = providers.Singleton(init_token_decoder, settings=settings.auth)
+    token_verifier = providers.Singleton(
+        TokenVerifier,
+        settings=settings.auth,
+        decoder=token_decoder,
+    )
 
 
 class Database(containers.DeclarativeContainer):
     settings: Settings = providers.DependenciesContainer()
 
     engine = providers.Singleton(init_async_engine, settings=settings.postgres)
+    replica_engine = providers.Singleton(init_async_replica_engine, settings=settings.postgres)
+    listener_engine = providers.Singleton(init_async_listener_engine, settings=settings.postgres)
+    router = providers.Singleton(
+        init_replica_router,
+        settings=settings.postgres,
+        primary=engine,
+        replica=replica_engine,
+    )
 
 
 class Repositories(containers.DeclarativeContainer):
+    settings: Settings = providers.DependenciesContainer()
     database: Database = providers.DependenciesContainer()
 
     atomic = providers.Singleton(PostgresAtomicProvider, db=database.engine)
     users = providers.Singleton(NoopUserRepository)
-    feeds = providers.Singleton(PostgresFeedRepository, db=database.engine)
-    user_feeds = providers.Singleton(PostgresUserFeedRepository, db=database.engine)
+    feeds = providers.Singleton(PostgresFeedRepository, db=database.engine, router=database.router)
+    user_feeds = providers.Singleton(
+        PostgresUserFeedRepository, db=database.engine, router=database.router
+    )
     feed_refresh_jobs = providers.Singleton(PostgresFeedRefreshJobRepository, db=database.engine)
-    feed_posts = providers.Singleton(PostgresFeedPostRepository, db=database.engine)
+    feed_posts = providers.Singleton(
+        PostgresFeedPostRepository, db=database.engine, router=database.router
+    )
     user_posts = providers.Singleton(PostgresUserPostRepository, db=database.engine)
-    feed_content = providers.Singleton(ExternalFeedContentRepository)
+    feed_post_events = providers.Singleton(
+        PostgresFeedPostEventRepository,
+        db=database.engine,
+        listener_db=database.listener_engine,
+    )
+    feed_post_partitions = providers.Singleton(
+        PostgresFeedPostPartitionRepository, db=database.engine
+    )
+    replication = providers.Singleton(PostgresReplicationRepository, db=database.engine)
+    feed_content_parser = providers.Singleton(init_feed_content_parser, settings=settings.app)
+    feed_content = providers.Singleton(ExternalFeedContentRepository, parser=feed_content_parser)
 
 
 class UseCases(containers.DeclarativeContainer):
     settings: Settings = providers.Container(Settings)
     repositories: Repositories = providers.DependenciesContainer()
 
-    authenticate_user = providers.Factory(
+    # use cases keep no state between calls, so one instance per process serves all of them
+    authenticate_user = providers.Singleton(
         AuthenticateUserUseCase,
         user_repository=repositories.users,
         auth_settings=settings.auth,
     )
 
-    create_feed = providers.Factory(
+    create_feed = providers.Singleton(
         CreateFeedUseCase,
         feed_repository=repositories.feeds,
         user_feed_repository=repositories.user_feeds,
         job_repository=repositories.feed_refresh_jobs,
         atomic=repositories.atomic,
     )
-    list_followed_feeds = providers.Factory(
+    list_followed_feeds = providers.Singleton(
         ListUserFollowedFeedsUseCase,
         feed_repository=repositories.feeds,
     )
-    follow_feed = providers.Factory(
+    follow_feed = providers.Singleton(
         FollowFeedUseCase,
         feed_repository=repositories.feeds,
         user_feed_repository=repositories.user_feeds,
     )
-    unfollow_feed = providers.Factory(
+    unfollow_feed = providers.Singleton(
         UnfollowFeedUseCase,
         feed_repository=repositories.feeds,
         user_feed_repository=repositories.user_feeds,
     )
-    refresh_feed = providers.Factory(
+    refresh_feed = providers.Singleton(
         RefreshFeedUseCase,
         feed_repository=repositories.feeds,
         job_repository=repositories.feed_refresh_jobs,
         atomic=repositories.atomic,
     )
 
-    list_feed_posts = providers.Factory(
+    list_feed_posts = providers.Singleton(
         ListFeedPostsUseCase,
         post_repository=repositories.feed_posts,
     )
-    read_post = providers.Factory(
+    search_feed_posts = providers.Singleton(
+        SearchFeedPostsUseCase,
+        post_repository=repositories.feed_posts,
+    )
+    stream_feed_posts = providers.Singleton(
+        StreamFeedPostsUseCase,
+        app_settings=settings.app,
+        user_feed_repository=repositories.user_feeds,
+        event_repository=repositories.feed_post_events,
+    )
+    read_post = providers.Singleton(
         ReadPostUseCase,
         post_repository=repositories.feed_posts,
         user_post_repository=repositories.user_posts,
     )
-    unread_post = providers.Factory(
+    unread_post = providers.Singleton(
         UnreadPostUseCase,
         post_repository=repositories.feed_posts,
         user_post_repository=repositories.user_posts,
     )
 
-    schedule_feed_update = providers.Factory(
+    schedule_feed_update = providers.Singleton(
         ScheduleFeedUpdateUseCase,
         app_settings=settings.app,
         job_repository=repositories.feed_refresh_jobs,
     )
-    update_feed_content = providers.Factory(
+    update_feed_content = providers.Singleton(
         UpdateFeedContentUseCase,
         app_settings=settings.app,
         job_repository=repositories.feed_refresh_jobs,
         feed_repository=repositories.feeds,
         feed_content_repository=repositories.feed_content,
         post_repository=repositories.feed_posts,
+        post_event_repository=repositories.feed_post_events,
         atomic=repositories.atomic,
     )
+    manage_feed_post_partitions = providers.Singleton(
+        ManageFeedPostPartitionsUseCase,
+        partition_repository=repositories.feed_post_partitions,
+    )
+    delete_outdated_posts = providers.Singleton(
+        DeleteOutdatedPostsUseCase,
+        feed_repository=repositories.feeds,
+        post_repository=repositories.feed_posts,
+        replication_repository=repositories.replication,
+    )
 
 
 class Container(containers.DeclarativeContainer):
     settings: Settings = providers.Container(Settings)
+    auth: Auth = providers.Container(Auth, settings=settings)
     database: Database = providers.Container(Database, settings=settings)
-    repositories: Repositories = providers.Container(Repositories, database=database)
+    repositories: Repositories = providers.Container(
+        Repositories, settings=settings, database=database
+    )
     use_cases: UseCases = providers.Container(
         UseCases, settings=settings, repositories=repositories
     )
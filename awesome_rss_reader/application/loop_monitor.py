@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+
+import structlog
+
+from awesome_rss_reader.application import metrics
+from awesome_rss_reader.application.settings import ApplicationSettings
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class LoopMonitor:
+    """
+    Measure how late the event loop gets to run a task scheduled at a regular interval.
+    A watchdog thread keeps an eye on the measurements, and once they stop coming
+    for longer than the threshold, it logs the stack the event loop thread is stuck in.
+    """
+
+    interval_s: float
+    block_threshold_s: float
+
+    _task: asyncio.Task[None] | None = field(default=None, init=False)
+    _watchdog: threading.Thread | None = field(default=None, init=False)
+    _stopped: threading.Event = field(default_factory=threading.Event, init=False)
+    _loop_thread_id: int = field(default=0, init=False)
+    _last_beat_at: float = field(default=0, init=False)
+    _beats: int = field(default=0, init=False)
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat_at = time.monotonic()
+        self._stopped.clear()
+
+        self._task = asyncio.create_task(self._measure_lag())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _measure_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled_at = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            metrics.EVENT_LOOP_LAG.observe(max(loop.time() - scheduled_at, 0))
+
+            self._last_beat_at = time.monotonic()
+            self._beats += 1
+
+    def _watch(self) -> None:
+        reported_beat = None
+        # checking twice per threshold is enough to catch a loop blocked for longer than that
+        while not self._stopped.wait(self.block_threshold_s / 2):
+            beat = self._beats
+            blocked_s = time.monotonic() - self._last_beat_at - self.interval_s
+            # a stall is reported once, however long it lasts
+            if blocked_s < self.block_threshold_s or beat == reported_beat:
+                continue
+
+            reported_beat = beat
+            metrics.EVENT_LOOP_BLOCKS.inc()
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else None
+            logger.warning("Event loop is blocked", blocked_s=round(blocked_s, 3), stack=stack)
+
+
+def start_loop_monitor(settings: ApplicationSettings) -> LoopMonitor:
+    """
+    Start monitoring the running event loop.
+    """
+    monitor = LoopMonitor(
+        interval_s=settings.loop_monitor_interval_s,
+        block_threshold_s=settings.loop_block_threshold_s,
+    )
+    monitor.start()
+
+    return monitor
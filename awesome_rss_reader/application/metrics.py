@@ -0,0 +1,118 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# feed content fetching and parsing
+FEED_FETCH_DURATION = Histogram(
+    "feed_fetch_duration_seconds",
+    "Time spent downloading a feed",
+    ["outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+FEED_BODY_SIZE = Histogram(
+    "feed_body_size_bytes",
+    "Size of the downloaded feed bodies",
+    buckets=(1024, 4 * 1024, 16 * 1024, 64 * 1024, 128 * 1024, 256 * 1024, 512 * 1024, 1024**2),
+)
+FEED_PARSE_DURATION = Histogram(
+    "feed_parse_duration_seconds",
+    "Time spent parsing a downloaded feed",
+    ["outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+FEED_PARSER_FALLBACKS = Counter(
+    "feed_parser_fallbacks_total",
+    "Feeds the fast parser engine left to feedparser",
+    ["engine"],
+)
+
+# feed update jobs
+FEED_UPDATE_STAGE_DURATION = Histogram(
+    "feed_update_stage_duration_seconds",
+    "Time spent on each stage of a feed update batch",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+FEED_PERSIST_DURATION = Histogram(
+    "feed_persist_duration_seconds",
+    "Time spent saving the content of an updated feed",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+FEED_REFRESH_JOB_TRANSITIONS = Counter(
+    "feed_refresh_job_transitions_total",
+    "Feed refresh job state transitions",
+    ["old_state", "new_state"],
+)
+FEED_REFRESH_JOB_RETRIES = Counter(
+    "feed_refresh_job_retries_total",
+    "Feed refresh jobs scheduled for a retry",
+)
+FEED_REFRESH_JOBS = Gauge(
+    "feed_refresh_jobs",
+    "Feed refresh jobs in each state",
+    ["state"],
+)
+FEED_UNCHANGED = Counter(
+    "feed_unchanged_total",
+    "Feed updates that found no new posts",
+)
+FEED_POSTS = Counter(
+    "feed_posts_total",
+    "Posts found in the updated feeds, either inserted or conflicting with the existing ones",
+    ["outcome"],
+)
+
+# event loop
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop in running a scheduled task",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Times the event loop was blocked for longer than the threshold",
+)
+
+# database
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing a database statement",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_SLOW_STATEMENTS = Counter(
+    "db_slow_statements_total",
+    "Database statements that took longer than the slow statement threshold",
+    ["operation"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection out of the pool, connecting included",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Times no connection was available in the pool within the pool timeout",
+)
+DB_READS = Counter(
+    "db_reads_total",
+    "Read-only queries by the database they were routed to, once there is a replica to route to",
+    ["target"],
+)
+DB_BATCH_QUERIES = Histogram(
+    "db_batch_queries",
+    "Database statements executed per worker or scheduler batch",
+    ["command"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+# api
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling an api request",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_queries",
+    "Database statements executed per api request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
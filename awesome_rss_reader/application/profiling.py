@@ -0,0 +1,111 @@
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import structlog
+
+from awesome_rss_reader.application.settings import ProfilingSettings
+
+logger = structlog.get_logger()
+
+# asyncio reports the slow callbacks through the standard logging, with this logger
+_asyncio_logger = logging.getLogger("asyncio")
+# functions listed in the text summaries of the profiles
+_summary_size = 50
+
+
+@dataclass
+class Profiler:
+    """
+    Profile the process every so often, for a short window each time,
+    and have asyncio report the callbacks that block the event loop for too long.
+    The profiles and the slow callbacks are saved to the output directory.
+    """
+
+    settings: ProfilingSettings
+    output_dir: Path
+    service_name: str
+
+    _task: asyncio.Task[None] | None = field(default=None, init=False)
+    _slow_callback_handler: logging.Handler | None = field(default=None, init=False)
+    _loop_was_debugged: bool = field(default=False, init=False)
+
+    def start(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        loop = asyncio.get_running_loop()
+        self._loop_was_debugged = loop.get_debug()
+        loop.set_debug(enabled=True)
+        loop.slow_callback_duration = self.settings.slow_callback_s
+
+        handler = logging.FileHandler(self._get_path("slow-callbacks", "log"))
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        _asyncio_logger.addHandler(handler)
+        self._slow_callback_handler = handler
+
+        self._task = asyncio.create_task(self._run())
+        logger.info("Profiling is enabled", output_dir=str(self.output_dir))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._slow_callback_handler is not None:
+            _asyncio_logger.removeHandler(self._slow_callback_handler)
+            self._slow_callback_handler.close()
+            self._slow_callback_handler = None
+
+        asyncio.get_running_loop().set_debug(enabled=self._loop_was_debugged)
+
+    async def _run(self) -> None:
+        while True:
+            await self._profile_window()
+            await asyncio.sleep(max(self.settings.interval_s - self.settings.window_s, 0))
+
+    async def _profile_window(self) -> None:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            # whatever the event loop runs in the meantime is profiled
+            await asyncio.sleep(self.settings.window_s)
+        finally:
+            profile.disable()
+            self._dump(profile)
+
+    def _dump(self, profile: cProfile.Profile) -> None:
+        timestamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%S")
+        profile_path = self._get_path(timestamp, "prof")
+        profile.dump_stats(profile_path)
+
+        # a readable summary, for a quick look without any tooling
+        with self._get_path(timestamp, "txt").open("w") as summary:
+            stats = pstats.Stats(profile, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_summary_size)
+
+        logger.info("Saved profile", path=str(profile_path))
+
+    def _get_path(self, name: str, suffix: str) -> Path:
+        return self.output_dir / f"{self.service_name}-{os.getpid()}-{name}.{suffix}"
+
+
+def start_profiling(settings: ProfilingSettings, *, service_name: str) -> Profiler | None:
+    """
+    Start profiling the process, if it's enabled in the settings.
+    Must be called from within the running event loop.
+    """
+    if settings.output_dir is None:
+        return None
+
+    profiler = Profiler(
+        settings=settings, output_dir=settings.output_dir, service_name=service_name
+    )
+    profiler.start()
+
+    return profiler
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +16,41 @@ class ApplicationSettings(BaseSettings):
 
     # some feed aggregators do not allow feeds larger than 512kb, so we do the same
     feed_max_size_b: int = 512 * 1024
+    # the compressed bodies are limited separately, feeds compress several times over,
+    # so a compressed body past this size is not going to fit the limit above anyway
+    feed_max_compressed_size_b: int = 256 * 1024
+    # feeds list their posts newest first, so once this many posts in a row turn out
+    # to be already known, the rest of the feed is not parsed, 0 to always parse the whole feed
+    feed_stop_after_outdated_posts: int = 20
+    # expat and lxml engines extract the posts of rss and atom feeds faster than feedparser,
+    # leaving it the feeds they can't handle the same way, lxml is not installed by default
+    feed_parser_engine: Literal["feedparser", "expat", "lxml"] = "feedparser"
+
+    # the posts are kept for this many months before the current one, 0 to keep them forever,
+    # the posts published before that are not taken from the feeds in the first place
+    feed_post_retention_months: int = 0
+    # the monthly partitions of the posts are created this many months ahead
+    feed_post_partitions_ahead_months: int = 3
+    # `retention posts` deletes the posts older than this many days, 0 to keep them forever,
+    # sparing this many of the latest posts of every feed, so the quiet feeds are not emptied
+    feed_post_max_age_days: int = 0
+    feed_post_keep_latest: int = 50
+    # the oldest posts of a feed beyond this many are deleted as the new ones come in, 0 for no cap
+    max_posts_per_feed: int = 0
+
+    # feed updates exceeding any of these are logged as slow
+    feed_slow_download_s: float = 5
+    feed_slow_parse_s: float = 1
+    feed_slow_item_count: int = 500
+
+    # idle post streams send a comment every so often, so proxies don't drop the connection
+    post_stream_heartbeat_s: float = 15
+    post_stream_follows_refresh_s: int = 60
+
+    # the event loop lag is measured every so often,
+    # and the stack of a loop blocked for longer than the threshold is logged
+    loop_monitor_interval_s: float = 0.25
+    loop_block_threshold_s: float = 0.5
 
     model_config = SettingsConfigDict(env_prefix="APP_")
 
@@ -24,4 +60,32 @@ class AuthSettings(BaseSettings):
     algorithm: Literal["HS256"] = "HS256"
     token_expiry_s: int = 60 * 60 * 24
 
+    # pyjwt verifies tokens faster, but it's only installed along with the pyjwt extra
+    jwt_backend: Literal["jose", "pyjwt"] = "jose"
+    # verified tokens are remembered, so the same token is not verified over and over again
+    token_cache_size: int = 10_000
+    token_cache_ttl_s: int = 5 * 60
+
     model_config = SettingsConfigDict(env_prefix="AUTH_")
+
+
+class TracingSettings(BaseSettings):
+    # opentelemetry comes with the otel extra, spans are not recorded unless an exporter is set
+    exporter: Literal["none", "otlp", "file"] = "none"
+    otlp_endpoint: str | None = None
+    file_path: str = "traces.jsonl"
+    sample_ratio: float = 1.0
+
+    model_config = SettingsConfigDict(env_prefix="TRACING_")
+
+
+class ProfilingSettings(BaseSettings):
+    # profiling is off unless there's a directory to save the profiles to
+    output_dir: Path | None = None
+    # the process is profiled for window_s out of every interval_s
+    window_s: float = 30
+    interval_s: float = 5 * 60
+    # event loop callbacks running longer than this are reported
+    slow_callback_s: float = 0.1
+
+    model_config = SettingsConfigDict(env_prefix="PROFILING_")
@@ -0,0 +1,126 @@
+import contextlib
+import functools
+import os
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, ParamSpec, TypeVar
+
+import structlog
+
+from awesome_rss_reader.application.settings import TracingSettings
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.trace import Span, Tracer
+
+logger = structlog.get_logger()
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+SpanKind = Literal["internal", "server", "client"]
+
+# spans are only recorded once a tracer provider is set up, otherwise tracing costs nothing
+_tracer: "Tracer | None" = None
+
+
+def init_tracing(settings: TracingSettings, *, service_name: str) -> "TracerProvider | None":
+    """
+    Set up the span exporter chosen in the settings.
+    OpenTelemetry is not a dependency of the project, the sdk must be installed to enable tracing.
+    """
+    if settings.exporter == "none":
+        return None
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    # the provider flushes the pending spans on exit
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_init_span_exporter(settings)))
+
+    logger.info("Tracing is enabled", exporter=settings.exporter, service_name=service_name)
+    use_tracer_provider(provider)
+
+    return provider
+
+
+def use_tracer_provider(provider: "TracerProvider | None") -> None:
+    """
+    Record the spans with the given provider, or stop recording them if there's none.
+    """
+    global _tracer
+    _tracer = provider.get_tracer("awesome_rss_reader") if provider is not None else None
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+@contextlib.contextmanager
+def start_span(
+    name: str,
+    *,
+    kind: SpanKind = "internal",
+    attributes: Mapping[str, Any] | None = None,
+    carrier: Mapping[str, str] | None = None,
+) -> Iterator["Span | None"]:
+    """
+    Record a span nested in the current one, or in the one propagated with the carrier headers.
+    Yield None if tracing is not enabled.
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    from opentelemetry import propagate, trace
+
+    with _tracer.start_as_current_span(
+        name,
+        context=propagate.extract(carrier) if carrier is not None else None,
+        kind=getattr(trace.SpanKind, kind.upper()),
+        attributes=attributes,
+    ) as span:
+        yield span
+
+
+def traced(name: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """
+    Record a span for every call of the decorated coroutine function.
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _tracer is None:
+                return await func(*args, **kwargs)
+            with start_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _init_span_exporter(settings: TracingSettings) -> Any:
+    match settings.exporter:
+        case "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            # the exporter falls back to the standard OTEL_EXPORTER_OTLP_* variables
+            return OTLPSpanExporter(endpoint=settings.otlp_endpoint)
+        case "file":
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+            # one json document per line, so the file can be appended to and read line by line
+            return ConsoleSpanExporter(
+                out=Path(settings.file_path).open("a"),  # noqa: SIM115
+                formatter=lambda span: span.to_json(indent=None) + os.linesep,
+            )
+        case _:
+            raise ValueError(f"Unknown span exporter: {settings.exporter}")
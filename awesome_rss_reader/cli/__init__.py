@@ -1,6 +1,7 @@
 import click
 
 from awesome_rss_reader.cli.api import api
+from awesome_rss_reader.cli.retention import retention
 from awesome_rss_reader.cli.scheduler import scheduler
 from awesome_rss_reader.cli.worker import worker
 
@@ -11,5 +12,6 @@ def main() -> None:
 
 
 main.add_command(api)
+main.add_command(retention)
 main.add_command(scheduler)
 main.add_command(worker)
@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 import click
 import uvicorn
 
@@ -16,13 +19,24 @@ import uvicorn
     is_flag=True,
     help="Instruct uvicorn to reload on code changes",
 )
+@click.option(
+    "--profile-dir",
+    default=None,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory to save profiles to, the server is not profiled unless it's set",
+)
 def api(
     host: str,
     port: int,
     log_level: str,
     reload: bool,  # noqa: FBT001
+    profile_dir: Path | None,
 ) -> None:
     click.echo(f"Running API server on {host}:{port} with logging level={log_level}")
+    if profile_dir is not None:
+        click.echo(f"Saving profiles to {profile_dir}")
+        # the app is built by uvicorn, possibly in a reloader subprocess, it picks up the settings
+        os.environ["PROFILING_OUTPUT_DIR"] = str(profile_dir)
 
     uvicorn.run(
         "awesome_rss_reader.fastapi.entrypoint:get_asgi_app",
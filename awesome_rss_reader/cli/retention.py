@@ -0,0 +1,173 @@
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+import click
+
+from awesome_rss_reader.application import di, tracing
+from awesome_rss_reader.core.usecase.delete_outdated_posts import (
+    DeleteOutdatedPostsInput,
+    DeleteOutdatedPostsOutput,
+)
+from awesome_rss_reader.core.usecase.manage_feed_post_partitions import (
+    ManageFeedPostPartitionsInput,
+    ManageFeedPostPartitionsOutput,
+)
+from awesome_rss_reader.data.postgres.database import PostgresSettings
+from awesome_rss_reader.utils.dtime import now_aware
+
+
+@click.group(context_settings={"auto_envvar_prefix": "RETENTION"})
+def retention() -> None:
+    """Keep the feed posts from piling up."""
+
+
+@retention.command()
+@click.option(
+    "--months-ahead",
+    default=None,
+    type=click.INT,
+    help="Define how many months ahead to create the partitions for, "
+    "APP_FEED_POST_PARTITIONS_AHEAD_MONTHS unless it's set",
+)
+@click.option(
+    "--retention-months",
+    default=None,
+    type=click.INT,
+    help="Define how many months before the current one to keep the posts of, "
+    "APP_FEED_POST_RETENTION_MONTHS unless it's set, 0 keeps all of them",
+)
+@click.option(
+    "--archive",
+    default=False,
+    is_flag=True,
+    help="Detach the outdated partitions to be archived instead of dropping them",
+)
+def partitions(
+    months_ahead: int | None,
+    retention_months: int | None,
+    archive: bool,  # noqa: FBT001
+) -> None:
+    container = di.init()
+    container.settings.postgres.override(PostgresSettings(pool_role="retention"))
+    app_settings = container.settings.app()
+    tracing.init_tracing(container.settings.tracing(), service_name="retention")
+
+    uc_input = ManageFeedPostPartitionsInput(
+        months_ahead=(
+            app_settings.feed_post_partitions_ahead_months if months_ahead is None else months_ahead
+        ),
+        retention_months=(
+            app_settings.feed_post_retention_months
+            if retention_months is None
+            else retention_months
+        ),
+        archive=archive,
+    )
+    click.echo(
+        f"Managing feed post partitions with months_ahead={uc_input.months_ahead} "
+        f"and retention_months={uc_input.retention_months}"
+    )
+
+    uc = container.use_cases.manage_feed_post_partitions()
+    output: ManageFeedPostPartitionsOutput = asyncio.run(uc.execute(uc_input))
+
+    for partition in output.created:
+        click.echo(f"Created partition {partition.name}")
+    for partition in output.removed:
+        click.echo(f"{'Detached' if archive else 'Dropped'} partition {partition.name}")
+    click.echo(f"Deleted {output.deleted_posts} posts out of the partitions range")
+
+
+@retention.command()
+@click.option(
+    "--max-age-days",
+    default=None,
+    type=click.INT,
+    help="Delete the posts older than this many days, "
+    "APP_FEED_POST_MAX_AGE_DAYS unless it's set",
+)
+@click.option(
+    "--keep-latest",
+    default=None,
+    type=click.INT,
+    help="Keep this many of the latest posts of every feed however old they are, "
+    "APP_FEED_POST_KEEP_LATEST unless it's set",
+)
+@click.option("--batch-size", default=1000, type=click.INT, help="Delete this many posts at a time")
+@click.option(
+    "--feeds-per-batch", default=100, type=click.INT, help="Go over this many feeds at a time"
+)
+@click.option("--pause", default=0.1, type=click.FLOAT, help="Pause for this long between batches")
+@click.option(
+    "--max-replication-lag",
+    default=5.0,
+    type=click.FLOAT,
+    help="Wait for the replicas lagging behind more than this many seconds to catch up",
+)
+@click.option(
+    "--checkpoint",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Remember the progress in this file, so an interrupted run picks up where it stopped",
+)
+def posts(
+    max_age_days: int | None,
+    keep_latest: int | None,
+    batch_size: int,
+    feeds_per_batch: int,
+    pause: float,
+    max_replication_lag: float,
+    checkpoint: Path | None,
+) -> None:
+    container = di.init()
+    container.settings.postgres.override(PostgresSettings(pool_role="retention"))
+    app_settings = container.settings.app()
+    tracing.init_tracing(container.settings.tracing(), service_name="retention")
+
+    if max_age_days is None:
+        max_age_days = app_settings.feed_post_max_age_days
+    if max_age_days <= 0:
+        click.echo("Post max age is not set, keeping all of the posts")
+        return
+
+    after_feed_id = 0
+    if checkpoint and checkpoint.exists():
+        after_feed_id = int(checkpoint.read_text())
+        click.echo(f"Resuming after feed {after_feed_id}")
+
+    uc_input = DeleteOutdatedPostsInput(
+        published_before=now_aware() - timedelta(days=max_age_days),
+        keep_latest=app_settings.feed_post_keep_latest if keep_latest is None else keep_latest,
+        batch_size=batch_size,
+        feeds_per_batch=feeds_per_batch,
+        after_feed_id=after_feed_id,
+        pause_s=pause,
+        max_replication_lag_s=max_replication_lag,
+    )
+    click.echo(
+        f"Deleting the posts published before {uc_input.published_before.isoformat()} "
+        f"beyond the latest {uc_input.keep_latest} of every feed"
+    )
+
+    asyncio.run(_delete_posts(container, uc_input, checkpoint))
+
+    if checkpoint:
+        checkpoint.unlink(missing_ok=True)
+
+
+async def _delete_posts(
+    container: di.Container,
+    uc_input: DeleteOutdatedPostsInput,
+    checkpoint: Path | None,
+) -> None:
+    uc = container.use_cases.delete_outdated_posts()
+    output: DeleteOutdatedPostsOutput = await uc.execute(uc_input)
+
+    async for progress in output.progress:
+        click.echo(
+            f"Deleted {progress.deleted_posts} posts out of {progress.feeds} feeds "
+            f"up to feed {progress.last_feed_id}"
+        )
+        if checkpoint:
+            checkpoint.write_text(str(progress.last_feed_id))
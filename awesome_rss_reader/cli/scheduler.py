@@ -1,14 +1,27 @@
 import asyncio
+from pathlib import Path
 
 import click
+import prometheus_client
 import structlog
 
-from awesome_rss_reader.application import di
+from awesome_rss_reader.application import di, metrics, tracing
 from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.loop_monitor import start_loop_monitor
+from awesome_rss_reader.application.profiling import start_profiling
+from awesome_rss_reader.application.settings import ProfilingSettings
+from awesome_rss_reader.core.usecase.manage_feed_post_partitions import (
+    ManageFeedPostPartitionsInput,
+)
 from awesome_rss_reader.core.usecase.schedule_feed_update import ScheduleFeedUpdateInput
+from awesome_rss_reader.data.postgres.database import PostgresSettings
+from awesome_rss_reader.data.postgres.instrumentation import count_queries
 
 logger = structlog.get_logger()
 
+# the partitions for the upcoming posts are created months ahead, so checking hourly is plenty
+_partitions_check_interval_s = 60 * 60
+
 
 @click.command(context_settings={"auto_envvar_prefix": "SCHEDULER"})
 @click.option(
@@ -23,22 +36,84 @@ logger = structlog.get_logger()
     type=click.INT,
     help="Define how much jobs to schedule at a time",
 )
+@click.option(
+    "--metrics-host",
+    default="127.0.0.1",
+    help="Host to serve prometheus metrics on",
+)
+@click.option(
+    "--metrics-port",
+    default=None,
+    type=click.INT,
+    help="Port to serve prometheus metrics on, metrics are not served unless it's set",
+)
+@click.option(
+    "--profile-dir",
+    default=None,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory to save profiles to, the process is not profiled unless it's set",
+)
 def scheduler(
     interval: int,
     concurrency: int,
+    metrics_host: str,
+    metrics_port: int | None,
+    profile_dir: Path | None,
 ) -> None:
     click.echo(f"Running scheduler with {interval=}s and {concurrency=}")
+    if metrics_port is not None:
+        click.echo(f"Serving metrics on {metrics_host}:{metrics_port}")
+        prometheus_client.start_http_server(metrics_port, addr=metrics_host)
     container = di.init()
+    container.settings.postgres.override(PostgresSettings(pool_role="scheduler"))
+    if profile_dir is not None:
+        click.echo(f"Saving profiles to {profile_dir}")
+        container.settings.profiling.override(ProfilingSettings(output_dir=profile_dir))
+    tracing.init_tracing(container.settings.tracing(), service_name="scheduler")
     asyncio.run(run(container, interval, concurrency))
 
 
 async def schedule_feed_update(container: Container, concurrency: int) -> None:
     uc_input = ScheduleFeedUpdateInput(batch_size=concurrency)
     uc = container.use_cases.schedule_feed_update()
+    with count_queries() as queries:
+        try:
+            await uc.execute(uc_input)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Failed to schedule feed update", exc_info=exc)
+
+    metrics.DB_BATCH_QUERIES.labels(command="scheduler").observe(queries.count)
+    # fmt: off
+    logger.info(
+        "Batch database queries",
+        count=queries.count, duration_s=round(queries.duration_s, 3),
+    )
+    # fmt: on
+
+
+async def create_feed_post_partitions(container: Container) -> None:
+    app_settings = container.settings.app()
+    uc_input = ManageFeedPostPartitionsInput(
+        months_ahead=app_settings.feed_post_partitions_ahead_months,
+    )
+    uc = container.use_cases.manage_feed_post_partitions()
     try:
-        await uc.execute(uc_input)
+        output = await uc.execute(uc_input)
     except Exception as exc:  # noqa: BLE001
-        logger.error("Failed to schedule feed update", exc_info=exc)
+        logger.error("Failed to create feed post partitions", exc_info=exc)
+        return
+
+    if output.created:
+        logger.info(
+            "Created feed post partitions",
+            names=[partition.name for partition in output.created],
+        )
+
+
+async def run_feed_post_partitions(container: Container) -> None:
+    while True:
+        await create_feed_post_partitions(container)
+        await asyncio.sleep(_partitions_check_interval_s)
 
 
 async def run(
@@ -46,8 +121,17 @@ async def run(
     interval: int,
     concurrency: int,
 ) -> None:
-    while True:
-        await asyncio.gather(
-            schedule_feed_update(container, concurrency),
-            asyncio.sleep(interval),
-        )
+    loop_monitor = start_loop_monitor(container.settings.app())
+    profiler = start_profiling(container.settings.profiling(), service_name="scheduler")
+    partitions_task = asyncio.create_task(run_feed_post_partitions(container))
+    try:
+        while True:
+            await asyncio.gather(
+                schedule_feed_update(container, concurrency),
+                asyncio.sleep(interval),
+            )
+    finally:
+        partitions_task.cancel()
+        if profiler is not None:
+            await profiler.stop()
+        await loop_monitor.stop()
@@ -1,14 +1,25 @@
 import asyncio
+from pathlib import Path
 
 import click
+import prometheus_client
 import structlog
 
-from awesome_rss_reader.application import di
+from awesome_rss_reader.application import di, metrics, tracing
 from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.loop_monitor import start_loop_monitor
+from awesome_rss_reader.application.profiling import start_profiling
+from awesome_rss_reader.application.settings import ProfilingSettings
 from awesome_rss_reader.core.usecase.update_feed_content import UpdateFeedContentInput
+from awesome_rss_reader.data.postgres.database import PostgresSettings
+from awesome_rss_reader.data.postgres.instrumentation import count_queries
+from awesome_rss_reader.data.postgres.routing import pin_to_primary
 
 logger = structlog.get_logger()
 
+# saving a feed takes a connection for its transaction, and another one for the statement at hand
+_connections_per_save = 2
+
 
 @click.command(context_settings={"auto_envvar_prefix": "WORKER"})
 @click.option(
@@ -23,31 +34,114 @@ logger = structlog.get_logger()
     type=click.INT,
     help="Define how much feed update jobs to process at a time",
 )
+@click.option(
+    "--max-concurrent-saves",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Define how much feed update results to save at a time, "
+    "as many as the database pool can take unless it's set",
+)
+@click.option(
+    "--metrics-host",
+    default="127.0.0.1",
+    help="Host to serve prometheus metrics on",
+)
+@click.option(
+    "--metrics-port",
+    default=None,
+    type=click.INT,
+    help="Port to serve prometheus metrics on, metrics are not served unless it's set",
+)
+@click.option(
+    "--profile-dir",
+    default=None,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory to save profiles to, the process is not profiled unless it's set",
+)
 def worker(
     interval: int,
     concurrency: int,
+    max_concurrent_saves: int | None,
+    metrics_host: str,
+    metrics_port: int | None,
+    profile_dir: Path | None,
 ) -> None:
     click.echo(f"Running worker with {interval=}s and {concurrency=}")
+    if metrics_port is not None:
+        click.echo(f"Serving metrics on {metrics_host}:{metrics_port}")
+        prometheus_client.start_http_server(metrics_port, addr=metrics_host)
     container = di.init()
-    asyncio.run(run(container, interval, concurrency))
+    container.settings.postgres.override(PostgresSettings(pool_role="worker"))
+    max_concurrent_saves = _get_max_concurrent_saves(container, max_concurrent_saves)
+    click.echo(f"Saving up to {max_concurrent_saves} feed update results at a time")
+    if profile_dir is not None:
+        click.echo(f"Saving profiles to {profile_dir}")
+        container.settings.profiling.override(ProfilingSettings(output_dir=profile_dir))
+    tracing.init_tracing(container.settings.tracing(), service_name="worker")
+    asyncio.run(run(container, interval, concurrency, max_concurrent_saves))
+
 
+def _get_max_concurrent_saves(container: Container, max_concurrent_saves: int | None) -> int:
+    """
+    Keep the saves within the pool, so none of them waits for a connection long enough to time out.
+    """
+    pool_profile = container.settings.postgres().get_pool_profile()
+    pool_saves = max(pool_profile.max_connections // _connections_per_save, 1)
+    if max_concurrent_saves is None:
+        return pool_saves
 
-async def update_feed_content(container: Container, concurrency: int) -> None:
-    uc_input = UpdateFeedContentInput(batch_size=concurrency)
+    if max_concurrent_saves > pool_saves:
+        click.echo(
+            f"Saving at most {pool_saves} feed update results at a time "
+            f"with {pool_profile.max_connections} pooled connections"
+        )
+        return pool_saves
+
+    return max_concurrent_saves
+
+
+async def update_feed_content(
+    container: Container,
+    concurrency: int,
+    max_concurrent_saves: int,
+) -> None:
+    uc_input = UpdateFeedContentInput(
+        batch_size=concurrency,
+        max_concurrent_saves=max_concurrent_saves,
+    )
     uc = container.use_cases.update_feed_content()
-    try:
-        await uc.execute(uc_input)
-    except Exception as exc:  # noqa: BLE001
-        logger.error("Failed to update feed content", exc_info=exc)
+    # the worker goes on the jobs and the feeds it has just been given,
+    # the replica may not have caught up with either of them yet
+    with count_queries() as queries, pin_to_primary():
+        try:
+            await uc.execute(uc_input)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Failed to update feed content", exc_info=exc)
+
+    metrics.DB_BATCH_QUERIES.labels(command="worker").observe(queries.count)
+    # fmt: off
+    logger.info(
+        "Batch database queries",
+        count=queries.count, duration_s=round(queries.duration_s, 3),
+    )
+    # fmt: on
 
 
 async def run(
     container: Container,
     interval: int,
     concurrency: int,
+    max_concurrent_saves: int,
 ) -> None:
-    while True:
-        await asyncio.gather(
-            update_feed_content(container, concurrency),
-            asyncio.sleep(interval),
-        )
+    loop_monitor = start_loop_monitor(container.settings.app())
+    profiler = start_profiling(container.settings.profiling(), service_name="worker")
+    try:
+        while True:
+            await asyncio.gather(
+                update_feed_content(container, concurrency, max_concurrent_saves),
+                asyncio.sleep(interval),
+            )
+    finally:
+        if profiler is not None:
+            await profiler.stop()
+        await loop_monitor.stop()
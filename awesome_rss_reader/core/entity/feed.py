@@ -23,6 +23,8 @@ class FeedUpdates(BaseModel):
 class FeedFiltering(BaseModel):
     feed_ids: list[int] | None = None
     followed_by: uuid.UUID | None = None
+    # the feeds are walked through in batches by their ids, resuming after the last one seen
+    id_after: int | None = None
 
 
 class FeedOrdering(Enum):
@@ -17,15 +17,27 @@ class FeedContentResultItem(BaseModel):
     published_at: AwareDatetime
 
 
+class FeedContentStats(BaseModel):
+    download_s: float
+    parse_s: float
+    size_b: int
+
+
 class FeedContentResult(BaseModel):
     title: str = Field(..., min_length=1)
     published_at: AwareDatetime | None
     items: list[FeedContentResultItem]
+    stats: FeedContentStats | None = None
 
 
 class FeedContentBatchRequest(BaseModel):
     timeout_s: int
     max_body_size_b: int
+    # the size of a compressed body as it is downloaded, defaults to max_body_size_b
+    max_compressed_body_size_b: int | None = None
+    # the rest of a feed is not parsed past this many posts in a row published before
+    # published_since of its request, 0 means the whole feed is parsed
+    stop_after_outdated: int = 0
     requests: list[FeedContentRequest]
 
 
@@ -30,3 +30,24 @@ class FeedPostFiltering(BaseModel):
 
 class FeedPostOrdering(Enum):
     published_at_desc = auto()
+
+
+class FeedPostSearchCursor(BaseModel):
+    """
+    Position in the search results to continue from,
+    the posts are ranked by relevance, the latest first among the equally relevant ones.
+    """
+
+    rank: float
+    published_at: AwareDatetime
+    id: int  # noqa: A003
+
+
+class FeedPostSearchHit(BaseModel):
+    post: FeedPost
+    rank: float
+
+
+class FeedPostsCreated(BaseModel):
+    feed_id: int
+    post_ids: list[int]
@@ -0,0 +1,7 @@
+from pydantic import AwareDatetime, BaseModel, Field
+
+
+class FeedPostPartition(BaseModel):
+    name: str
+    starts_at: AwareDatetime = Field(description="The earliest publication date of the posts")
+    ends_at: AwareDatetime = Field(description="The publication date the posts are before")
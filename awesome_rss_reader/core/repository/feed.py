@@ -37,6 +37,13 @@ class FeedRepository(ABC):
     ) -> list[Feed]:
         ...
 
+    @abstractmethod
+    async def get_list_version(self, *, filter_by: FeedFiltering | None = None) -> str:
+        """
+        Get an opaque value that changes whenever the result of get_list
+        with the same filtering may have changed.
+        """
+
     @abstractmethod
     async def update(self, *, feed_id: int, updates: FeedUpdates) -> Feed:
         ...
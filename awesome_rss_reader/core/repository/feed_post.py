@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from awesome_rss_reader.core.entity.feed_post import (
     FeedPost,
     FeedPostFiltering,
     FeedPostOrdering,
+    FeedPostSearchCursor,
+    FeedPostSearchHit,
     NewFeedPost,
 )
 
@@ -22,8 +25,17 @@ class FeedPostRepository(ABC):
         ...
 
     @abstractmethod
-    async def create_many(self, posts: list[NewFeedPost]) -> list[FeedPost]:
-        ...
+    async def create_many(
+        self,
+        posts: list[NewFeedPost],
+        *,
+        max_posts_per_feed: int = 0,
+    ) -> list[FeedPost]:
+        """
+        Create the posts that are not there yet, and return the created ones.
+        Unless max_posts_per_feed is 0, the oldest posts of the feeds beyond that many
+        are deleted along with their read marks as a part of the same transaction.
+        """
 
     @abstractmethod
     async def get_list(
@@ -35,3 +47,40 @@ class FeedPostRepository(ABC):
         offset: int,
     ) -> list[FeedPost]:
         ...
+
+    @abstractmethod
+    async def search(
+        self,
+        *,
+        query: str,
+        filter_by: FeedPostFiltering | None = None,
+        after: FeedPostSearchCursor | None = None,
+        limit: int,
+    ) -> list[FeedPostSearchHit]:
+        """
+        Search the posts by their titles and summaries, the most relevant ones first.
+        The query is taken as a web search engine would take it, quotes, "or" and "-" included.
+        The next page of the results starts after the cursor of the last hit of the previous one.
+        """
+
+    @abstractmethod
+    async def get_list_version(self, *, filter_by: FeedPostFiltering | None = None) -> str:
+        """
+        Get an opaque value that changes whenever the result of get_list
+        with the same filtering may have changed.
+        """
+
+    @abstractmethod
+    async def delete_outdated(
+        self,
+        *,
+        feed_ids: list[int],
+        published_before: datetime,
+        keep_latest: int,
+        limit: int,
+    ) -> int:
+        """
+        Delete up to limit posts of the given feeds published before the given time,
+        along with their read marks, sparing the latest keep_latest posts of every feed.
+        Return the number of deleted posts, fewer than limit once there's nothing left to delete.
+        """
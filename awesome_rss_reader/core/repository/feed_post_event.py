@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
+
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated
+
+
+class FeedPostEventRepository(ABC):
+    @abstractmethod
+    async def publish(self, event: FeedPostsCreated) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self) -> AbstractAsyncContextManager[AsyncIterator[FeedPostsCreated]]:
+        """
+        Receive the events published after the subscription has started, by any process.
+        The iterator ends when the subscription can no longer be served.
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from awesome_rss_reader.core.entity.feed_post_partition import FeedPostPartition
+
+
+class FeedPostPartitionRepository(ABC):
+    @abstractmethod
+    async def get_list(self) -> list[FeedPostPartition]:
+        """
+        Get the monthly partitions of the posts, the oldest first.
+        The default partition for the posts out of their range is not one of them.
+        """
+
+    @abstractmethod
+    async def create(self, *, starts_at: datetime, ends_at: datetime) -> FeedPostPartition:
+        """
+        Create a partition for the posts published in the given range,
+        the posts of the range already in the default partition are moved over to it.
+        """
+
+    @abstractmethod
+    async def drop(self, partition: FeedPostPartition) -> None:
+        """
+        Drop a partition along with its posts and their read marks.
+        """
+
+    @abstractmethod
+    async def detach(self, partition: FeedPostPartition) -> None:
+        """
+        Detach a partition from the posts, keeping its table around to be archived.
+        """
+
+    @abstractmethod
+    async def delete_published_before(self, published_before: datetime) -> int:
+        """
+        Delete the posts published before the given time that are left in the partitions,
+        along with their read marks, and return the number of deleted posts.
+        """
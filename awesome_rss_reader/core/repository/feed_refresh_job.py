@@ -46,6 +46,10 @@ class FeedRefreshJobRepository(ABC):
     ) -> list[FeedRefreshJob]:
         ...
 
+    @abstractmethod
+    async def count_by_state(self) -> dict[FeedRefreshJobState, int]:
+        ...
+
     @abstractmethod
     async def update(self, *, job_id: int, updates: FeedRefreshJobUpdates) -> FeedRefreshJob:
         ...
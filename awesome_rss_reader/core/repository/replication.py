@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+
+class ReplicationRepository(ABC):
+    @abstractmethod
+    async def get_lag_s(self) -> float | None:
+        """
+        Get how far behind the primary the most lagging replica is, in seconds.
+        None when there are no replicas to lag behind.
+        """
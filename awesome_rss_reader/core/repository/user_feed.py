@@ -21,6 +21,10 @@ class UserFeedRepository(ABC):
     async def get_for_user_and_feed(self, *, user_uid: uuid.UUID, feed_id: int) -> UserFeed:
         ...
 
+    @abstractmethod
+    async def get_followed_feed_ids(self, user_uid: uuid.UUID) -> list[int]:
+        ...
+
     @abstractmethod
     async def get_or_create(self, new_user_feed: NewUserFeed) -> UserFeed:
         ...
@@ -1,8 +1,17 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from awesome_rss_reader.application import tracing
+
 
 class BaseUseCase(ABC):
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # every use case execution is traced, without each of them having to do it
+        if "execute" in cls.__dict__:
+            traced_execute = tracing.traced(f"{cls.__name__}.execute")(cls.__dict__["execute"])
+            cls.execute = traced_execute  # type: ignore[method-assign,assignment]
+
     @abstractmethod
     async def execute(self, *args: Any, **kwargs: Any) -> Any:
         ...
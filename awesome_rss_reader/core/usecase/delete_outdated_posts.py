@@ -0,0 +1,105 @@
+import asyncio
+import dataclasses
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+
+import structlog
+
+from awesome_rss_reader.core.entity.feed import FeedFiltering, FeedOrdering
+from awesome_rss_reader.core.repository.feed import FeedRepository
+from awesome_rss_reader.core.repository.feed_post import FeedPostRepository
+from awesome_rss_reader.core.repository.replication import ReplicationRepository
+from awesome_rss_reader.core.usecase.base import BaseUseCase
+
+logger = structlog.get_logger()
+
+# how often the replicas are checked on while waiting for them to catch up
+_replication_lag_poll_s = 1.0
+
+
+@dataclass
+class DeleteOutdatedPostsInput:
+    published_before: datetime
+    # this many of the latest posts of every feed are kept however old they are
+    keep_latest: int
+    # the posts are deleted this many at a time, out of this many feeds at a time
+    batch_size: int = 1000
+    feeds_per_batch: int = 100
+    # the feeds up to this one are skipped, so an interrupted run can pick up where it stopped
+    after_feed_id: int = 0
+    # every batch is followed by a pause, and by a wait for the replicas to catch up
+    # when they are lagging behind more than max_replication_lag_s, unless it's None
+    pause_s: float = 0
+    max_replication_lag_s: float | None = None
+
+
+@dataclass
+class DeleteOutdatedPostsProgress:
+    # the feeds up to this one are done with
+    last_feed_id: int
+    feeds: int = 0
+    deleted_posts: int = 0
+
+
+@dataclass
+class DeleteOutdatedPostsOutput:
+    progress: AsyncIterator[DeleteOutdatedPostsProgress]
+
+
+@dataclass
+class DeleteOutdatedPostsUseCase(BaseUseCase):
+    feed_repository: FeedRepository
+    post_repository: FeedPostRepository
+    replication_repository: ReplicationRepository
+
+    async def execute(self, data: DeleteOutdatedPostsInput) -> DeleteOutdatedPostsOutput:
+        return DeleteOutdatedPostsOutput(progress=self._delete_posts(data))
+
+    async def _delete_posts(
+        self,
+        data: DeleteOutdatedPostsInput,
+    ) -> AsyncIterator[DeleteOutdatedPostsProgress]:
+        progress = DeleteOutdatedPostsProgress(last_feed_id=data.after_feed_id)
+
+        while feeds := await self.feed_repository.get_list(
+            filter_by=FeedFiltering(id_after=progress.last_feed_id),
+            order_by=FeedOrdering.id_asc,
+            limit=data.feeds_per_batch,
+            offset=0,
+        ):
+            feed_ids = [feed.id for feed in feeds]
+
+            # the same feeds are gone over until there are fewer posts left than in a full batch
+            while True:
+                deleted_posts = await self.post_repository.delete_outdated(
+                    feed_ids=feed_ids,
+                    published_before=data.published_before,
+                    keep_latest=data.keep_latest,
+                    limit=data.batch_size,
+                )
+                progress.deleted_posts += deleted_posts
+                await self._throttle(data)
+                if deleted_posts < data.batch_size:
+                    break
+
+            progress.last_feed_id = feed_ids[-1]
+            progress.feeds += len(feeds)
+            yield dataclasses.replace(progress)
+
+    async def _throttle(self, data: DeleteOutdatedPostsInput) -> None:
+        await asyncio.sleep(data.pause_s)
+
+        if data.max_replication_lag_s is None:
+            return
+
+        while (
+            lag_s := await self.replication_repository.get_lag_s()
+        ) is not None and lag_s > data.max_replication_lag_s:
+            # fmt: off
+            logger.info(
+                "Waiting for the replicas to catch up",
+                lag_s=lag_s, max_lag_s=data.max_replication_lag_s,
+            )
+            # fmt: on
+            await asyncio.sleep(_replication_lag_poll_s)
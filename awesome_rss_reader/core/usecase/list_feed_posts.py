@@ -1,7 +1,8 @@
+import hashlib
 import uuid
 from dataclasses import dataclass
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from awesome_rss_reader.core.entity.feed_post import FeedPost, FeedPostFiltering, FeedPostOrdering
 from awesome_rss_reader.core.repository.feed_post import FeedPostRepository
@@ -16,6 +17,8 @@ class ListFeedPostsInput(BaseModel):
     feed_id: int | None = None
     offset: int
     limit: int
+    # versions of the listing already known to the caller
+    known_versions: list[str] = Field(default_factory=list)
 
     @model_validator(mode="after")
     def check_mutually_exclusive_fields(self) -> "ListFeedPostsInput":
@@ -31,6 +34,13 @@ class ListFeedPostsInput(BaseModel):
 @dataclass
 class ListFeedPostsOutput:
     posts: list[FeedPost]
+    version: str | None = None
+
+
+class PostsNotModifiedError(Exception):
+    def __init__(self, version: str) -> None:
+        super().__init__(f"Posts have not changed since {version=}")
+        self.version = version
 
 
 @dataclass
@@ -45,10 +55,23 @@ class ListFeedPostsUseCase(BaseUseCase):
             read_by=data.read_by,
             not_read_by=data.not_read_by,
         )
+
+        # the version is obtained before the posts, so in case of a concurrent change
+        # it's the version that gets outdated, and the caller receives the posts once again
+        version = await self._get_version(data, filtering)
+        if version in data.known_versions:
+            raise PostsNotModifiedError(version)
+
         posts = await self.post_repository.get_list(
             order_by=FeedPostOrdering.published_at_desc,
             filter_by=filtering,
             limit=data.limit,
             offset=data.offset,
         )
-        return ListFeedPostsOutput(posts=posts)
+        return ListFeedPostsOutput(posts=posts, version=version)
+
+    async def _get_version(self, data: ListFeedPostsInput, filtering: FeedPostFiltering) -> str:
+        data_version = await self.post_repository.get_list_version(filter_by=filtering)
+        # the same data looks differently depending on the requested filtering and page
+        listing = data.model_dump_json(exclude={"known_versions"})
+        return hashlib.blake2b(f"{data_version}:{listing}".encode(), digest_size=16).hexdigest()
@@ -1,5 +1,6 @@
+import hashlib
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from awesome_rss_reader.core.entity.feed import Feed, FeedFiltering, FeedOrdering
 from awesome_rss_reader.core.repository.feed import FeedRepository
@@ -11,11 +12,20 @@ class ListUserFeedsInput:
     user_uid: uuid.UUID
     offset: int
     limit: int
+    # versions of the listing already known to the caller
+    known_versions: list[str] = field(default_factory=list)
 
 
 @dataclass
 class ListUserFeedsOutput:
     feeds: list[Feed]
+    version: str | None = None
+
+
+class FeedsNotModifiedError(Exception):
+    def __init__(self, version: str) -> None:
+        super().__init__(f"Feeds have not changed since {version=}")
+        self.version = version
 
 
 @dataclass
@@ -23,12 +33,24 @@ class ListUserFollowedFeedsUseCase(BaseUseCase):
     feed_repository: FeedRepository
 
     async def execute(self, data: ListUserFeedsInput) -> ListUserFeedsOutput:
+        filtering = FeedFiltering(
+            followed_by=data.user_uid,
+        )
+
+        # obtain the version first, so a concurrent change outdates the version, not the feeds
+        version = await self._get_version(data, filtering)
+        if version in data.known_versions:
+            raise FeedsNotModifiedError(version)
+
         feeds = await self.feed_repository.get_list(
-            filter_by=FeedFiltering(
-                followed_by=data.user_uid,
-            ),
+            filter_by=filtering,
             order_by=FeedOrdering.published_at_desc,
             offset=data.offset,
             limit=data.limit,
         )
-        return ListUserFeedsOutput(feeds=feeds)
+        return ListUserFeedsOutput(feeds=feeds, version=version)
+
+    async def _get_version(self, data: ListUserFeedsInput, filtering: FeedFiltering) -> str:
+        data_version = await self.feed_repository.get_list_version(filter_by=filtering)
+        listing = f"{data.user_uid}:{data.offset}:{data.limit}"
+        return hashlib.blake2b(f"{data_version}:{listing}".encode(), digest_size=16).hexdigest()
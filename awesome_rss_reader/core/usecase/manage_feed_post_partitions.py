@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import structlog
+
+from awesome_rss_reader.core.entity.feed_post_partition import FeedPostPartition
+from awesome_rss_reader.core.repository.feed_post_partition import FeedPostPartitionRepository
+from awesome_rss_reader.core.usecase.base import BaseUseCase
+from awesome_rss_reader.utils.dtime import add_months, month_start, now_aware
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class ManageFeedPostPartitionsInput:
+    # the partitions are created for the current month and this many months ahead
+    months_ahead: int
+    # the partitions older than this many months before the current one are removed,
+    # along with the posts out of the range of the partitions, 0 to keep everything
+    retention_months: int = 0
+    # the removed partitions are detached and left to be archived instead of being dropped
+    archive: bool = False
+
+
+@dataclass
+class ManageFeedPostPartitionsOutput:
+    created: list[FeedPostPartition] = field(default_factory=list)
+    removed: list[FeedPostPartition] = field(default_factory=list)
+    deleted_posts: int = 0
+
+
+@dataclass
+class ManageFeedPostPartitionsUseCase(BaseUseCase):
+    partition_repository: FeedPostPartitionRepository
+
+    async def execute(self, data: ManageFeedPostPartitionsInput) -> ManageFeedPostPartitionsOutput:
+        output = ManageFeedPostPartitionsOutput()
+        this_month = month_start(now_aware())
+        partitions = await self.partition_repository.get_list()
+
+        output.created = await self._create_partitions(
+            existing=partitions,
+            months=[add_months(this_month, months) for months in range(data.months_ahead + 1)],
+        )
+
+        if data.retention_months > 0:
+            retained_since = add_months(this_month, -data.retention_months)
+            output.removed = await self._remove_partitions(
+                [partition for partition in partitions if partition.ends_at <= retained_since],
+                archive=data.archive,
+            )
+            output.deleted_posts = await self.partition_repository.delete_published_before(
+                retained_since
+            )
+
+        return output
+
+    async def _create_partitions(
+        self,
+        *,
+        existing: list[FeedPostPartition],
+        months: list[datetime],
+    ) -> list[FeedPostPartition]:
+        existing_months = {partition.starts_at for partition in existing}
+        return [
+            await self.partition_repository.create(starts_at=month, ends_at=add_months(month, 1))
+            for month in months
+            if month not in existing_months
+        ]
+
+    async def _remove_partitions(
+        self,
+        partitions: list[FeedPostPartition],
+        *,
+        archive: bool,
+    ) -> list[FeedPostPartition]:
+        for partition in partitions:
+            if archive:
+                await self.partition_repository.detach(partition)
+            else:
+                await self.partition_repository.drop(partition)
+        return partitions
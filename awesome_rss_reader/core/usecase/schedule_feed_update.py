@@ -3,6 +3,7 @@ from datetime import timedelta
 
 import structlog
 
+from awesome_rss_reader.application import metrics
 from awesome_rss_reader.application.settings import ApplicationSettings
 from awesome_rss_reader.core.entity.feed_refresh_job import (
     FeedRefreshJob,
@@ -28,6 +29,8 @@ class ScheduleFeedUpdateUseCase(BaseUseCase):
     job_repository: FeedRefreshJobRepository
 
     async def execute(self, data: ScheduleFeedUpdateInput) -> None:
+        await self._report_queue_depth()
+
         jobs_to_schedule = await self._get_jobs_to_schedule(
             threshold=self.app_settings.feed_update_frequency_s,
             batch_size=data.batch_size,
@@ -41,6 +44,11 @@ class ScheduleFeedUpdateUseCase(BaseUseCase):
             logger.warning("No jobs were scheduled")
             return
 
+    async def _report_queue_depth(self) -> None:
+        job_counts = await self.job_repository.count_by_state()
+        for state, count in job_counts.items():
+            metrics.FEED_REFRESH_JOBS.labels(state=state.name).set(count)
+
     async def _get_jobs_to_schedule(
         self,
         *,
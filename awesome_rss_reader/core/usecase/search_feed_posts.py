@@ -0,0 +1,91 @@
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+
+from pydantic import BaseModel, ValidationError, model_validator
+
+from awesome_rss_reader.core.entity.feed_post import (
+    FeedPost,
+    FeedPostFiltering,
+    FeedPostSearchCursor,
+)
+from awesome_rss_reader.core.repository.feed_post import FeedPostRepository
+from awesome_rss_reader.core.usecase.base import BaseUseCase
+
+
+class SearchFeedPostsInput(BaseModel):
+    query: str
+    followed_by: uuid.UUID | None = None
+    not_followed_by: uuid.UUID | None = None
+    read_by: uuid.UUID | None = None
+    not_read_by: uuid.UUID | None = None
+    feed_id: int | None = None
+    # the next_cursor of the previous page, None for the first one
+    cursor: str | None = None
+    limit: int
+
+    @model_validator(mode="after")
+    def check_mutually_exclusive_fields(self) -> "SearchFeedPostsInput":
+        if self.followed_by and self.not_followed_by:
+            raise ValueError('Only one of "followed_by" or "not_followed_by" can be specified')
+
+        if self.read_by and self.not_read_by:
+            raise ValueError('Only one of "read_by" or "not_read_by" can be specified')
+
+        return self
+
+
+@dataclass
+class SearchFeedPostsOutput:
+    posts: list[FeedPost]
+    # None once there are no more pages to fetch
+    next_cursor: str | None = None
+
+
+class InvalidSearchCursorError(Exception):
+    pass
+
+
+@dataclass
+class SearchFeedPostsUseCase(BaseUseCase):
+    post_repository: FeedPostRepository
+
+    async def execute(self, data: SearchFeedPostsInput) -> SearchFeedPostsOutput:
+        hits = await self.post_repository.search(
+            query=data.query,
+            filter_by=FeedPostFiltering(
+                feed_id=data.feed_id,
+                followed_by=data.followed_by,
+                not_followed_by=data.not_followed_by,
+                read_by=data.read_by,
+                not_read_by=data.not_read_by,
+            ),
+            after=_decode_cursor(data.cursor) if data.cursor else None,
+            limit=data.limit,
+        )
+
+        next_cursor = None
+        # a short page is the last one, a full one may as well be, which the next page tells
+        if hits and len(hits) == data.limit:
+            last_hit = hits[-1]
+            next_cursor = _encode_cursor(
+                FeedPostSearchCursor(
+                    rank=last_hit.rank,
+                    published_at=last_hit.post.published_at,
+                    id=last_hit.post.id,
+                )
+            )
+
+        return SearchFeedPostsOutput(posts=[hit.post for hit in hits], next_cursor=next_cursor)
+
+
+def _encode_cursor(cursor: FeedPostSearchCursor) -> str:
+    return base64.urlsafe_b64encode(cursor.model_dump_json().encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> FeedPostSearchCursor:
+    try:
+        return FeedPostSearchCursor.model_validate_json(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError, ValidationError) as exc:
+        raise InvalidSearchCursorError(f"Invalid search {cursor=}") from exc
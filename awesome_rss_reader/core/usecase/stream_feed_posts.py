@@ -0,0 +1,48 @@
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from awesome_rss_reader.application.settings import ApplicationSettings
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated
+from awesome_rss_reader.core.repository.feed_post_event import FeedPostEventRepository
+from awesome_rss_reader.core.repository.user_feed import UserFeedRepository
+from awesome_rss_reader.core.usecase.base import BaseUseCase
+
+
+@dataclass
+class StreamFeedPostsInput:
+    user_uid: uuid.UUID
+
+
+@dataclass
+class StreamFeedPostsOutput:
+    events: AsyncIterator[FeedPostsCreated]
+
+
+@dataclass
+class StreamFeedPostsUseCase(BaseUseCase):
+    app_settings: ApplicationSettings
+    user_feed_repository: UserFeedRepository
+    event_repository: FeedPostEventRepository
+
+    async def execute(self, data: StreamFeedPostsInput) -> StreamFeedPostsOutput:
+        return StreamFeedPostsOutput(events=self._stream_events(data.user_uid))
+
+    async def _stream_events(self, user_uid: uuid.UUID) -> AsyncIterator[FeedPostsCreated]:
+        followed_feed_ids: set[int] = set()
+        refresh_after = 0.0
+
+        async with self.event_repository.subscribe() as events:
+            async for event in events:
+                # the followed feeds are only looked up once there is something to deliver,
+                # and are reused for a while, so (un)follows are picked up with a delay
+                if time.monotonic() >= refresh_after:
+                    feed_ids = await self.user_feed_repository.get_followed_feed_ids(user_uid)
+                    followed_feed_ids = set(feed_ids)
+                    refresh_after = (
+                        time.monotonic() + self.app_settings.post_stream_follows_refresh_s
+                    )
+
+                if event.feed_id in followed_feed_ids:
+                    yield event
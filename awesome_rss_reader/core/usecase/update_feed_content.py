@@ -1,10 +1,15 @@
 import asyncio
+import time
 import uuid
-from dataclasses import dataclass
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Any
 
 import structlog
 
+from awesome_rss_reader.application import metrics
 from awesome_rss_reader.application.settings import ApplicationSettings
 from awesome_rss_reader.core.entity.feed import Feed, FeedFiltering, FeedUpdates
 from awesome_rss_reader.core.entity.feed_content import (
@@ -12,7 +17,7 @@ from awesome_rss_reader.core.entity.feed_content import (
     FeedContentRequest,
     FeedContentResult,
 )
-from awesome_rss_reader.core.entity.feed_post import NewFeedPost
+from awesome_rss_reader.core.entity.feed_post import FeedPost, FeedPostsCreated, NewFeedPost
 from awesome_rss_reader.core.entity.feed_refresh_job import (
     FeedRefreshJob,
     FeedRefreshJobFiltering,
@@ -24,9 +29,10 @@ from awesome_rss_reader.core.repository.atomic import AtomicProvider
 from awesome_rss_reader.core.repository.feed import FeedRepository
 from awesome_rss_reader.core.repository.feed_content import FeedContentRepository
 from awesome_rss_reader.core.repository.feed_post import FeedPostRepository
+from awesome_rss_reader.core.repository.feed_post_event import FeedPostEventRepository
 from awesome_rss_reader.core.repository.feed_refresh_job import FeedRefreshJobRepository
 from awesome_rss_reader.core.usecase.base import BaseUseCase
-from awesome_rss_reader.utils.dtime import now_aware
+from awesome_rss_reader.utils.dtime import add_months, month_start, now_aware
 
 logger = structlog.get_logger()
 
@@ -38,9 +44,38 @@ class _FetchResult:
     error: Exception | None = None
 
 
+@dataclass
+class _BatchTimings:
+    """Time spent on each stage of a batch, collected for the batch summary log line."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.stages[name] = elapsed
+            metrics.FEED_UPDATE_STAGE_DURATION.labels(stage=name).observe(elapsed)
+
+    def as_log_kwargs(self) -> dict[str, float]:
+        # fmt: off
+        return {
+            "total_s": round(time.perf_counter() - self.started_at, 3),
+            **{f"{name}_s": round(elapsed, 3) for name, elapsed in self.stages.items()},
+        }
+        # fmt: on
+
+
 @dataclass
 class UpdateFeedContentInput:
     batch_size: int
+    # the results of the batch are saved this many at a time, so the saves never queue up
+    # for the database connections past the pool timeout, all of them at once unless it's set
+    max_concurrent_saves: int | None = None
 
 
 @dataclass
@@ -50,20 +85,34 @@ class UpdateFeedContentUseCase(BaseUseCase):
     feed_repository: FeedRepository
     feed_content_repository: FeedContentRepository
     post_repository: FeedPostRepository
+    post_event_repository: FeedPostEventRepository
     atomic: AtomicProvider
 
     async def execute(self, data: UpdateFeedContentInput) -> None:
-        jobs_to_process = await self._get_available_jobs(batch_size=data.batch_size)
+        timings = _BatchTimings()
+        try:
+            await self._process_batch(data, timings)
+        finally:
+            logger.info("Feed update batch timings", **timings.as_log_kwargs())
+
+    async def _process_batch(self, data: UpdateFeedContentInput, timings: _BatchTimings) -> None:
+        with timings.stage("get_jobs"):
+            jobs_to_process = await self._get_available_jobs(batch_size=data.batch_size)
         if not jobs_to_process:
             logger.info("No jobs to process")
             return
 
-        received_jobs = await self._receive_jobs(jobs_to_process)
+        with timings.stage("receive_jobs"):
+            received_jobs = await self._receive_jobs(jobs_to_process)
         if not received_jobs:
             logger.warning("No jobs were received")
             return
 
-        await self._process_received_jobs(received_jobs)
+        await self._process_received_jobs(
+            received_jobs,
+            timings,
+            max_concurrent_saves=data.max_concurrent_saves,
+        )
 
     async def _get_available_jobs(self, *, batch_size: int) -> list[FeedRefreshJob]:
         return await self.job_repository.get_list(
@@ -94,6 +143,17 @@ class UpdateFeedContentUseCase(BaseUseCase):
 
         return received_jobs
 
+    def _get_published_since(self, feed: Feed) -> datetime | None:
+        if not (retention_months := self.app_settings.feed_post_retention_months):
+            return feed.published_at
+
+        # the posts older than the retained ones would be deleted anyway,
+        # and once they are, they are not to come back with the next update of the feed
+        retained_since = add_months(month_start(now_aware()), -retention_months)
+        if feed.published_at is None:
+            return retained_since
+        return max(feed.published_at, retained_since)
+
     async def _get_feeds(self, feed_ids: list[int]) -> list[Feed]:
         return await self.feed_repository.get_list(
             filter_by=FeedFiltering(
@@ -103,17 +163,41 @@ class UpdateFeedContentUseCase(BaseUseCase):
             offset=0,
         )
 
-    async def _process_received_jobs(self, jobs: list[FeedRefreshJob]) -> None:
+    async def _process_received_jobs(
+        self,
+        jobs: list[FeedRefreshJob],
+        timings: _BatchTimings,
+        *,
+        max_concurrent_saves: int | None,
+    ) -> None:
         logger.info("Processing jobs", count=len(jobs))
 
-        fetch_results = await self._fetch_content_for_jobs(jobs)
+        fetch_results = await self._fetch_content_for_jobs(jobs, timings)
+
+        with timings.stage("process"):
+            await self._process_fetch_results(
+                fetch_results,
+                max_concurrent_saves=max_concurrent_saves,
+            )
+
+    async def _process_fetch_results(
+        self,
+        fetch_results: list[_FetchResult],
+        *,
+        max_concurrent_saves: int | None,
+    ) -> None:
+        limiter = asyncio.Semaphore(max_concurrent_saves or len(fetch_results) or 1)
         process_result_tasks = []
 
         for fr in fetch_results:
             if fr.error is not None:
-                process_result_tasks.append(self._process_job_exception(exc=fr.error, job=fr.job))
+                process_result_tasks.append(
+                    _limited(limiter, self._process_job_exception(exc=fr.error, job=fr.job))
+                )
             elif fr.result is not None:
-                process_result_tasks.append(self._process_job_result(result=fr.result, job=fr.job))
+                process_result_tasks.append(
+                    _limited(limiter, self._process_job_result(result=fr.result, job=fr.job))
+                )
 
         maybe_errors = await asyncio.gather(*process_result_tasks, return_exceptions=True)
         # log unhandled exceptions that occurred in the gather call
@@ -122,7 +206,11 @@ class UpdateFeedContentUseCase(BaseUseCase):
                 continue
             logger.error("Failed to process job result", error=maybe_err)
 
-    async def _fetch_content_for_jobs(self, jobs: list[FeedRefreshJob]) -> list[_FetchResult]:
+    async def _fetch_content_for_jobs(
+        self,
+        jobs: list[FeedRefreshJob],
+        timings: _BatchTimings,
+    ) -> list[_FetchResult]:
         # fmt: off
         job_per_feed_id = {
             job.feed_id: job for job in jobs
@@ -136,13 +224,14 @@ class UpdateFeedContentUseCase(BaseUseCase):
         }
         # fmt: on
 
-        feeds = await self._get_feeds(feed_ids=list(job_per_feed_id))
+        with timings.stage("get_feeds"):
+            feeds = await self._get_feeds(feed_ids=list(job_per_feed_id))
 
         requests = [
             FeedContentRequest(
                 request_id=request_id_per_job_id[job_per_feed_id[feed.id].id],
                 url=feed.url,
-                published_since=feed.published_at,
+                published_since=self._get_published_since(feed),
             )
             for feed in feeds
         ]
@@ -150,9 +239,12 @@ class UpdateFeedContentUseCase(BaseUseCase):
         request = FeedContentBatchRequest(
             timeout_s=self.app_settings.feed_update_fetch_timeout_s,
             max_body_size_b=self.app_settings.feed_max_size_b,
+            max_compressed_body_size_b=self.app_settings.feed_max_compressed_size_b,
+            stop_after_outdated=self.app_settings.feed_stop_after_outdated_posts,
             requests=requests,
         )
-        response = await self.feed_content_repository.fetch_many(request)
+        with timings.stage("fetch"):
+            response = await self.feed_content_repository.fetch_many(request)
 
         fetch_results = []
 
@@ -169,6 +261,73 @@ class UpdateFeedContentUseCase(BaseUseCase):
     async def _process_job_result(self, *, result: FeedContentResult, job: FeedRefreshJob) -> None:
         logger.info("Update feed content job succeeded", feed=job.feed_id, job=job.id)
 
+        persist_started_at = time.perf_counter()
+        posts = await self._save_job_result(result=result, job=job)
+        persist_s = time.perf_counter() - persist_started_at
+        metrics.FEED_PERSIST_DURATION.observe(persist_s)
+
+        self._log_feed_timings(result=result, job=job, persist_s=persist_s)
+
+        if posts is None:
+            metrics.FEED_UNCHANGED.inc()
+            logger.info("Feed has no new content", feed=job.feed_id, job=job.id)
+            return
+
+        metrics.FEED_POSTS.labels(outcome="inserted").inc(len(posts))
+        metrics.FEED_POSTS.labels(outcome="conflicted").inc(len(result.items) - len(posts))
+
+        # fmt: off
+        logger.info(
+            "Feed content updated",
+            feed_id=job.feed_id, job_id=job.id, new_posts=len(posts),
+        )
+        # fmt: on
+
+        if posts:
+            await self._publish_new_posts(feed_id=job.feed_id, post_ids=[post.id for post in posts])
+
+    def _log_feed_timings(
+        self,
+        *,
+        result: FeedContentResult,
+        job: FeedRefreshJob,
+        persist_s: float,
+    ) -> None:
+        """
+        Log the time spent on the feed, as a warning if it exceeds any of the slow feed thresholds.
+        """
+        stats = result.stats
+        download_s = stats.download_s if stats else None
+        parse_s = stats.parse_s if stats else None
+
+        slow_reasons = []
+        if download_s is not None and download_s > self.app_settings.feed_slow_download_s:
+            slow_reasons.append("download")
+        if parse_s is not None and parse_s > self.app_settings.feed_slow_parse_s:
+            slow_reasons.append("parse")
+        if len(result.items) > self.app_settings.feed_slow_item_count:
+            slow_reasons.append("item_count")
+
+        log = logger.warning if slow_reasons else logger.debug
+        # fmt: off
+        log(
+            "Slow feed update" if slow_reasons else "Feed update timings",
+            feed_id=job.feed_id, job_id=job.id, slow=slow_reasons,
+            download_s=download_s, parse_s=parse_s, persist_s=round(persist_s, 3),
+            size_b=stats.size_b if stats else None, items=len(result.items),
+        )
+        # fmt: on
+
+    async def _save_job_result(
+        self,
+        *,
+        result: FeedContentResult,
+        job: FeedRefreshJob,
+    ) -> list[FeedPost] | None:
+        """
+        Complete the job and save the new posts of the feed, if there are any.
+        Return the created posts, or None if the feed has nothing new.
+        """
         async with self.atomic.transaction():
             await self.job_repository.transit_state(
                 job_id=job.id,
@@ -183,8 +342,7 @@ class UpdateFeedContentUseCase(BaseUseCase):
             )
 
             if not result.items:
-                logger.info("Feed has no new content", feed=job.feed_id, job=job.id)
-                return
+                return None
 
             await self.feed_repository.update(
                 feed_id=job.feed_id,
@@ -205,14 +363,22 @@ class UpdateFeedContentUseCase(BaseUseCase):
                 )
                 for feed_item in result.items
             ]
-            posts = await self.post_repository.create_many(new_posts)
+            return await self.post_repository.create_many(
+                new_posts,
+                max_posts_per_feed=self.app_settings.max_posts_per_feed,
+            )
 
-        # fmt: off
-        logger.info(
-            "Feed content updated",
-            feed_id=job.feed_id, job_id=job.id, new_posts=len(posts),
-        )
-        # fmt: on
+    async def _publish_new_posts(self, *, feed_id: int, post_ids: list[int]) -> None:
+        """
+        Let the post stream subscribers know about the new posts.
+        The posts are already saved, so a failure here is not a reason to fail the job.
+        """
+        try:
+            await self.post_event_repository.publish(
+                FeedPostsCreated(feed_id=feed_id, post_ids=post_ids)
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to publish new posts", feed_id=feed_id, error=exc)
 
     async def _process_job_exception(self, *, exc: Exception, job: FeedRefreshJob) -> None:
         logger.warning("Feed content update failed", error=exc, feed_id=job.feed_id, job_id=job.id)
@@ -260,6 +426,8 @@ class UpdateFeedContentUseCase(BaseUseCase):
         """
         Reschedule a job to be retried at another time.
         """
+        metrics.FEED_REFRESH_JOB_RETRIES.inc()
+
         async with self.atomic.transaction():
             job = await self.job_repository.transit_state(
                 job_id=job.id,
@@ -280,3 +448,8 @@ class UpdateFeedContentUseCase(BaseUseCase):
             feed_id=job.feed_id, job_id=job.id, after=new_execute_after, retries=new_retries,
         )
         # fmt: on
+
+
+async def _limited(limiter: asyncio.Semaphore, coro: Coroutine[Any, Any, None]) -> None:
+    async with limiter:
+        await coro
@@ -0,0 +1,134 @@
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from io import BytesIO
+
+import httpx
+
+# only the encodings that can be decompressed within the size limit are asked for
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+class FeedBodyError(Exception):
+    pass
+
+
+class FeedBodyTooLargeError(FeedBodyError):
+    pass
+
+
+class _BodyDecoder(ABC):
+    @abstractmethod
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        """
+        Decode the next chunk of the body.
+        More than max_length bytes decoded out of it are not decoded any further,
+        so the caller can tell the body exceeds the limit without holding all of it.
+        """
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _IdentityDecoder(_BodyDecoder):
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        return data
+
+
+@dataclass
+class _ZlibDecoder(_BodyDecoder):
+    wbits: int
+    # servers sending deflate bodies without the zlib header are not unheard of
+    raw_fallback: bool = False
+
+    _decompressor: "zlib._Decompress" = field(init=False)
+    _started: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        self._decompressor = zlib.decompressobj(self.wbits)
+
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        try:
+            decoded = self._decompressor.decompress(data, max_length)
+        except zlib.error as exc:
+            if self._started or not self.raw_fallback:
+                raise FeedBodyError(f"failed to decompress body: {exc}") from exc
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            self._started = True
+            return self.decode(data, max_length)
+
+        self._started = True
+        return decoded
+
+    def flush(self) -> bytes:
+        try:
+            return self._decompressor.flush()
+        except zlib.error as exc:
+            raise FeedBodyError(f"failed to decompress body: {exc}") from exc
+
+
+def _init_decoder(content_encoding: str) -> _BodyDecoder:
+    encodings = [
+        encoding
+        for encoding in (value.strip().lower() for value in content_encoding.split(","))
+        if encoding and encoding != "identity"
+    ]
+    match encodings:
+        case []:
+            return _IdentityDecoder()
+        case ["gzip" | "x-gzip"]:
+            return _ZlibDecoder(wbits=zlib.MAX_WBITS | 16)
+        case ["deflate"]:
+            return _ZlibDecoder(wbits=zlib.MAX_WBITS, raw_fallback=True)
+        case _:
+            raise FeedBodyError(f"unsupported {content_encoding=}")
+
+
+def _content_length(response: httpx.Response) -> int | None:
+    try:
+        return int(response.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def read_feed_body(
+    response: httpx.Response,
+    *,
+    max_size: int,
+    max_compressed_size: int,
+) -> BytesIO:
+    """
+    Read the body of a streamed response, decompressing it on the go.
+    The body is limited in size both as it is downloaded and as it is decompressed,
+    the former also keeps a compressed body from blowing up past the latter
+    before it is noticed. The compressed size limit only applies to the compressed bodies,
+    the ones sent as they are are only held to the size limit.
+
+    The decompressed body is written straight into the buffer it is returned in,
+    which is meant to be handed over to the parser as it is.
+    """
+    decoder = _init_decoder(response.headers.get("content-encoding", ""))
+    max_download_size = max_size if isinstance(decoder, _IdentityDecoder) else max_compressed_size
+
+    # the body is not downloaded at all when it is known to be too large upfront
+    content_length = _content_length(response)
+    if content_length is not None and content_length > max_download_size:
+        raise FeedBodyTooLargeError(f"{content_length=} exceeds {max_download_size=}")
+
+    body = BytesIO()
+    download_size = 0
+
+    async for chunk in response.aiter_raw():
+        download_size += len(chunk)
+        if download_size > max_download_size:
+            raise FeedBodyTooLargeError(f"body exceeds {max_download_size=}")
+        body.write(decoder.decode(chunk, max_size - body.tell() + 1))
+        if body.tell() > max_size:
+            raise FeedBodyTooLargeError(f"decompressed body exceeds {max_size=}")
+
+    body.write(decoder.flush())
+    if body.tell() > max_size:
+        raise FeedBodyTooLargeError(f"decompressed body exceeds {max_size=}")
+
+    body.seek(0)
+    return body
@@ -0,0 +1,68 @@
+import re
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+import dateutil.parser
+
+# feeds are refreshed over and over, the same odd dates keep coming back until their posts age out
+_fuzzy_cache_size = 4096
+
+# the dates ending with a utc offset or a timezone name, e.g. "+02:00", "-0400", "Z", "GMT" or "EST"
+_with_timezone_re = re.compile(r"(?:[+-]\d{2}:?\d{2}|\dZ|\b(?!(?:AM|PM)\b)[A-Z]{1,5})$", re.I)
+
+
+def parse_published_at(value: str | None, parsed: time.struct_time | None = None) -> datetime:
+    """
+    Parse the publication date of a feed post, trying the cheapest ways first.
+
+    The date feedparser has already parsed is used as is, it comes normalized to UTC.
+    feedparser takes the dates without a timezone for UTC ones though, while such dates
+    are rejected, so it's only used once the original value has a timezone of its own.
+    Otherwise, the date is parsed as RFC 822 or ISO 8601, the formats of RSS and Atom,
+    and only the dates in neither format end up with the much slower dateutil.
+
+    Raise ValueError if the date cannot be parsed.
+    """
+    if parsed is not None and (not value or _with_timezone_re.search(value.strip())):
+        try:
+            return datetime(*parsed[:6], tzinfo=UTC)
+        except ValueError:
+            # e.g. leap seconds, let the parsers below have a go at the original value
+            pass
+
+    if not value or not (value := value.strip()):
+        raise ValueError("date is missing")
+
+    if (published_at := _parse_rfc822(value)) is not None:
+        return published_at
+    if (published_at := _parse_iso8601(value)) is not None:
+        return published_at
+
+    return _parse_fuzzy(value)
+
+
+def _parse_rfc822(value: str) -> datetime | None:
+    try:
+        published_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    # the dates without a timezone are left to dateutil, as they always have been
+    return published_at if published_at.tzinfo is not None else None
+
+
+def _parse_iso8601(value: str) -> datetime | None:
+    try:
+        published_at = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return published_at if published_at.tzinfo is not None else None
+
+
+@lru_cache(maxsize=_fuzzy_cache_size)
+def _parse_fuzzy(value: str) -> datetime:
+    try:
+        return dateutil.parser.parse(value)
+    except OverflowError as exc:
+        raise ValueError(f"date {value=} is out of range") from exc
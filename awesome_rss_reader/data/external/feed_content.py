@@ -1,26 +1,42 @@
 import asyncio
+import time
 import uuid  # noqa: TCH003
+from dataclasses import dataclass, field
 from datetime import datetime
 from io import BytesIO
+from typing import Any
 
-import dateutil.parser
-import feedparser
 import httpx
 import pydantic
 import structlog
 
+from awesome_rss_reader.application import metrics, tracing
 from awesome_rss_reader.core.entity.feed_content import (
     FeedContentBatchRequest,
     FeedContentBatchResponse,
     FeedContentRequest,
     FeedContentResult,
     FeedContentResultItem,
+    FeedContentStats,
 )
 from awesome_rss_reader.core.repository.feed_content import (
     FeedContentFetchError,
     FeedContentParseError,
     FeedContentRepository,
 )
+from awesome_rss_reader.data.external.body import (
+    ACCEPT_ENCODING,
+    FeedBodyError,
+    FeedBodyTooLargeError,
+    read_feed_body,
+)
+from awesome_rss_reader.data.external.dates import parse_published_at
+from awesome_rss_reader.data.external.outdated import cut_outdated_items
+from awesome_rss_reader.data.external.parsers import (
+    FeedContentParser,
+    FeedParseError,
+    FeedparserContentParser,
+)
 
 logger = structlog.get_logger()
 
@@ -29,7 +45,16 @@ class _FeedPostParseError(Exception):
     """internal exception for handling badly formatted feed posts"""
 
 
+@dataclass
+class _FetchedFeed:
+    content: BytesIO
+    download_s: float
+
+
+@dataclass
 class ExternalFeedContentRepository(FeedContentRepository):
+    parser: FeedContentParser = field(default_factory=FeedparserContentParser)
+
     async def fetch_many(self, request: FeedContentBatchRequest) -> FeedContentBatchResponse:
         # fmt: off
         request_per_url: dict[str, FeedContentRequest] = {
@@ -41,23 +66,25 @@ class ExternalFeedContentRepository(FeedContentRepository):
             urls=feed_urls,
             timeout=request.timeout_s,
             max_body_size=request.max_body_size_b,
+            max_compressed_body_size=request.max_compressed_body_size_b or request.max_body_size_b,
         )
 
         errors: dict[uuid.UUID, Exception] = {}
         results: dict[uuid.UUID, FeedContentResult] = {}
 
-        for resp_body_or_exc, url in zip(fetch_responses, feed_urls, strict=True):
+        for fetched_or_exc, url in zip(fetch_responses, feed_urls, strict=True):
             req = request_per_url[url]
 
-            if isinstance(resp_body_or_exc, Exception):
-                errors[req.request_id] = resp_body_or_exc
+            if isinstance(fetched_or_exc, Exception):
+                errors[req.request_id] = fetched_or_exc
                 continue
 
             try:
-                feed_content = self._parse_feed_contents(
+                feed_content = self._parse_fetched_feed(
                     url=url,
-                    content=resp_body_or_exc,
+                    fetched=fetched_or_exc,
                     ignore_before=req.published_since,
+                    stop_after_outdated=request.stop_after_outdated,
                 )
             except FeedContentParseError as exc:
                 errors[req.request_id] = exc
@@ -73,12 +100,32 @@ class ExternalFeedContentRepository(FeedContentRepository):
         url: str,
         *,
         max_body_size: int,
-    ) -> BytesIO:
-        try:
-            return await self._fetch_feed_contents_chunked(client, url, max_body_size=max_body_size)
-        except (httpx.HTTPError, httpx.HTTPStatusError) as exc:
-            logger.warning("Failed to fetch feed", url=url, error=exc)
-            raise FeedContentFetchError(f"failed to fetch {url=}") from exc
+        max_compressed_body_size: int,
+    ) -> _FetchedFeed:
+        started_at = time.perf_counter()
+        outcome = "error"
+        with tracing.start_span("feed.fetch", kind="client", attributes={"http.url": url}) as span:
+            try:
+                content = await self._fetch_feed_contents_chunked(
+                    client,
+                    url,
+                    max_body_size=max_body_size,
+                    max_compressed_body_size=max_compressed_body_size,
+                )
+                outcome = "ok"
+            except (httpx.HTTPError, httpx.HTTPStatusError) as exc:
+                logger.warning("Failed to fetch feed", url=url, error=exc)
+                raise FeedContentFetchError(f"failed to fetch {url=}") from exc
+            finally:
+                elapsed = time.perf_counter() - started_at
+                metrics.FEED_FETCH_DURATION.labels(outcome=outcome).observe(elapsed)
+
+            size_b = content.getbuffer().nbytes
+            if span is not None:
+                span.set_attribute("http.response.body.size", size_b)
+
+        metrics.FEED_BODY_SIZE.observe(size_b)
+        return _FetchedFeed(content=content, download_s=elapsed)
 
     async def _fetch_feed_contents_chunked(
         self,
@@ -86,20 +133,22 @@ class ExternalFeedContentRepository(FeedContentRepository):
         url: str,
         *,
         max_body_size: int,
+        max_compressed_body_size: int,
     ) -> BytesIO:
-        content = BytesIO()
-
         async with client.stream("GET", url) as resp:
             resp.raise_for_status()
 
-            async for chunk in resp.aiter_bytes():
-                content.write(chunk)
-                # don't read more than max_body_size
-                if content.tell() > max_body_size:
-                    raise FeedContentFetchError(f"feed {url=} exceeds {max_body_size=} limit")
-
-        content.seek(0)
-        return content
+            try:
+                return await read_feed_body(
+                    resp,
+                    max_size=max_body_size,
+                    max_compressed_size=max_compressed_body_size,
+                )
+            except FeedBodyTooLargeError as exc:
+                raise FeedContentFetchError(f"feed {url=} exceeds size limit: {exc}") from exc
+            except FeedBodyError as exc:
+                logger.warning("Failed to read feed body", url=url, error=exc)
+                raise FeedContentFetchError(f"failed to read body of {url=}") from exc
 
     async def _fetch_feeds(
         self,
@@ -107,39 +156,81 @@ class ExternalFeedContentRepository(FeedContentRepository):
         urls: list[str],
         timeout: int,
         max_body_size: int,
-    ) -> list[BytesIO | Exception]:
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        max_compressed_body_size: int,
+    ) -> list[_FetchedFeed | Exception]:
+        # fmt: off
+        async with httpx.AsyncClient(
+            timeout=timeout, headers={"Accept-Encoding": ACCEPT_ENCODING},
+        ) as client:
             tasks = [
-                self._fetch_feed_contents(client, url, max_body_size=max_body_size) for url in urls
+                self._fetch_feed_contents(
+                    client, url,
+                    max_body_size=max_body_size, max_compressed_body_size=max_compressed_body_size,
+                )
+                for url in urls
             ]
+        # fmt: on
             return await asyncio.gather(*tasks, return_exceptions=True)
 
+    def _parse_fetched_feed(
+        self,
+        *,
+        url: str,
+        fetched: _FetchedFeed,
+        ignore_before: datetime | None = None,
+        stop_after_outdated: int = 0,
+    ) -> FeedContentResult:
+        started_at = time.perf_counter()
+        outcome = "error"
+        with tracing.start_span("feed.parse", attributes={"http.url": url}):
+            try:
+                result = self._parse_feed_contents(
+                    url=url,
+                    content=fetched.content,
+                    ignore_before=ignore_before,
+                    stop_after_outdated=stop_after_outdated,
+                )
+                outcome = "ok"
+            finally:
+                elapsed = time.perf_counter() - started_at
+                metrics.FEED_PARSE_DURATION.labels(outcome=outcome).observe(elapsed)
+
+        result.stats = FeedContentStats(
+            download_s=fetched.download_s,
+            parse_s=elapsed,
+            size_b=fetched.content.getbuffer().nbytes,
+        )
+        return result
+
     def _parse_feed_contents(
         self,
         *,
         url: str,
         content: BytesIO,
         ignore_before: datetime | None = None,
+        stop_after_outdated: int = 0,
     ) -> FeedContentResult:
+        if ignore_before and stop_after_outdated:
+            content = self._cut_outdated_items(
+                url=url,
+                content=content,
+                published_since=ignore_before,
+                stop_after=stop_after_outdated,
+            )
+
         try:
-            rss = feedparser.parse(content)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to parse feed", url=url, error=exc)
+            parsed = self.parser.parse(content)
+        except FeedParseError as exc:
+            logger.warning("Failed to parse feed contents", url=url, error=exc)
             raise FeedContentParseError(f"failed to parse contents of {url=}") from exc
 
-        if parsed_exc := rss.get("bozo_exception"):
-            logger.warning("Failed to parse feed contents", url=url, error=parsed_exc)
-            raise FeedContentParseError(f"failed to parse contents of {url=}") from parsed_exc
-
-        try:
-            channel_title = rss["feed"]["title"]
-        except KeyError:
+        if (channel_title := parsed.title) is None:
             raise FeedContentParseError(f"feed {url=} has no channel info")
 
         if not (channel_title := channel_title.strip()):
             raise FeedContentParseError(f"feed {url=} has empty channel title")
 
-        feed_items = self._parse_feed_posts(rss["entries"], ignore_before=ignore_before)
+        feed_items = self._parse_feed_posts(parsed.entries, ignore_before=ignore_before)
 
         return FeedContentResult(
             title=channel_title,
@@ -147,9 +238,36 @@ class ExternalFeedContentRepository(FeedContentRepository):
             items=feed_items,
         )
 
+    def _cut_outdated_items(
+        self,
+        *,
+        url: str,
+        content: BytesIO,
+        published_since: datetime,
+        stop_after: int,
+    ) -> BytesIO:
+        """
+        Spare the parser the posts older than the ones that would be ignored anyway.
+        """
+        shortened = cut_outdated_items(
+            content,
+            published_since=published_since,
+            stop_after=stop_after,
+        )
+        if shortened is None:
+            return content
+
+        # fmt: off
+        logger.debug(
+            "Cut outdated feed posts off",
+            url=url, size_b=content.getbuffer().nbytes, parsed_size_b=shortened.getbuffer().nbytes,
+        )
+        # fmt: on
+        return shortened
+
     def _parse_feed_posts(
         self,
-        rss_items: list[dict[str, str]],
+        rss_items: list[dict[str, Any]],
         *,
         ignore_before: datetime | None = None,
     ) -> list[FeedContentResultItem]:
@@ -179,12 +297,15 @@ class ExternalFeedContentRepository(FeedContentRepository):
 
         return feed_posts
 
-    def _parse_feed_post(self, rss_item: dict[str, str]) -> FeedContentResultItem:
+    def _parse_feed_post(self, rss_item: dict[str, Any]) -> FeedContentResultItem:
         maybe_guid = rss_item.get("guid")
 
         try:
-            published_at = dateutil.parser.parse(rss_item["published"])
-        except (KeyError, dateutil.parser.ParserError) as exc:
+            published_at = parse_published_at(
+                rss_item.get("published"),
+                rss_item.get("published_parsed"),
+            )
+        except ValueError as exc:
             logger.debug("Failed to parse feed post publication date", guid=maybe_guid, error=exc)
             raise _FeedPostParseError("failed to parse post publication date") from exc
 
@@ -0,0 +1,148 @@
+import codecs
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import BytesIO
+from xml.parsers import expat
+
+from awesome_rss_reader.data.external.dates import parse_published_at
+
+# the content is scanned in chunks, so a scan stopped early does not go through the rest of it
+_chunk_size = 64 * 1024
+
+_item_elements = frozenset({"item", "entry"})
+# the same elements feedparser takes the publication date of a post from
+_date_elements = frozenset({"pubDate", "published", "issued"})
+
+
+class _ScanStoppedError(Exception):
+    """internal exception for stopping the scan once the outdated items are found"""
+
+
+@dataclass
+class _OutdatedItemsScanner:
+    published_since: datetime
+    stop_after: int
+
+    cut_at: int | None = field(default=None, init=False)
+    closing_tags: str = field(default="", init=False)
+
+    _parser: expat.XMLParserType = field(init=False)
+    _open_elements: list[str] = field(default_factory=list, init=False)
+    _item_depth: int | None = field(default=None, init=False)
+    _in_item: bool = field(default=False, init=False)
+    _item_published: str | None = field(default=None, init=False)
+    _date_parts: list[str] | None = field(default=None, init=False)
+    _outdated_in_row: int = field(default=0, init=False)
+    _seen_feed_title: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        self._parser = expat.ParserCreate()
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._character_data
+
+    def scan(self, content: BytesIO) -> None:
+        view = content.getbuffer()
+        try:
+            for offset in range(0, len(view), _chunk_size):
+                self._parser.Parse(view[offset : offset + _chunk_size], False)  # noqa: FBT003
+            self._parser.Parse(b"", True)  # noqa: FBT003
+        except _ScanStoppedError:
+            pass
+        finally:
+            view.release()
+
+    def _start_element(self, name: str, _attrs: dict[str, str]) -> None:
+        depth = len(self._open_elements)
+        local_name = name.rpartition(":")[2]
+
+        if self._is_item(local_name, depth):
+            # the channel title may come after the items, it must not be cut off along with them
+            if self._outdated_in_row >= self.stop_after and self._seen_feed_title:
+                self.cut_at = self._parser.CurrentByteIndex
+                self.closing_tags = "".join(
+                    f"</{open_name}>" for open_name in reversed(self._open_elements)
+                )
+                raise _ScanStoppedError
+            self._item_depth = depth
+            self._in_item = True
+            self._item_published = None
+        elif self._in_item and depth - 1 == self._item_depth and local_name in _date_elements:
+            self._date_parts = []
+
+        self._open_elements.append(name)
+
+    def _end_element(self, name: str) -> None:
+        self._open_elements.pop()
+        depth = len(self._open_elements)
+        local_name = name.rpartition(":")[2]
+
+        if self._date_parts is not None and depth - 1 == self._item_depth:
+            # the last date wins, as it does with feedparser
+            self._item_published = "".join(self._date_parts)
+            self._date_parts = None
+        elif self._in_item and depth == self._item_depth:
+            self._in_item = False
+            self._count_item()
+        elif not self._in_item and local_name == "title":
+            self._seen_feed_title = True
+
+    def _character_data(self, data: str) -> None:
+        if self._date_parts is not None:
+            self._date_parts.append(data)
+
+    def _is_item(self, local_name: str, depth: int) -> bool:
+        if self._in_item or local_name not in _item_elements:
+            return False
+        return self._item_depth is None or depth == self._item_depth
+
+    def _count_item(self) -> None:
+        try:
+            published_at = parse_published_at(self._item_published)
+        except ValueError:
+            published_at = None
+
+        # the items without a usable date are not known to be outdated
+        if published_at is None or published_at.tzinfo is None:
+            self._outdated_in_row = 0
+        elif published_at < self.published_since:
+            self._outdated_in_row += 1
+        else:
+            self._outdated_in_row = 0
+
+
+def cut_outdated_items(
+    content: BytesIO,
+    *,
+    published_since: datetime,
+    stop_after: int,
+) -> BytesIO | None:
+    """
+    Scan the items of a feed in document order, and once stop_after items in a row
+    turn out to be published before published_since, cut the rest of the items off the feed.
+    Feeds list their posts newest first, so the items past that point are only older ones.
+
+    Return the shortened feed content, or None if the feed is to be parsed in full:
+    either nothing was cut off, or the content could not be scanned.
+    The latter is left for the feed parser to deal with.
+    """
+    head = content.getbuffer()[:4].tobytes()
+    # the closing tags are appended as they are, which only works for ascii compatible encodings
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) or b"\x00" in head:
+        return None
+
+    scanner = _OutdatedItemsScanner(published_since=published_since, stop_after=stop_after)
+    try:
+        scanner.scan(content)
+    except (expat.ExpatError, ValueError):
+        return None
+
+    if scanner.cut_at is None:
+        return None
+
+    shortened = BytesIO()
+    shortened.write(content.getbuffer()[: scanner.cut_at])
+    shortened.write(scanner.closing_tags.encode())
+    shortened.seek(0)
+
+    return shortened
@@ -0,0 +1,470 @@
+import contextlib
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, ClassVar
+from xml.etree import ElementTree
+
+import feedparser
+import structlog
+
+# the private helpers below are what keeps the element tree parsers on par with feedparser,
+# feedparser is pinned to the patch releases of the version they were written against
+from feedparser.datetimes import _parse_date
+from feedparser.html import _cp1252
+from feedparser.mixin import _FeedParserMixin
+from feedparser.sanitizer import _sanitize_html
+from feedparser.urls import _urljoin
+
+from awesome_rss_reader.application import metrics
+from awesome_rss_reader.application.settings import ApplicationSettings
+
+logger = structlog.get_logger()
+
+# namespaces are matched case-insensitively, as feedparser does it
+_atom_feed_tag = "{http://www.w3.org/2005/atom}feed"
+_xml_base = "{http://www.w3.org/XML/1998/namespace}base"
+
+# the elements are named the way feedparser names them, after the prefixes it knows
+_ns_prefixes = {uri.lower(): prefix.lower() for uri, prefix in _FeedParserMixin.namespaces.items()}
+
+# the elements of a post the fields are taken from, see feedparser.namespaces._base
+_title_elements = frozenset({"title", "dc:title"})
+_description_elements = frozenset({"description", "dc:description", "media:description"})
+_summary_elements = frozenset({"summary", "itunes:summary"})
+_content_elements = {
+    "content": "text/plain",
+    "content:encoded": "text/html",
+    "fullitem": "text/html",
+}
+_guid_elements = frozenset({"guid", "id"})
+_published_elements = frozenset({"pubdate", "published", "issued", "dcterms:issued"})
+_entry_fields = frozenset(
+    {
+        *_title_elements,
+        "media:title",
+        *_description_elements,
+        *_summary_elements,
+        *_content_elements,
+        *_guid_elements,
+        *_published_elements,
+        "link",
+    }
+)
+# the elements feedparser handles in ways not worth replicating for the fields we keep
+_unsupported_elements = frozenset(
+    {"item", "entry", "source", "image", "textinput", "abstract", "body", "xhtml:body"}
+)
+_feed_titles = frozenset({*_title_elements, "media:title"})
+_feed_fields = frozenset(
+    {*_feed_titles, *_description_elements, *_summary_elements, *_content_elements}
+)
+
+_html_types = frozenset({"text/html", "application/xhtml+xml"})
+# the types of the content feedparser copies to the summary
+_summary_types = frozenset({"text/plain", *_html_types})
+_content_type_aliases = {
+    "text": "text/plain",
+    "plain": "text/plain",
+    "html": "text/html",
+    "xhtml": "application/xhtml+xml",
+}
+
+_prolog_size = 4096
+_first_element_re = re.compile(rb"<\w")
+_encoding_re = re.compile(rb"""^<\?xml[^>]*?encoding\s*=\s*["']([^"']*)["']""")
+_link_entity_re = re.compile("&([A-Za-z0-9_]+);")
+
+
+class FeedParseError(Exception):
+    ...
+
+
+class _UnsupportedFeedError(Exception):
+    """internal exception for leaving the feeds the fast engine can't handle to feedparser"""
+
+
+@dataclass
+class ParsedFeed:
+    title: str | None
+    # the entries come with the same keys and values feedparser gives them
+    entries: list[dict[str, Any]]
+
+
+class FeedContentParser(ABC):
+    @abstractmethod
+    def parse(self, content: BytesIO) -> ParsedFeed:
+        """
+        Parse the feed title and the title, link, guid, summary and publication date of its entries.
+        Raise FeedParseError if the content is not a well-formed feed.
+        """
+
+
+class FeedparserContentParser(FeedContentParser):
+    def parse(self, content: BytesIO) -> ParsedFeed:
+        try:
+            rss = feedparser.parse(content)
+        except Exception as exc:  # noqa: BLE001
+            raise FeedParseError(str(exc)) from exc
+
+        if parsed_exc := rss.get("bozo_exception"):
+            raise FeedParseError(str(parsed_exc)) from parsed_exc
+
+        return ParsedFeed(title=rss["feed"].get("title"), entries=rss["entries"])
+
+
+@dataclass
+class _ElementTreeContentParser(FeedContentParser):
+    """
+    Extract the fields of RSS 2.0 and Atom 1.0 feeds off the element tree built by a C parser,
+    instead of going through the python handlers feedparser runs for every element of a feed.
+
+    The values go through the same clean up feedparser does for them, including html sanitization,
+    so the result is the same as feedparser's. The feeds where that is not certain to hold,
+    e.g. the ones with embedded xhtml, xml:base or a DOCTYPE, along with the malformed ones,
+    are left to feedparser.
+    """
+
+    fallback: FeedContentParser = field(default_factory=FeedparserContentParser)
+
+    engine_name: ClassVar[str]
+
+    def parse(self, content: BytesIO) -> ParsedFeed:
+        try:
+            return self._parse_supported(content)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Leaving feed to feedparser", engine=self.engine_name, error=exc)
+            metrics.FEED_PARSER_FALLBACKS.labels(engine=self.engine_name).inc()
+
+        content.seek(0)
+        return self.fallback.parse(content)
+
+    @abstractmethod
+    def _iterparse(self, content: BytesIO) -> Any:
+        """
+        Return an iterparse iterator yielding the start-ns events of the document.
+        """
+
+    def _parse_supported(self, content: BytesIO) -> ParsedFeed:
+        self._check_prolog(content)
+
+        declared_prefixes: dict[str, str] = {}
+        content.seek(0)
+        events = self._iterparse(content)
+        for _, (prefix, uri) in events:
+            # the same namespace declared with different prefixes may yield different element names
+            if declared_prefixes.setdefault(uri.lower(), prefix) != prefix:
+                raise _UnsupportedFeedError(f"namespace {uri=} has several prefixes")
+
+        return _TreeReader(declared_prefixes).read(events.root)
+
+    @staticmethod
+    def _check_prolog(content: BytesIO) -> None:
+        prolog = content.getbuffer()[:_prolog_size].tobytes()
+        if (first_element := _first_element_re.search(prolog)) is None:
+            raise _UnsupportedFeedError("no root element in the prolog")
+
+        prolog = prolog[: first_element.start()].removeprefix(b"\xef\xbb\xbf")
+        # feedparser strips the doctype, along with the entities it declares
+        if b"<!DOCTYPE" in prolog:
+            raise _UnsupportedFeedError("document has a doctype")
+        # feedparser cleans the values of utf-8 documents up a bit differently than of the others
+        declared = _encoding_re.search(prolog)
+        if declared and declared[1].lower() not in (b"utf-8", b"utf8"):
+            raise _UnsupportedFeedError(f"document encoding is {declared[1]!r}")
+
+
+class ExpatContentParser(_ElementTreeContentParser):
+    engine_name = "expat"
+
+    def _iterparse(self, content: BytesIO) -> Any:
+        return ElementTree.iterparse(content, events=("start-ns",))
+
+
+@dataclass
+class LxmlContentParser(_ElementTreeContentParser):
+    """
+    lxml builds the element tree with libxml2, which is a bit faster than expat.
+    """
+
+    engine_name = "lxml"
+
+    _etree: Any = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # lxml is an optional dependency of the project, the lxml extra must be installed to use it
+        from lxml import etree
+
+        self._etree = etree
+
+    def _iterparse(self, content: BytesIO) -> Any:
+        return self._etree.iterparse(
+            content,
+            events=("start-ns",),
+            resolve_entities=False,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+
+
+def init_feed_content_parser(settings: ApplicationSettings) -> FeedContentParser:
+    match settings.feed_parser_engine:
+        case "feedparser":
+            return FeedparserContentParser()
+        case "expat":
+            return ExpatContentParser()
+        case "lxml":
+            return LxmlContentParser()
+        case _:
+            raise ValueError(f"Unknown feed parser engine: {settings.feed_parser_engine}")
+
+
+@dataclass
+class _TreeReader:
+    """
+    Read the fields off a parsed feed document the way feedparser does,
+    see feedparser.mixin._FeedParserMixin.pop for the clean up of the values.
+    """
+
+    declared_prefixes: dict[str, str]
+
+    _is_atom: bool = field(default=False, init=False)
+    # feedparser only resets it at the end of an entry, so it carries over from the feed elements
+    _has_content: bool = field(default=False, init=False)
+    _title_is_set: bool = field(default=False, init=False)
+    _feed_has_summary: bool = field(default=False, init=False)
+    _names: dict[str, str] = field(default_factory=dict, init=False)
+
+    def read(self, root: Any) -> ParsedFeed:
+        root_name = self._name(root.tag)
+        if root_name == "rss":
+            channel = self._rss_channel(root)
+            entry_name = "item"
+        elif root.tag.lower() == _atom_feed_tag:
+            channel = root
+            entry_name = "entry"
+            self._is_atom = True
+        else:
+            raise _UnsupportedFeedError(f"{root_name=} is neither rss nor atom feed")
+
+        self._check_base(root)
+        self._check_base(channel)
+
+        titles = []
+        entries = []
+        for child in channel:
+            name = self._name(child.tag)
+            if name == entry_name:
+                entries.append(self._read_entry(child))
+                continue
+            # the titles and the descriptions of these go to their own feedparser contexts
+            if name in ("image", "textinput"):
+                continue
+            self._check_not_nested(child, _feed_fields | _unsupported_elements)
+            if name in _feed_titles:
+                titles.append(child)
+            else:
+                self._track_feed_content(child, name)
+
+        # the title of the feed depends on the order and the depth of its title elements
+        if len(titles) > 1:
+            raise _UnsupportedFeedError("feed has several titles")
+        title = self._content(titles[0], default_type="text/plain") if titles else None
+
+        return ParsedFeed(title=title, entries=entries)
+
+    def _rss_channel(self, root: Any) -> Any:
+        channels = []
+        for child in root:
+            if self._name(child.tag) == "channel":
+                channels.append(child)
+            else:
+                self._check_not_nested(child, _feed_fields | _unsupported_elements)
+
+        if len(channels) != 1:
+            raise _UnsupportedFeedError(f"rss feed has {len(channels)} channels")
+
+        return channels[0]
+
+    def _track_feed_content(self, element: Any, name: str) -> None:
+        if name in _content_elements:
+            self._has_content = True
+            content_type = _map_content_type(_attrs(element).get("type", _content_elements[name]))
+            self._feed_has_summary |= content_type in _summary_types
+        elif name in _description_elements or name in _summary_elements:
+            if self._feed_has_summary and not self._has_content:
+                self._has_content = True
+            # the feed descriptions are saved as subtitles
+            elif name in _summary_elements:
+                self._feed_has_summary = True
+
+    def _read_entry(self, item: Any) -> dict[str, Any]:
+        self._check_base(item)
+        if {"href", "lastmod", "rdf:about"} & _attrs(item).keys():
+            raise _UnsupportedFeedError("entry has attributes feedparser takes fields from")
+
+        entry: dict[str, Any] = {}
+        self._title_is_set = False
+
+        for child in item:
+            name = self._name(child.tag)
+            if name not in _entry_fields:
+                self._check_not_nested(child, _entry_fields | _unsupported_elements)
+                continue
+            if len(child):
+                raise _UnsupportedFeedError(f"{name} element has embedded markup")
+            self._check_base(child)
+            self._read_entry_field(child, name, entry)
+
+        self._has_content = False
+        return entry
+
+    def _read_entry_field(self, element: Any, name: str, entry: dict[str, Any]) -> None:
+        if name in _title_elements or name == "media:title":
+            self._read_title(element, name, entry)
+        elif name in _description_elements or name in _summary_elements:
+            self._read_summary(element, name, entry)
+        elif name in _content_elements:
+            self._has_content = True
+            default_type = _content_elements[name]
+            content_type = _map_content_type(_attrs(element).get("type", default_type))
+            if "summary" not in entry and content_type in _summary_types:
+                entry["summary"] = self._content(element, default_type=default_type)
+        elif name == "link":
+            self._read_link(element, entry)
+        elif name in _guid_elements:
+            self._read_guid(element, entry)
+        elif name in _published_elements:
+            entry["published"] = published = _clean_up(self._text(element))
+            entry["published_parsed"] = _parse_date(published)
+
+    def _read_title(self, title: Any, name: str, entry: dict[str, Any]) -> None:
+        value = self._content(title, default_type="text/plain")
+        # the first non-empty title wins, while the media title does not stop the later ones
+        if not self._title_is_set:
+            entry["title"] = value
+            self._title_is_set = name != "media:title" and bool(value)
+
+    def _read_summary(self, summary: Any, name: str, entry: dict[str, Any]) -> None:
+        # once the summary is set, another one is taken for the content of the post
+        if "summary" in entry and not self._has_content:
+            self._has_content = True
+            return
+        default_type = "text/html" if name in _description_elements else "text/plain"
+        entry["summary"] = self._content(summary, default_type=default_type)
+
+    def _read_guid(self, guid: Any, entry: dict[str, Any]) -> None:
+        is_link = _attrs(guid).get("ispermalink", "true") == "true"
+        if (value := self._text(guid)) and is_link:
+            value = _urljoin("", value)
+
+        entry["guid"] = value = _clean_up(value)
+        if is_link:
+            entry.setdefault("link", value)
+
+    def _read_link(self, link: Any, entry: dict[str, Any]) -> None:
+        attrs = _attrs(link)
+        rel = attrs.setdefault("rel", "alternate")
+        content_type = attrs.get("type", "application/atom+xml" if rel == "self" else "text/html")
+
+        if href := attrs.get("url", attrs.get("uri", attrs.get("href"))):
+            attrs["href"] = href
+        if "href" in attrs:
+            if rel == "alternate" and _map_content_type(content_type) in _html_types:
+                entry["link"] = _urljoin("", attrs["href"])
+            return
+
+        if value := self._text(link):
+            value = _urljoin("", value)
+        # feedparser's fix for the query strings mistaken for character references
+        value = _clean_up(value).replace("&amp;", "&")
+        entry["link"] = _link_entity_re.sub(r"&\g<1>", value)
+
+    def _content(self, element: Any, *, default_type: str) -> str:
+        attrs = _attrs(element)
+        content_type = _map_content_type(attrs.get("type", default_type))
+        if attrs.get("mode") == "base64":
+            raise _UnsupportedFeedError("content is base64 encoded")
+        if content_type == "application/xhtml+xml":
+            raise _UnsupportedFeedError("content is xhtml")
+        if not content_type.startswith("text/") and not content_type.endswith(("+xml", "/xml")):
+            # feedparser takes the content of any other type for base64 encoded
+            raise _UnsupportedFeedError(f"content is {content_type}")
+
+        value = self._text(element)
+        # some feed formats require consumers to guess whether the content is html or plain text
+        if (
+            not self._is_atom
+            and content_type == "text/plain"
+            and _FeedParserMixin.looks_like_html(value)
+        ):
+            content_type = "text/html"
+        if content_type == "text/html":
+            value = _sanitize_html(value, "utf-8", content_type)
+
+        return _clean_up(value)
+
+    def _check_not_nested(self, element: Any, names: frozenset[str]) -> None:
+        if self._name(element.tag) in _unsupported_elements:
+            raise _UnsupportedFeedError(f"{element.tag} element is not supported")
+        if not len(element):
+            return
+        for nested in element.iter():
+            if nested is not element and self._name(nested.tag) in names:
+                raise _UnsupportedFeedError(f"{nested.tag} element is nested")
+
+    @staticmethod
+    def _check_base(element: Any) -> None:
+        if _xml_base in element.attrib:
+            raise _UnsupportedFeedError("document sets xml:base")
+
+    @staticmethod
+    def _text(element: Any) -> str:
+        return (element.text or "").strip()
+
+    def _name(self, tag: str) -> str:
+        try:
+            return self._names[tag]
+        except KeyError:
+            pass
+
+        uri, _, local_name = tag[1:].rpartition("}") if tag.startswith("{") else ("", "", tag)
+        uri = uri.lower()
+        if "backend.userland.com/rss" in uri:
+            prefix = ""
+        else:
+            prefix = _ns_prefixes.get(uri, self.declared_prefixes.get(uri, "").lower())
+
+        name = f"{prefix}:{local_name.lower()}" if prefix else local_name.lower()
+        self._names[tag] = name
+        return name
+
+
+def _attrs(element: Any) -> dict[str, str]:
+    # the attributes are named and normalized the way feedparser does it
+    attrs = {}
+    for name, value in element.attrib.items():
+        if name.startswith("{"):
+            uri, _, name = name[1:].rpartition("}")
+            if prefix := _ns_prefixes.get(uri.lower()):
+                name = f"{prefix}:{name}"
+        name = name.lower()
+        attrs[name] = value.lower() if name in ("rel", "type") else value
+    return attrs
+
+
+def _map_content_type(content_type: str) -> str:
+    return _content_type_aliases.get(content_type, content_type)
+
+
+def _clean_up(value: str) -> str:
+    # ascii values are left as they are by the clean up feedparser does for every value
+    if value.isascii():
+        return value
+    # the utf-8 text once mistaken for iso-8859-1 text is decoded again
+    with contextlib.suppress(UnicodeEncodeError, UnicodeDecodeError):
+        value = value.encode("iso-8859-1").decode("utf-8")
+    # the windows-1252 extensions are mapped to the proper code points
+    return value.translate(_cp1252)
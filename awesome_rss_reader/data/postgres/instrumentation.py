@@ -0,0 +1,163 @@
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from awesome_rss_reader.application import metrics
+
+logger = structlog.get_logger()
+
+# statements are labeled by their kind, so the number of metric labels stays bounded
+_known_operations = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+# long parameter lists (think of IN clauses) are cut short in the logs
+_max_described_parameters = 20
+
+
+@dataclass
+class QueryCounter:
+    """
+    Statements executed within a unit of work, such as an api request or a worker batch.
+    """
+
+    count: int = 0
+    duration_s: float = 0
+    # statements are only kept when asked for, as a batch may execute a lot of them
+    statements: list[str] | None = None
+    parent: "QueryCounter | None" = field(default=None, repr=False)
+
+    def record(self, statement: str, duration_s: float) -> None:
+        counter: QueryCounter | None = self
+        # the enclosing units of work are accounted for as well
+        while counter is not None:
+            counter.count += 1
+            counter.duration_s += duration_s
+            if counter.statements is not None:
+                counter.statements.append(statement)
+            counter = counter.parent
+
+
+_query_counter: ContextVar[QueryCounter | None] = ContextVar("query_counter", default=None)
+
+
+@contextmanager
+def count_queries(*, keep_statements: bool = False) -> Iterator[QueryCounter]:
+    """
+    Count the statements executed in the current context, including the tasks spawned from it.
+    """
+    counter = QueryCounter(
+        statements=[] if keep_statements else None,
+        parent=_query_counter.get(),
+    )
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Time how long it takes to get a connection out of the pool,
+    which is how long the callers wait for one once the pool is used up.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        except sa_exc.TimeoutError:
+            metrics.DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            metrics.DB_POOL_WAIT.observe(time.perf_counter() - started_at)
+
+
+def instrument_engine(engine: Engine, *, slow_statement_s: float) -> None:
+    """
+    Time every statement executed by the engine,
+    logging the ones slower than the threshold along with the shape of their parameters.
+    For an async engine, its sync_engine is instrumented.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        _cursor: Any,
+        _statement: str,
+        _parameters: Any,
+        _context: ExecutionContext | None,
+        _executemany: bool,  # noqa: FBT001
+    ) -> None:
+        conn.info.setdefault("statement_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        _context: ExecutionContext | None,
+        executemany: bool,  # noqa: FBT001
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["statement_started_at"].pop()
+
+        operation = _get_operation(statement)
+        metrics.DB_STATEMENT_DURATION.labels(operation=operation).observe(elapsed)
+
+        if counter := _query_counter.get():
+            counter.record(statement, elapsed)
+
+        if elapsed > slow_statement_s:
+            metrics.DB_SLOW_STATEMENTS.labels(operation=operation).inc()
+            # fmt: off
+            logger.warning(
+                "Slow statement",
+                duration_s=round(elapsed, 3), statement=statement,
+                parameters=_describe_parameters(parameters, executemany=executemany),
+            )
+            # fmt: on
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context: Any) -> None:
+        # failed statements never make it to after_cursor_execute
+        if (conn := context.connection) is not None and conn.info.get("statement_started_at"):
+            conn.info["statement_started_at"].pop()
+
+
+def _get_operation(statement: str) -> str:
+    operation = next(iter(statement.split(maxsplit=1)), "").upper()
+    return operation if operation in _known_operations else "OTHER"
+
+
+def _describe_parameters(parameters: Any, *, executemany: bool) -> Any:
+    """
+    Describe the parameters by their types, the values may well be sensitive.
+    """
+    if executemany:
+        first_row = _describe_parameters(parameters[0], executemany=False) if parameters else None
+        return {"rows": len(parameters), "first_row": first_row}
+
+    if isinstance(parameters, Mapping):
+        return {name: _describe_value(value) for name, value in parameters.items()}
+
+    if isinstance(parameters, Sequence):
+        described = [_describe_value(value) for value in parameters[:_max_described_parameters]]
+        if (rest := len(parameters) - _max_described_parameters) > 0:
+            described.append(f"... {rest} more")
+        return described
+
+    return _describe_value(parameters)
+
+
+def _describe_value(value: Any) -> str:
+    if isinstance(value, list | tuple):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
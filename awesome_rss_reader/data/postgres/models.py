@@ -1,4 +1,6 @@
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 metadata = sa.MetaData()
 
@@ -16,30 +18,92 @@ Feed = sa.Table(
         nullable=False,
         server_default=sa.func.now(),
     ),
+    # bumped on every update, so the listings can tell a feed has changed
+    sa.Column("version", sa.BigInteger, nullable=False, server_default="0"),
     sa.UniqueConstraint("url", name="feed_url_key"),
 )
 
 
+# the titles weigh more than the summaries in the search ranking, and only so much of a summary
+# is indexed, so a post with a huge summary does not cost the ingest much more than any other
+FEED_POST_SEARCH_SUMMARY_CHARS = 2000
+FEED_POST_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, title), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, "
+    f"left(coalesce(summary, ''), {FEED_POST_SEARCH_SUMMARY_CHARS})), 'B')"
+)
+
+# the posts are partitioned by month of publication, so the old ones can be dropped a partition
+# at a time, the partition key has to be a part of every unique constraint of the table though
 FeedPost = sa.Table(
     "feed_post",
     metadata,
     sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
-    sa.Column("feed_id", sa.Integer, nullable=False, index=True),
+    sa.Column("feed_id", sa.Integer, nullable=False),
     sa.Column("title", sa.Text, nullable=False),
     sa.Column("summary", sa.Text, nullable=True),
     sa.Column("url", sa.Text, nullable=False),
     sa.Column("guid", sa.Text, nullable=False),
-    sa.Column("published_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("published_at", sa.DateTime(timezone=True), nullable=False, primary_key=True),
     sa.Column(
         "created_at",
         sa.DateTime(timezone=True),
         nullable=False,
         server_default=sa.func.now(),
     ),
+    sa.Column("search_vector", TSVECTOR, sa.Computed(FEED_POST_SEARCH_VECTOR, persisted=True)),
     sa.ForeignKeyConstraint(["feed_id"], ["feed.id"], name="feed_post_feed_id_fkey"),
-    sa.UniqueConstraint("feed_id", "guid", name="feed_post_feed_id_guid_key"),
+    # it's the (feed_id, guid) pairs that are unique, but the index serves looking them up as well
+    sa.UniqueConstraint(
+        "feed_id", "guid", "published_at", name="feed_post_feed_id_guid_published_at_key"
+    ),
+    postgresql_partition_by="RANGE (published_at)",
 )
 
+# the posts of a feed are listed and trimmed to the latest ones in this order,
+# the index serves looking up the posts of a feed by its id alone as well
+sa.Index(
+    "ix_feed_post_feed_id_published_at_id",
+    FeedPost.c.feed_id,
+    FeedPost.c.published_at.desc(),
+    FeedPost.c.id.desc(),
+)
+sa.Index("ix_feed_post_search_vector", FeedPost.c.search_vector, postgresql_using="gin")
+
+# the search vector is only ever looked at by the search, the other queries leave it out
+FEED_POST_COLUMNS = [column for column in FeedPost.c if column.computed is None]
+
+# the posts out of range of the monthly partitions end up here
+FEED_POST_DEFAULT_PARTITION = "feed_post_default"
+
+sa.event.listen(
+    FeedPost,
+    "after_create",
+    sa.DDL(f"CREATE TABLE {FEED_POST_DEFAULT_PARTITION} PARTITION OF feed_post DEFAULT"),
+)
+
+# the deletions of posts leave no trace to tell the listings have changed, so every one of them
+# bumps the generation kept in the single row of this table, the row is there once the first is
+FeedPostDeletions = sa.Table(
+    "feed_post_deletions",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=False),
+    sa.Column("generation", sa.BigInteger, nullable=False),
+    sa.CheckConstraint("id = 1", name="feed_post_deletions_single_row"),
+)
+
+
+def bump_feed_post_deletions() -> sa.Insert:
+    """
+    Build the statement bumping the generation of the post deletions,
+    it's meant to be executed in the transaction deleting the posts.
+    """
+    insert_q = postgresql.insert(FeedPostDeletions).values(id=1, generation=1)
+    return insert_q.on_conflict_do_update(
+        index_elements=[FeedPostDeletions.c.id],
+        set_={"generation": FeedPostDeletions.c.generation + 1},
+    )
+
 
 UserFeed = sa.Table(
     "user_feed",
@@ -64,7 +128,7 @@ UserPost = sa.Table(
     sa.Column("user_uid", sa.UUID, nullable=False),
     sa.Column("post_id", sa.Integer, nullable=False),
     sa.Column("read_at", sa.DateTime(timezone=True), nullable=False),
-    sa.ForeignKeyConstraint(["post_id"], ["feed_post.id"], name="user_post_post_id_fkey"),
+    # there is no foreign key to feed_post, the id of a post alone is not unique across partitions
     sa.UniqueConstraint("user_uid", "post_id", name="user_post_user_uid_post_id_key"),
 )
 
@@ -3,10 +3,13 @@ from contextlib import asynccontextmanager
 
 from awesome_rss_reader.core.repository.atomic import AtomicProvider
 from awesome_rss_reader.data.postgres.repositories.base import BasePostgresRepository
+from awesome_rss_reader.data.postgres.routing import pin_to_primary
 
 
 class PostgresAtomicProvider(BasePostgresRepository, AtomicProvider):
     @asynccontextmanager
     async def transaction(self) -> AsyncIterator[None]:
-        async with self.db.begin():
-            yield
+        # the reads made in the middle of the transaction have to see its writes
+        with pin_to_primary():
+            async with self.db.begin():
+                yield
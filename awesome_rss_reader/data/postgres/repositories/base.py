@@ -1,8 +1,29 @@
+import inspect
 from dataclasses import dataclass
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from awesome_rss_reader.application import tracing
+from awesome_rss_reader.data.postgres.routing import ReplicaRouter
+
 
 @dataclass
 class BasePostgresRepository:
     db: AsyncEngine
+    # the read-only queries that can do with a slightly outdated view go through the router
+    router: ReplicaRouter | None = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # every public repository call is traced, so the slow ones stand out in a request trace
+        for name, attr in list(cls.__dict__.items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+                setattr(cls, name, tracing.traced(f"{cls.__name__}.{name}")(attr))
+
+    def _get_reader(self) -> AsyncEngine:
+        """
+        Get the engine for a read-only query, the replica one unless there's no replica
+        or the query has to see the latest writes.
+        """
+        return self.router.get_reader() if self.router else self.db
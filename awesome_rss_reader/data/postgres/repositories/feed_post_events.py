@@ -0,0 +1,141 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+import structlog
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated
+from awesome_rss_reader.core.repository.feed_post_event import FeedPostEventRepository
+from awesome_rss_reader.data.postgres.repositories.base import BasePostgresRepository
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = structlog.get_logger()
+
+CHANNEL = "feed_post_created"
+
+# notification payloads are limited to 8000 bytes, so large batches are split up
+_max_post_ids_per_notification = 500
+
+
+@dataclass
+class PostgresFeedPostEventRepository(BasePostgresRepository, FeedPostEventRepository):
+    """
+    Deliver the events through postgres NOTIFY/LISTEN.
+    A single connection per process listens to the channel and fans the events out to subscribers.
+    """
+
+    # events pending for a subscriber that does not keep up are dropped past this size
+    max_pending_events: int = 1000
+    # the channel is listened to on a connection of this engine instead, once it's set,
+    # as the connections of a transaction pooler don't stay with the process to be notified on
+    listener_db: AsyncEngine | None = None
+
+    _listener: AsyncConnection | None = field(default=None, init=False)
+    _listener_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    # the connections of the terminated listeners being released back to their pool
+    _releasing: set[asyncio.Task[None]] = field(default_factory=set, init=False)
+    _subscribers: set[asyncio.Queue[FeedPostsCreated | None]] = field(
+        default_factory=set, init=False
+    )
+
+    async def publish(self, event: FeedPostsCreated) -> None:
+        async with self.db.begin() as conn:
+            for offset in range(0, len(event.post_ids), _max_post_ids_per_notification):
+                chunk = FeedPostsCreated(
+                    feed_id=event.feed_id,
+                    post_ids=event.post_ids[offset : offset + _max_post_ids_per_notification],
+                )
+                await conn.execute(sa.select(sa.func.pg_notify(CHANNEL, chunk.model_dump_json())))
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[AsyncIterator[FeedPostsCreated]]:
+        await self._start_listening()
+
+        queue: asyncio.Queue[FeedPostsCreated | None] = asyncio.Queue(self.max_pending_events)
+        self._subscribers.add(queue)
+        try:
+            yield self._iter_events(queue)
+        finally:
+            self._subscribers.discard(queue)
+
+    async def close(self) -> None:
+        async with self._listener_lock:
+            if self._listener is None:
+                return
+            listener, self._listener = self._listener, None
+            self._end_subscriptions()
+            # the connection goes back to the pool, so it must not keep listening
+            try:
+                driver_conn = await self._get_driver_connection(listener)
+                await driver_conn.remove_listener(CHANNEL, self._on_notification)
+            finally:
+                await listener.close()
+
+    async def _iter_events(
+        self,
+        queue: asyncio.Queue[FeedPostsCreated | None],
+    ) -> AsyncIterator[FeedPostsCreated]:
+        while event := await queue.get():
+            yield event
+
+    async def _start_listening(self) -> None:
+        async with self._listener_lock:
+            if self._listener is not None:
+                return
+
+            conn = await (self.listener_db or self.db).connect()
+            try:
+                driver_conn = await self._get_driver_connection(conn)
+                await driver_conn.add_listener(CHANNEL, self._on_notification)
+                driver_conn.add_termination_listener(self._on_termination)
+            except Exception:
+                await conn.close()
+                raise
+
+            logger.info("Listening to post events", channel=CHANNEL)
+            self._listener = conn
+
+    async def _get_driver_connection(self, conn: AsyncConnection) -> "asyncpg.Connection":
+        raw_conn = await conn.get_raw_connection()
+        return raw_conn.driver_connection  # type: ignore[return-value]
+
+    def _on_notification(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            event = FeedPostsCreated.model_validate_json(payload)
+        except ValidationError as ve:
+            logger.warning("Received malformed post event", payload=payload, error=ve)
+            return
+
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Post event subscriber is lagging behind", feed_id=event.feed_id)
+
+    def _on_termination(self, _conn: Any) -> None:
+        logger.warning("Post event listener connection was terminated")
+        # the connection is gone, the next subscriber is going to start a new one
+        listener, self._listener = self._listener, None
+        self._end_subscriptions()
+        if listener is None:
+            return
+
+        # the dead connection still takes a slot of its pool until it's given back,
+        # which can't be awaited in the callback of the driver
+        task = asyncio.get_running_loop().create_task(listener.invalidate())
+        self._releasing.add(task)
+        task.add_done_callback(self._releasing.discard)
+
+    def _end_subscriptions(self) -> None:
+        for queue in self._subscribers:
+            # make room for the sentinel in case the subscriber is lagging behind
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
@@ -0,0 +1,128 @@
+import re
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+import structlog
+
+from awesome_rss_reader.core.entity.feed_post_partition import FeedPostPartition
+from awesome_rss_reader.core.repository.feed_post_partition import FeedPostPartitionRepository
+from awesome_rss_reader.data.postgres import models as mdl
+from awesome_rss_reader.data.postgres.repositories.base import BasePostgresRepository
+from awesome_rss_reader.utils.dtime import add_months
+
+logger = structlog.get_logger()
+
+# the monthly partitions are named after the month they hold the posts of, e.g. feed_post_y2023m09
+_partition_name_re = re.compile(r"^feed_post_y(?P<year>\d{4})m(?P<month>\d{2})$")
+
+
+def _partition_name(starts_at: datetime) -> str:
+    return f"feed_post_y{starts_at.year:04d}m{starts_at.month:02d}"
+
+
+def _post_table(name: str) -> sa.TableClause:
+    # the generated columns are computed by the partitions on their own, they are not moved over
+    return sa.table(name, *(sa.column(column.name) for column in mdl.FEED_POST_COLUMNS))
+
+
+def _partition_from_name(name: str) -> FeedPostPartition | None:
+    if not (match := _partition_name_re.match(name)):
+        return None
+    starts_at = datetime(int(match["year"]), int(match["month"]), 1, tzinfo=UTC)
+    return FeedPostPartition(name=name, starts_at=starts_at, ends_at=add_months(starts_at, 1))
+
+
+class PostgresFeedPostPartitionRepository(BasePostgresRepository, FeedPostPartitionRepository):
+    async def get_list(self) -> list[FeedPostPartition]:
+        query = sa.text(
+            """
+            SELECT partition.relname AS name
+            FROM pg_inherits
+            JOIN pg_class AS partition ON partition.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = CAST(:table_name AS regclass)
+            """
+        )
+
+        async with self.db.connect() as conn:
+            result = await conn.execute(query, {"table_name": mdl.FeedPost.name})
+
+        partitions = []
+        for name in result.scalars():
+            if (partition := _partition_from_name(name)) is None:
+                # the default partition is expected to be here, while the others are not
+                if name != mdl.FEED_POST_DEFAULT_PARTITION:
+                    logger.warning("Ignoring unknown feed post partition", name=name)
+                continue
+            partitions.append(partition)
+
+        return sorted(partitions, key=lambda partition: partition.starts_at)
+
+    async def create(self, *, starts_at: datetime, ends_at: datetime) -> FeedPostPartition:
+        name = _partition_name(starts_at)
+        # the bounds of a partition can't be passed as parameters of the ddl statements,
+        # they are formatted out of the datetimes though, not out of the user input
+        bounds = f"FROM ('{starts_at.isoformat()}') TO ('{ends_at.isoformat()}')"
+        in_range = sa.and_(
+            sa.column("published_at") >= starts_at,
+            sa.column("published_at") < ends_at,
+        )
+        default_partition = _post_table(mdl.FEED_POST_DEFAULT_PARTITION)
+
+        async with self.db.begin() as conn:
+            await conn.execute(
+                sa.text(
+                    f"CREATE TABLE {name} "
+                    "(LIKE feed_post INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+                )
+            )
+            # a partition can't be attached while the default one has posts of its range
+            partition = _post_table(name)
+            moved = await conn.execute(
+                sa.insert(partition).from_select(
+                    list(partition.c.keys()),
+                    sa.select(default_partition).where(in_range),
+                )
+            )
+            await conn.execute(sa.delete(default_partition).where(in_range))
+            await conn.execute(
+                sa.text(f"ALTER TABLE feed_post ATTACH PARTITION {name} FOR VALUES {bounds}")
+            )
+
+        logger.info("Created feed post partition", name=name, moved_posts=moved.rowcount)
+        return FeedPostPartition(name=name, starts_at=starts_at, ends_at=ends_at)
+
+    async def drop(self, partition: FeedPostPartition) -> None:
+        partition_posts = sa.select(_post_table(partition.name).c.id)
+
+        async with self.db.begin() as conn:
+            await conn.execute(
+                sa.delete(mdl.UserPost).where(mdl.UserPost.c.post_id.in_(partition_posts))
+            )
+            await conn.execute(sa.text(f"ALTER TABLE feed_post DETACH PARTITION {partition.name}"))
+            await conn.execute(sa.text(f"DROP TABLE {partition.name}"))
+            await conn.execute(mdl.bump_feed_post_deletions())
+
+        logger.info("Dropped feed post partition", name=partition.name)
+
+    async def detach(self, partition: FeedPostPartition) -> None:
+        async with self.db.begin() as conn:
+            await conn.execute(sa.text(f"ALTER TABLE feed_post DETACH PARTITION {partition.name}"))
+            # the detached posts are out of the listings just like the dropped ones
+            await conn.execute(mdl.bump_feed_post_deletions())
+
+        logger.info("Detached feed post partition", name=partition.name)
+
+    async def delete_published_before(self, published_before: datetime) -> int:
+        outdated = mdl.FeedPost.c.published_at < published_before
+
+        async with self.db.begin() as conn:
+            await conn.execute(
+                sa.delete(mdl.UserPost).where(
+                    mdl.UserPost.c.post_id.in_(sa.select(mdl.FeedPost.c.id).where(outdated))
+                )
+            )
+            result = await conn.execute(sa.delete(mdl.FeedPost).where(outdated))
+            if result.rowcount:
+                await conn.execute(mdl.bump_feed_post_deletions())
+
+        return result.rowcount
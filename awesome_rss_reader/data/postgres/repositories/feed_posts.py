@@ -1,15 +1,19 @@
 import uuid
+from datetime import datetime
 from enum import Enum, auto
 from typing import Any
 
 import sqlalchemy as sa
 import structlog
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from awesome_rss_reader.core.entity.feed_post import (
     FeedPost,
     FeedPostFiltering,
     FeedPostOrdering,
+    FeedPostSearchCursor,
+    FeedPostSearchHit,
     NewFeedPost,
 )
 from awesome_rss_reader.core.repository.feed_post import FeedPostNotFoundError, FeedPostRepository
@@ -18,6 +22,10 @@ from awesome_rss_reader.data.postgres.repositories.base import BasePostgresRepos
 
 logger = structlog.get_logger()
 
+# the same text search configuration the search vector of the posts is built with,
+# it's inlined into the queries rather than passed as a parameter of a type of its own
+_search_config: sa.ColumnClause = sa.literal_column("'english'::regconfig")
+
 
 class _PostFollowStatus(Enum):
     following = auto()
@@ -37,7 +45,7 @@ class PostgresFeedPostRepository(BasePostgresRepository, FeedPostRepository):
         return await self._get_by_field("guid", guid)
 
     async def _get_by_field(self, field: str, value: Any) -> FeedPost:
-        query = sa.select(mdl.FeedPost).where(sa.column(field) == value)
+        query = sa.select(*mdl.FEED_POST_COLUMNS).where(sa.column(field) == value)
 
         async with self.db.connect() as conn:
             result = await conn.execute(query)
@@ -47,18 +55,144 @@ class PostgresFeedPostRepository(BasePostgresRepository, FeedPostRepository):
 
         raise FeedPostNotFoundError(f"Post with {field} {value} not found")
 
-    async def create_many(self, posts: list[NewFeedPost]) -> list[FeedPost]:
+    async def create_many(
+        self,
+        posts: list[NewFeedPost],
+        *,
+        max_posts_per_feed: int = 0,
+    ) -> list[FeedPost]:
+        columns = list(NewFeedPost.model_fields)
+        new_posts = sa.values(
+            *(sa.column(column, mdl.FeedPost.c[column].type) for column in columns),
+            name="new_post",
+        ).data([tuple(post.model_dump(include=set(columns)).values()) for post in posts])
+        # the unique constraint includes the partition key, so the posts republished
+        # at a different time are only caught by looking them up across the partitions
+        existing_post = (
+            sa.select(mdl.FeedPost.c.id)
+            .where(
+                sa.and_(
+                    mdl.FeedPost.c.feed_id == new_posts.c.feed_id,
+                    mdl.FeedPost.c.guid == new_posts.c.guid,
+                )
+            )
+            .exists()
+        )
         insert_q = (
             pg_insert(mdl.FeedPost)
-            .values([post.model_dump() for post in posts])
-            .on_conflict_do_nothing(constraint="feed_post_feed_id_guid_key")
-            .returning(mdl.FeedPost)
+            .from_select(
+                columns,
+                sa.select(new_posts)
+                .where(~existing_post)
+                .distinct(new_posts.c.feed_id, new_posts.c.guid),
+            )
+            .on_conflict_do_nothing(constraint="feed_post_feed_id_guid_published_at_key")
+            .returning(*mdl.FEED_POST_COLUMNS)
         )
 
         async with self.db.begin() as conn:
             result = await conn.execute(insert_q)
+            created_posts = [FeedPost.model_validate(dict(row)) for row in result.mappings()]
 
-        return [FeedPost.model_validate(dict(row)) for row in result.mappings()]
+            if max_posts_per_feed <= 0 or not created_posts:
+                return created_posts
+
+            # the feeds are only ever over the cap by the posts that have just been created,
+            # so they are trimmed right away, before anyone gets to see them over it
+            trimmed = await self._delete_ranked(
+                conn,
+                feed_ids=sorted({post.feed_id for post in created_posts}),
+                keep_latest=max_posts_per_feed,
+            )
+
+        if trimmed:
+            # fmt: off
+            logger.debug(
+                "Trimmed feed posts beyond the cap",
+                count=len(trimmed), max_posts_per_feed=max_posts_per_feed,
+            )
+            # fmt: on
+        # the new posts older than the ones kept are trimmed right after they are created
+        return [post for post in created_posts if (post.id, post.published_at) not in trimmed]
+
+    async def delete_outdated(
+        self,
+        *,
+        feed_ids: list[int],
+        published_before: datetime,
+        keep_latest: int,
+        limit: int,
+    ) -> int:
+        async with self.db.begin() as conn:
+            deleted = await self._delete_ranked(
+                conn,
+                feed_ids=feed_ids,
+                keep_latest=keep_latest,
+                published_before=published_before,
+                limit=limit,
+            )
+            if deleted:
+                await conn.execute(mdl.bump_feed_post_deletions())
+
+        return len(deleted)
+
+    async def _delete_ranked(
+        self,
+        conn: AsyncConnection,
+        *,
+        feed_ids: list[int],
+        keep_latest: int,
+        published_before: datetime | None = None,
+        limit: int | None = None,
+    ) -> set[tuple[int, datetime]]:
+        """
+        Delete the posts of the given feeds beyond the latest keep_latest ones of every feed,
+        optionally the ones published before the given time alone, along with their read marks.
+        Return the ids and the publication times of the deleted posts.
+        """
+        # the posts of every feed are ranked straight off the index over the same columns
+        ranked_posts = (
+            sa.select(
+                mdl.FeedPost.c.id,
+                mdl.FeedPost.c.published_at,
+                sa.func.row_number()
+                .over(
+                    partition_by=mdl.FeedPost.c.feed_id,
+                    order_by=(mdl.FeedPost.c.published_at.desc(), mdl.FeedPost.c.id.desc()),
+                )
+                .label("rank"),
+            )
+            .where(mdl.FeedPost.c.feed_id.in_(feed_ids))
+            .subquery("ranked_post")
+        )
+        outdated_q = sa.select(ranked_posts.c.id, ranked_posts.c.published_at).where(
+            ranked_posts.c.rank > keep_latest
+        )
+        if published_before is not None:
+            outdated_q = outdated_q.where(ranked_posts.c.published_at < published_before)
+        if limit is not None:
+            outdated_q = outdated_q.limit(limit)
+
+        outdated = {
+            (post_id, published_at) for post_id, published_at in await conn.execute(outdated_q)
+        }
+        if not outdated:
+            return outdated
+
+        await conn.execute(
+            sa.delete(mdl.UserPost).where(
+                mdl.UserPost.c.post_id.in_([post_id for post_id, _ in outdated])
+            )
+        )
+        # the partition key is matched along with the id, so the posts are looked up
+        # in the partitions they are in rather than in every one of them
+        await conn.execute(
+            sa.delete(mdl.FeedPost).where(
+                sa.tuple_(mdl.FeedPost.c.id, mdl.FeedPost.c.published_at).in_(sorted(outdated))
+            )
+        )
+
+        return outdated
 
     async def get_list(
         self,
@@ -68,7 +202,7 @@ class PostgresFeedPostRepository(BasePostgresRepository, FeedPostRepository):
         limit: int,
         offset: int,
     ) -> list[FeedPost]:
-        query = sa.select(mdl.FeedPost)
+        query = sa.select(*mdl.FEED_POST_COLUMNS)
 
         if filter_by:
             query = self._apply_filtering(query, filter_by)
@@ -81,11 +215,88 @@ class PostgresFeedPostRepository(BasePostgresRepository, FeedPostRepository):
 
         query = query.limit(limit).offset(offset)
 
-        async with self.db.connect() as conn:
+        async with self._get_reader().connect() as conn:
             result = await conn.execute(query)
 
         return [FeedPost.model_validate(dict(row)) for row in result.mappings()]
 
+    async def search(
+        self,
+        *,
+        query: str,
+        filter_by: FeedPostFiltering | None = None,
+        after: FeedPostSearchCursor | None = None,
+        limit: int,
+    ) -> list[FeedPostSearchHit]:
+        ts_query = sa.func.websearch_to_tsquery(_search_config, query)
+        rank = sa.func.ts_rank(mdl.FeedPost.c.search_vector, ts_query)
+
+        search_q = sa.select(*mdl.FEED_POST_COLUMNS, rank.label("rank")).where(
+            mdl.FeedPost.c.search_vector.bool_op("@@")(ts_query)
+        )
+
+        if filter_by:
+            search_q = self._apply_filtering(search_q, filter_by)
+
+        if after:
+            # the rank is compared exactly as it was returned, it's a float4 on both sides
+            search_q = search_q.where(
+                sa.tuple_(rank, mdl.FeedPost.c.published_at, mdl.FeedPost.c.id)
+                < sa.tuple_(
+                    sa.cast(after.rank, sa.REAL),
+                    sa.literal(after.published_at, mdl.FeedPost.c.published_at.type),
+                    sa.literal(after.id, mdl.FeedPost.c.id.type),
+                )
+            )
+
+        search_q = search_q.order_by(
+            sa.literal_column("rank").desc(),
+            mdl.FeedPost.c.published_at.desc(),
+            mdl.FeedPost.c.id.desc(),
+        ).limit(limit)
+
+        async with self._get_reader().connect() as conn:
+            result = await conn.execute(search_q)
+
+        return [
+            FeedPostSearchHit(post=FeedPost.model_validate(dict(row)), rank=row["rank"])
+            for row in result.mappings()
+        ]
+
+    async def get_list_version(self, *, filter_by: FeedPostFiltering | None = None) -> str:
+        # posts are never updated, so new posts are caught by the id boundaries,
+        # while the deleted ones are caught by the generation the retention bumps on every delete.
+        # the user specific states are caught by the number of rows and the latest row id.
+        # all of these aggregates are resolved by postgres with a lookup in the respective index
+        columns = [
+            sa.select(sa.func.min(mdl.FeedPost.c.id)).scalar_subquery(),
+            sa.select(sa.func.max(mdl.FeedPost.c.id)).scalar_subquery(),
+            sa.select(mdl.FeedPostDeletions.c.generation).scalar_subquery(),
+        ]
+
+        if filter_by:
+            if follower_uid := filter_by.followed_by or filter_by.not_followed_by:
+                columns.extend(self._get_user_rows_version(mdl.UserFeed, follower_uid))
+            if reader_uid := filter_by.read_by or filter_by.not_read_by:
+                columns.extend(self._get_user_rows_version(mdl.UserPost, reader_uid))
+
+        async with self._get_reader().connect() as conn:
+            result = await conn.execute(sa.select(*columns))
+
+        return ":".join(str(value) for value in result.one())
+
+    def _get_user_rows_version(
+        self,
+        table: sa.Table,
+        user_uid: uuid.UUID,
+    ) -> list[sa.ScalarSelect]:
+        return [
+            sa.select(sa.func.count()).where(table.c.user_uid == user_uid).scalar_subquery(),
+            sa.select(sa.func.max(table.c.id))
+            .where(table.c.user_uid == user_uid)
+            .scalar_subquery(),
+        ]
+
     def _apply_filtering(
         self,
         query: sa.Select,
@@ -5,6 +5,7 @@ import structlog
 from asyncpg import ForeignKeyViolationError, UniqueViolationError
 from sqlalchemy.exc import IntegrityError
 
+from awesome_rss_reader.application import metrics
 from awesome_rss_reader.core.entity.feed_refresh_job import (
     FeedRefreshJob,
     FeedRefreshJobFiltering,
@@ -140,6 +141,20 @@ class PostgresFeedRefreshJobRepository(BasePostgresRepository, FeedRefreshJobRep
 
         return query
 
+    async def count_by_state(self) -> dict[FeedRefreshJobState, int]:
+        query = sa.select(mdl.FeedRefreshJob.c.state, sa.func.count()).group_by(
+            mdl.FeedRefreshJob.c.state
+        )
+
+        async with self.db.connect() as conn:
+            result = await conn.execute(query)
+
+        counts = {state: 0 for state in FeedRefreshJobState}
+        for state, count in result:
+            counts[FeedRefreshJobState(state)] = count
+
+        return counts
+
     async def update(self, *, job_id: int, updates: FeedRefreshJobUpdates) -> FeedRefreshJob:
         update_q = (
             sa.update(mdl.FeedRefreshJob)
@@ -187,8 +202,11 @@ class PostgresFeedRefreshJobRepository(BasePostgresRepository, FeedRefreshJobRep
             await conn.execute(select_for_update_q)
 
             result = await conn.execute(update_q)
-            if row := result.mappings().fetchone():
-                return FeedRefreshJob.model_validate(dict(row))
+            row = result.mappings().fetchone()
+
+        if row:
+            self._count_transitions(old_state=old_state, new_state=new_state)
+            return FeedRefreshJob.model_validate(dict(row))
 
         raise RefreshJobStateTransitionError(
             f"Failed to transit refresh job with {job_id=} from {old_state=} to {new_state=}"
@@ -230,4 +248,19 @@ class PostgresFeedRefreshJobRepository(BasePostgresRepository, FeedRefreshJobRep
             await conn.execute(select_for_update_q)
             result = await conn.execute(update_q)
 
-        return [FeedRefreshJob.model_validate(dict(row)) for row in result.mappings()]
+        jobs = [FeedRefreshJob.model_validate(dict(row)) for row in result.mappings()]
+        self._count_transitions(old_state=old_state, new_state=new_state, count=len(jobs))
+
+        return jobs
+
+    def _count_transitions(
+        self,
+        *,
+        old_state: FeedRefreshJobState,
+        new_state: FeedRefreshJobState,
+        count: int = 1,
+    ) -> None:
+        metrics.FEED_REFRESH_JOB_TRANSITIONS.labels(
+            old_state=old_state.name,
+            new_state=new_state.name,
+        ).inc(count)
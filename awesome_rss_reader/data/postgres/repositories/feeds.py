@@ -101,15 +101,40 @@ class PostgresFeedRepository(BasePostgresRepository, FeedRepository):
 
         query = query.limit(limit).offset(offset)
 
-        async with self.db.connect() as conn:
+        async with self._get_reader().connect() as conn:
             result = await conn.execute(query)
 
         return [Feed.model_validate(dict(row)) for row in result.mappings()]
 
+    async def get_list_version(self, *, filter_by: FeedFiltering | None = None) -> str:
+        # new and deleted feeds are caught by the count and the latest id,
+        # while every update bumps the version of its feed, and so the sum of them
+        columns = [
+            sa.func.count(),
+            sa.func.max(mdl.Feed.c.id),
+            sa.func.sum(mdl.Feed.c.version),
+        ]
+        # catch a feed being unfollowed and another one followed in its place
+        if filter_by and filter_by.followed_by:
+            columns.append(sa.func.max(mdl.UserFeed.c.id))
+
+        query = sa.select(*columns).select_from(mdl.Feed)
+
+        if filter_by:
+            query = self._apply_filtering(query, filter_by)
+
+        async with self._get_reader().connect() as conn:
+            result = await conn.execute(query)
+
+        return ":".join(str(value) for value in result.one())
+
     def _apply_filtering(self, query: sa.Select, filter_by: FeedFiltering) -> sa.Select:
         if filter_by.feed_ids:
             query = query.where(mdl.Feed.c.id.in_(filter_by.feed_ids))
 
+        if filter_by.id_after is not None:
+            query = query.where(mdl.Feed.c.id > filter_by.id_after)
+
         if filter_by.followed_by:
             # fmt: off
             query = (
@@ -128,7 +153,7 @@ class PostgresFeedRepository(BasePostgresRepository, FeedRepository):
         update_q = (
             sa.update(mdl.Feed)
             .where(mdl.Feed.c.id == feed_id)
-            .values(**updates.model_dump(exclude_unset=True))
+            .values(**updates.model_dump(exclude_unset=True), version=mdl.Feed.c.version + 1)
             .returning(mdl.Feed)
         )
 
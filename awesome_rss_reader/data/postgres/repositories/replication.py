@@ -0,0 +1,24 @@
+import sqlalchemy as sa
+
+from awesome_rss_reader.core.repository.replication import ReplicationRepository
+from awesome_rss_reader.data.postgres.repositories.base import BasePostgresRepository
+
+
+class PostgresReplicationRepository(BasePostgresRepository, ReplicationRepository):
+    async def get_lag_s(self) -> float | None:
+        # the replay lag is only reported by the primary, and is null for a replica
+        # that has caught up and has had nothing to replay since
+        query = sa.text(
+            """
+            SELECT
+                count(*) AS replicas,
+                coalesce(extract(epoch FROM max(replay_lag)), 0) AS lag_s
+            FROM pg_stat_replication
+            """
+        )
+
+        async with self.db.connect() as conn:
+            result = await conn.execute(query)
+
+        replicas, lag_s = result.one()
+        return float(lag_s) if replicas else None
@@ -47,6 +47,13 @@ class PostgresUserFeedRepository(BasePostgresRepository, UserFeedRepository):
 
         raise UserFeedNotFoundError(f"UserFeed for {user_uid=} and {feed_id=} not found")
 
+    async def get_followed_feed_ids(self, user_uid: uuid.UUID) -> list[int]:
+        query = sa.select(mdl.UserFeed.c.feed_id).where(mdl.UserFeed.c.user_uid == user_uid)
+
+        async with self._get_reader().connect() as conn:
+            result = await conn.execute(query)
+            return list(result.scalars())
+
     async def get_or_create(self, new_user_feed: NewUserFeed) -> UserFeed:
         try:
             return await self.get_for_user_and_feed(
@@ -2,7 +2,7 @@ import uuid
 
 import sqlalchemy as sa
 import structlog
-from asyncpg import ForeignKeyViolationError, UniqueViolationError
+from asyncpg import UniqueViolationError
 from sqlalchemy.exc import IntegrityError
 
 from awesome_rss_reader.core.entity.user_post import NewUserPost, UserPost
@@ -70,7 +70,21 @@ class PostgresUserPostRepository(BasePostgresRepository, UserPostRepository):
             )
 
     async def _maybe_create(self, new_user_post: NewUserPost) -> UserPost:
-        query = sa.insert(mdl.UserPost).values(new_user_post.model_dump()).returning(mdl.UserPost)
+        values = new_user_post.model_dump()
+        # there is no foreign key to the partitioned posts, so the post is looked up instead
+        post_exists = (
+            sa.select(mdl.FeedPost.c.id).where(mdl.FeedPost.c.id == new_user_post.post_id).exists()
+        )
+        query = (
+            sa.insert(mdl.UserPost)
+            .from_select(
+                list(values),
+                sa.select(
+                    *(sa.literal(value, mdl.UserPost.c[key].type) for key, value in values.items())
+                ).where(post_exists),
+            )
+            .returning(mdl.UserPost)
+        )
 
         async with self.db.begin() as conn:
             try:
@@ -86,13 +100,13 @@ class PostgresUserPostRepository(BasePostgresRepository, UserPostRepository):
                 # fmt: on
                 self._handle_integrity_error_on_create(ie)
 
-            row = result.mappings().one()
+            if (row := result.mappings().one_or_none()) is None:
+                raise UserPostNoPostError("Referenced post does not exist")
+
             return UserPost.model_validate(dict(row))
 
     def _handle_integrity_error_on_create(self, ie: IntegrityError) -> None:
         match ie.orig.__cause__:  # type: ignore[union-attr]
-            case ForeignKeyViolationError():
-                raise UserPostNoPostError("Referenced post does not exist") from ie
             case UniqueViolationError():
                 raise _UserPostAlreadyExistsError("User post already exists") from ie
             case _:
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.application import metrics
+
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+_session_key: ContextVar[Hashable | None] = ContextVar("session_key", default=None)
+
+
+@contextmanager
+def pin_to_primary() -> Iterator[None]:
+    """
+    Send the reads of the current context to the primary,
+    e.g. the ones made in the middle of a transaction, which the replica knows nothing about yet.
+    """
+    token = _pinned_to_primary.set(True)  # noqa: FBT003
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def bind_session(key: Hashable) -> None:
+    """
+    Tie the statements of the current context to a session, such as the user of an api request,
+    so the session gets to read its own writes regardless of the replication lag.
+    """
+    _session_key.set(key)
+
+
+@dataclass
+class ReplicaRouter:
+    """
+    Route the read-only queries to the replica, unless they have to see the latest writes.
+    A session that has just committed something reads from the primary for a while,
+    the sessions are only remembered by the process that has seen their writes though.
+    """
+
+    primary: AsyncEngine
+    replica: AsyncEngine | None = None
+    sticky_s: float = 5
+    max_sessions: int = 10_000
+
+    _sticky_until: OrderedDict[Hashable, float] = field(default_factory=OrderedDict, init=False)
+
+    def __post_init__(self) -> None:
+        if self.replica is not None:
+            event.listen(self.primary.sync_engine, "commit", self._on_commit)
+
+    def get_reader(self) -> AsyncEngine:
+        if self.replica is None:
+            return self.primary
+
+        if _pinned_to_primary.get() or self._is_sticky():
+            metrics.DB_READS.labels(target="primary").inc()
+            return self.primary
+
+        metrics.DB_READS.labels(target="replica").inc()
+        return self.replica
+
+    def _is_sticky(self) -> bool:
+        if (key := _session_key.get()) is None or (until := self._sticky_until.get(key)) is None:
+            return False
+
+        if until <= time.monotonic():
+            del self._sticky_until[key]
+            return False
+
+        return True
+
+    def _on_commit(self, _conn: Connection) -> None:
+        if (key := _session_key.get()) is None:
+            return
+
+        self._sticky_until[key] = time.monotonic() + self.sticky_s
+        self._sticky_until.move_to_end(key)
+        # the sessions are kept in the order of their writes, so the ones to go are the oldest
+        while len(self._sticky_until) > self.max_sessions:
+            self._sticky_until.popitem(last=False)
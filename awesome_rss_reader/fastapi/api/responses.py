@@ -0,0 +1,129 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from fastapi import status
+from pydantic import TypeAdapter
+from starlette.responses import Response, StreamingResponse
+
+from awesome_rss_reader.core.entity.feed import Feed
+from awesome_rss_reader.core.entity.feed_post import FeedPost, FeedPostsCreated
+from awesome_rss_reader.fastapi.api.schemas import ApiFeed, ApiFeedPost
+
+_feed_list_adapter = TypeAdapter(list[Feed])
+_feed_post_list_adapter = TypeAdapter(list[FeedPost])
+
+# entities are dumped as is, but only the fields exposed by the api schemas make it to the response
+_feed_fields = {"__all__": set(ApiFeed.model_fields)}
+_feed_post_fields = {"__all__": set(ApiFeedPost.model_fields)}
+
+# the cursor of the next page of a keyset paginated list, the list itself is returned as it is
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+
+def feed_list_response(feeds: list[Feed], *, version: str | None = None) -> JSONBytesResponse:
+    """
+    Serialize feed entities straight to json,
+    skipping the validation of the response model and fastapi's own serialization.
+    """
+    content = _feed_list_adapter.dump_json(feeds, include=_feed_fields)  # type: ignore[arg-type]
+    return JSONBytesResponse(content=content, headers=_etag_headers(version))
+
+
+def feed_post_list_response(
+    posts: list[FeedPost],
+    *,
+    version: str | None = None,
+    next_cursor: str | None = None,
+) -> JSONBytesResponse:
+    """
+    Serialize post entities straight to json,
+    skipping the validation of the response model and fastapi's own serialization.
+    """
+    content = _feed_post_list_adapter.dump_json(
+        posts, include=_feed_post_fields  # type: ignore[arg-type]
+    )
+    headers = _etag_headers(version)
+    if next_cursor is not None:
+        headers = {**(headers or {}), NEXT_CURSOR_HEADER: next_cursor}
+    return JSONBytesResponse(content=content, headers=headers)
+
+
+def not_modified_response(version: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_etag_headers(version))
+
+
+def post_event_stream_response(
+    events: AsyncIterator[FeedPostsCreated],
+    *,
+    heartbeat_s: float,
+) -> StreamingResponse:
+    """
+    Stream the events to the client as server-sent events.
+    """
+    return StreamingResponse(
+        _format_post_events(events, heartbeat_s=heartbeat_s),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # let the events through reverse proxies as soon as they are sent
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+async def _format_post_events(
+    events: AsyncIterator[FeedPostsCreated],
+    *,
+    heartbeat_s: float,
+) -> AsyncIterator[bytes]:
+    # the next event is awaited in a task, so a heartbeat timeout does not cancel the iterator
+    next_event: asyncio.Future[FeedPostsCreated] | None = None
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(anext(events))
+
+            done, _ = await asyncio.wait({next_event}, timeout=heartbeat_s)
+            if not done:
+                yield b": heartbeat\n\n"
+                continue
+
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                next_event = None
+                return
+
+            next_event = None
+            yield b"event: posts\ndata: " + event.model_dump_json().encode() + b"\n\n"
+    finally:
+        # the client went away or the stream is over, let the iterator clean up after itself
+        if next_event is not None:
+            next_event.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_event
+        if isinstance(events, AsyncGenerator):
+            await events.aclose()
+
+
+def parse_if_none_match(header: str | None) -> list[str]:
+    """
+    Extract the entity tags from an If-None-Match header.
+    Weak tags are treated the same as strong ones, as the list responses are never transformed.
+    """
+    if not header:
+        return []
+
+    tags = (tag.strip() for tag in header.split(","))
+    return [tag.removeprefix("W/").strip('"') for tag in tags if tag]
+
+
+def _etag_headers(version: str | None) -> dict[str, str] | None:
+    if version is None:
+        return None
+    return {"ETag": f'"{version}"'}
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Header, status
+from starlette.responses import Response
 
 from awesome_rss_reader.application.di import Container
 from awesome_rss_reader.core.entity.user import User
 from awesome_rss_reader.core.usecase.create_feed import CreateFeedInput
-from awesome_rss_reader.core.usecase.list_user_feeds import ListUserFeedsInput
+from awesome_rss_reader.core.usecase.list_user_feeds import (
+    FeedsNotModifiedError,
+    ListUserFeedsInput,
+)
+from awesome_rss_reader.fastapi.api.responses import (
+    feed_list_response,
+    not_modified_response,
+    parse_if_none_match,
+)
 from awesome_rss_reader.fastapi.api.schemas import ApiCreateFeedBody, ApiFeed
 from awesome_rss_reader.fastapi.depends.auth import get_current_user
 from awesome_rss_reader.fastapi.depends.di import get_container
@@ -35,16 +44,31 @@ async def create_feed(
     summary="List feeds followed by the user",
     response_model=list[ApiFeed],
     status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Feeds have not changed since the version passed in If-None-Match",
+        },
+    },
 )
 async def list_feeds(
     user: User = Depends(get_current_user),
     container: Container = Depends(get_container),
     offset: int = 0,
     limit: int = 100,
-) -> list[ApiFeed]:
+    if_none_match: str | None = Header(None),
+) -> Response:
     uc = container.use_cases.list_followed_feeds()
 
-    uc_input = ListUserFeedsInput(user_uid=user.uid, offset=offset, limit=limit)
-    uc_result = await uc.execute(uc_input)
+    uc_input = ListUserFeedsInput(
+        user_uid=user.uid,
+        offset=offset,
+        limit=limit,
+        known_versions=parse_if_none_match(if_none_match),
+    )
+
+    try:
+        uc_result = await uc.execute(uc_input)
+    except FeedsNotModifiedError as exc:
+        return not_modified_response(exc.version)
 
-    return [ApiFeed.model_validate(feed) for feed in uc_result.feeds]
+    return feed_list_response(uc_result.feeds, version=uc_result.version)
@@ -1,8 +1,26 @@
-from fastapi import APIRouter, Depends, Query
+import uuid
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from starlette.responses import Response, StreamingResponse
 
 from awesome_rss_reader.application.di import Container
 from awesome_rss_reader.core.entity.user import User
-from awesome_rss_reader.core.usecase.list_feed_posts import ListFeedPostsInput
+from awesome_rss_reader.core.usecase.list_feed_posts import (
+    ListFeedPostsInput,
+    PostsNotModifiedError,
+)
+from awesome_rss_reader.core.usecase.search_feed_posts import (
+    InvalidSearchCursorError,
+    SearchFeedPostsInput,
+)
+from awesome_rss_reader.core.usecase.stream_feed_posts import StreamFeedPostsInput
+from awesome_rss_reader.fastapi.api.responses import (
+    NEXT_CURSOR_HEADER,
+    feed_post_list_response,
+    not_modified_response,
+    parse_if_none_match,
+    post_event_stream_response,
+)
 from awesome_rss_reader.fastapi.api.schemas import (
     ApiFeedPost,
     ApiPostFollowStatus,
@@ -14,10 +32,42 @@ from awesome_rss_reader.fastapi.depends.di import get_container
 router = APIRouter(tags=["posts"])
 
 
+@router.get(
+    "/posts/stream",
+    summary="Stream new posts of followed feeds",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/event-stream": {}},
+            "description": "Server-sent `posts` events, each listing new post ids of a feed",
+        },
+    },
+)
+async def stream_posts(
+    user: User = Depends(get_current_user),
+    container: Container = Depends(get_container),
+) -> StreamingResponse:
+    app_settings = container.settings.app()
+    uc = container.use_cases.stream_feed_posts()
+
+    uc_input = StreamFeedPostsInput(user_uid=user.uid)
+    uc_result = await uc.execute(uc_input)
+
+    return post_event_stream_response(
+        uc_result.events,
+        heartbeat_s=app_settings.post_stream_heartbeat_s,
+    )
+
+
 @router.get(
     "/posts",
     summary="List feed posts",
     response_model=list[ApiFeedPost],
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Posts have not changed since the version passed in If-None-Match",
+        },
+    },
 )
 async def list_posts(
     user: User = Depends(get_current_user),
@@ -27,24 +77,11 @@ async def list_posts(
     read_status: ApiPostReadStatus = Query(None),
     follow_status: ApiPostFollowStatus = Query(None),
     feed_id: int = Query(None),
-) -> list[ApiFeedPost]:
+    if_none_match: str | None = Header(None),
+) -> Response:
     uc = container.use_cases.list_feed_posts()
-
-    read_by = None
-    not_read_by = None
-    match read_status:
-        case ApiPostReadStatus.read:
-            read_by = user.uid
-        case ApiPostReadStatus.unread:
-            not_read_by = user.uid
-
-    followed_by = None
-    not_followed_by = None
-    match follow_status:
-        case ApiPostFollowStatus.following:
-            followed_by = user.uid
-        case ApiPostFollowStatus.not_following:
-            not_followed_by = user.uid
+    read_by, not_read_by = _get_read_filters(user, read_status)
+    followed_by, not_followed_by = _get_follow_filters(user, follow_status)
 
     uc_input = ListFeedPostsInput(
         followed_by=followed_by,
@@ -54,7 +91,86 @@ async def list_posts(
         feed_id=feed_id,
         offset=offset,
         limit=limit,
+        known_versions=parse_if_none_match(if_none_match),
     )
-    uc_result = await uc.execute(uc_input)
 
-    return [ApiFeedPost.model_validate(post) for post in uc_result.posts]
+    try:
+        uc_result = await uc.execute(uc_input)
+    except PostsNotModifiedError as exc:
+        return not_modified_response(exc.version)
+
+    return feed_post_list_response(uc_result.posts, version=uc_result.version)
+
+
+@router.get(
+    "/posts/search",
+    summary="Search feed posts by their titles and summaries",
+    response_model=list[ApiFeedPost],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "The most relevant posts first, "
+            f"the cursor of the next page, if there is one, is passed in {NEXT_CURSOR_HEADER}",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid cursor",
+        },
+    },
+)
+async def search_posts(
+    user: User = Depends(get_current_user),
+    container: Container = Depends(get_container),
+    q: str = Query(min_length=1, max_length=256, description="Web search style query"),
+    cursor: str | None = Query(None, description="Cursor of the page to fetch"),
+    limit: int = Query(100, ge=1, le=100),
+    read_status: ApiPostReadStatus = Query(None),
+    follow_status: ApiPostFollowStatus = Query(None),
+    feed_id: int = Query(None),
+) -> Response:
+    uc = container.use_cases.search_feed_posts()
+    read_by, not_read_by = _get_read_filters(user, read_status)
+    followed_by, not_followed_by = _get_follow_filters(user, follow_status)
+
+    uc_input = SearchFeedPostsInput(
+        query=q,
+        followed_by=followed_by,
+        not_followed_by=not_followed_by,
+        read_by=read_by,
+        not_read_by=not_read_by,
+        feed_id=feed_id,
+        cursor=cursor,
+        limit=limit,
+    )
+
+    try:
+        uc_result = await uc.execute(uc_input)
+    except InvalidSearchCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    return feed_post_list_response(uc_result.posts, next_cursor=uc_result.next_cursor)
+
+
+def _get_read_filters(
+    user: User,
+    read_status: ApiPostReadStatus | None,
+) -> tuple[uuid.UUID | None, uuid.UUID | None]:
+    match read_status:
+        case ApiPostReadStatus.read:
+            return user.uid, None
+        case ApiPostReadStatus.unread:
+            return None, user.uid
+    return None, None
+
+
+def _get_follow_filters(
+    user: User,
+    follow_status: ApiPostFollowStatus | None,
+) -> tuple[uuid.UUID | None, uuid.UUID | None]:
+    match follow_status:
+        case ApiPostFollowStatus.following:
+            return user.uid, None
+        case ApiPostFollowStatus.not_following:
+            return None, user.uid
+    return None, None
@@ -3,5 +3,6 @@ from starlette.requests import Request
 from awesome_rss_reader.application.di import Container
 
 
-def get_container(request: Request) -> Container:
+# a coroutine function is called right in the event loop, a plain function is run in a threadpool
+async def get_container(request: Request) -> Container:
     return request.app.state.container
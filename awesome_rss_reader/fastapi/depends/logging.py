@@ -2,5 +2,5 @@ from starlette.requests import Request
 from structlog.stdlib import BoundLogger
 
 
-def get_logger(request: Request) -> BoundLogger:
+async def get_logger(request: Request) -> BoundLogger:
     return request.app.state.logger
@@ -1,9 +1,15 @@
 import structlog
 from fastapi import FastAPI
 
-from awesome_rss_reader.application import di
+from awesome_rss_reader.application import di, tracing
 from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.loop_monitor import start_loop_monitor
+from awesome_rss_reader.application.profiling import start_profiling
 from awesome_rss_reader.fastapi.api.router import router as api_router
+from awesome_rss_reader.fastapi.middleware import (
+    RequestMetricsMiddleware,
+    RequestTracingMiddleware,
+)
 from awesome_rss_reader.fastapi.misc.router import router as misc_router
 
 
@@ -13,17 +19,36 @@ def init(container: Container) -> FastAPI:
     app = FastAPI(title=app_settings.name, version=app_settings.release_ver)
     app.include_router(misc_router)
     app.include_router(api_router, prefix="/api")
+    app.add_middleware(RequestMetricsMiddleware)
+    app.add_middleware(RequestTracingMiddleware)
 
     app.state.container = container
     app.state.logger = structlog.getLogger()
+    app.state.loop_monitor = None
+    app.state.profiler = None
+
+    @app.on_event("startup")
+    async def on_startup() -> None:
+        app.state.loop_monitor = start_loop_monitor(app_settings)
+        app.state.profiler = start_profiling(container.settings.profiling(), service_name="api")
 
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
+        if app.state.profiler is not None:
+            await app.state.profiler.stop()
+        if app.state.loop_monitor is not None:
+            await app.state.loop_monitor.stop()
+        await container.repositories.feed_post_events().close()
         await container.database.engine().dispose()
+        if (replica_engine := container.database.replica_engine()) is not None:
+            await replica_engine.dispose()
+        if (listener_engine := container.database.listener_engine()) is not None:
+            await listener_engine.dispose()
 
     return app
 
 
 def get_asgi_app() -> FastAPI:
     container = di.init()
+    tracing.init_tracing(container.settings.tracing(), service_name="api")
     return init(container)
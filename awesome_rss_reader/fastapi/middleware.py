@@ -0,0 +1,96 @@
+import time
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from awesome_rss_reader.application import metrics, tracing
+from awesome_rss_reader.data.postgres.instrumentation import count_queries
+
+logger = structlog.get_logger()
+
+
+class RequestMetricsMiddleware:
+    """
+    Time the api requests per route, and count the database statements they execute.
+    A plain asgi middleware, so the streaming responses are not buffered.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.perf_counter()
+        with count_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # the route template is only known once the request has been routed
+                route = getattr(scope.get("route"), "path", "unmatched")
+                metrics.HTTP_REQUEST_DURATION.labels(
+                    method=scope["method"],
+                    route=route,
+                    status=status_code,
+                ).observe(time.perf_counter() - started_at)
+                metrics.HTTP_REQUEST_QUERIES.labels(
+                    method=scope["method"],
+                    route=route,
+                ).observe(queries.count)
+                # fmt: off
+                logger.debug(
+                    "Request database queries",
+                    method=scope["method"], route=route,
+                    count=queries.count, duration_s=round(queries.duration_s, 3),
+                )
+                # fmt: on
+
+
+class RequestTracingMiddleware:
+    """
+    Record a span per api request, continuing the trace of the caller if there's one.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]
+        }
+        # fmt: off
+        span_cm = tracing.start_span(
+            f"{method} unmatched", kind="server", carrier=headers,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        # fmt: on
+        with span_cm as span:
+
+            async def send_with_status(message: Message) -> None:
+                if span is not None and message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # the route template is only known once the request has been routed
+                route = getattr(scope.get("route"), "path", None)
+                if span is not None and route is not None:
+                    span.set_attribute("http.route", route)
+                    span.update_name(f"{method} {route}")
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
 
-from .views import info, redirects, token
+from .views import info, metrics, redirects, token
 
 router = APIRouter(tags=["misc"])
 
 router.include_router(info.router)
 router.include_router(token.router)
+router.include_router(metrics.router, include_in_schema=False)
 router.include_router(redirects.router, include_in_schema=False)
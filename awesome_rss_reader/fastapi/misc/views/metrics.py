@@ -0,0 +1,13 @@
+import prometheus_client
+from fastapi import APIRouter
+from starlette.responses import Response
+
+router = APIRouter()
+
+
+@router.get("/metrics", summary="Get prometheus metrics")
+async def get_metrics() -> Response:
+    return Response(
+        content=prometheus_client.generate_latest(),
+        media_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
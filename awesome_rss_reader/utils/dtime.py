@@ -3,3 +3,14 @@ from datetime import UTC, datetime
 
 def now_aware() -> datetime:
     return datetime.now(tz=UTC)
+
+
+def month_start(dt: datetime) -> datetime:
+    """Get the start of the month of a given time, in UTC."""
+    return dt.astimezone(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Shift the start of a month by a number of months, back if it's negative."""
+    years, month_index = divmod(dt.month - 1 + months, 12)
+    return dt.replace(year=dt.year + years, month=month_index + 1)
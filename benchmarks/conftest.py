@@ -0,0 +1,148 @@
+import json
+import platform
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from benchmarks.timing import Throughput, Timings
+
+# reuse the fixtures of the test suite, so the benchmarks run against the same setup
+from tests.conftest import (  # noqa: F401
+    _reset_use_cases,
+    _setup_db,
+    clear_db,
+    container,
+    create_httpservers,
+    db,
+    db_dsn,
+    db_engine,
+    db_settings,
+    event_loop,
+    fastapi_app,
+    pgbouncer_dsn,
+    postgres_database,
+)
+
+pytest_plugins = [
+    "tests.pytest_fixtures.api",
+    "tests.pytest_fixtures.data",
+    "tests.pytest_fixtures.db",
+]
+
+_report_key = pytest.StashKey[list[Timings]]()
+_throughput_report_key = pytest.StashKey[list[Throughput]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-save",
+        type=Path,
+        metavar="PATH",
+        help="Save the benchmark timings to a json file, to be compared with later runs",
+    )
+    group.addoption(
+        "--bench-compare",
+        type=Path,
+        metavar="PATH",
+        help="Compare the benchmark timings with the ones saved by an earlier run",
+    )
+
+
+@pytest.fixture()
+def bench_report(pytestconfig: pytest.Config) -> list[Timings]:
+    """Collect benchmark timings to be reported in the terminal summary at the end of the run."""
+    return pytestconfig.stash.setdefault(_report_key, [])
+
+
+@pytest.fixture()
+def throughput_report(pytestconfig: pytest.Config) -> list[Throughput]:
+    """Collect throughput measurements to be reported in the terminal summary."""
+    return pytestconfig.stash.setdefault(_throughput_report_key, [])
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config) -> None:
+    report: list[Timings] = config.stash.get(_report_key, [])
+
+    baseline = None
+    if baseline_path := config.getoption("bench_compare"):
+        baseline = _load_timings(baseline_path)
+
+    _report_timings(terminalreporter, report, baseline=baseline)
+    _report_throughput(terminalreporter, config.stash.get(_throughput_report_key, []))
+
+    if report and (save_path := config.getoption("bench_save")):
+        _save_timings(save_path, report)
+        terminalreporter.write_line(f"benchmark timings saved to {save_path}")
+
+
+def _save_timings(path: Path, report: list[Timings]) -> None:
+    saved = {
+        "saved_at": datetime.now(tz=UTC).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {
+            timings.name: {
+                "rounds": timings.rounds,
+                "mean": timings.mean,
+                "p50": timings.p50,
+                "p99": timings.p99,
+            }
+            for timings in report
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(saved, indent=2))
+
+
+def _load_timings(path: Path) -> dict[str, float]:
+    """Load the p50 of each benchmark saved by an earlier run."""
+    saved = json.loads(path.read_text())
+    return {name: timings["p50"] for name, timings in saved["benchmarks"].items()}
+
+
+def _report_timings(
+    terminalreporter: TerminalReporter,
+    report: list[Timings],
+    *,
+    baseline: dict[str, float] | None = None,
+) -> None:
+    if not report:
+        return
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<60} {'rounds':>8} {'mean, ms':>10} {'p50, ms':>10} {'p99, ms':>10}"
+        + (f" {'p50 change':>11}" if baseline is not None else "")
+    )
+    for timings in report:
+        line = (
+            f"{timings.name:<60} {timings.rounds:>8} "
+            f"{timings.mean * 1000:>10.3f} {timings.p50 * 1000:>10.3f} {timings.p99 * 1000:>10.3f}"
+        )
+        if baseline is not None:
+            # a negative change is an improvement
+            base_p50 = baseline.get(timings.name)
+            change = f"{(timings.p50 / base_p50 - 1) * 100:+.1f}%" if base_p50 else "new"
+            line += f" {change:>11}"
+        terminalreporter.write_line(line)
+
+
+def _report_throughput(terminalreporter: TerminalReporter, report: list[Throughput]) -> None:
+    if not report:
+        return
+
+    terminalreporter.section("throughput")
+    terminalreporter.write_line(
+        f"{'name':<40} {'feeds':>7} {'posts':>8} {'feeds/s':>9} {'posts/s':>9} "
+        f"{'p50 feed, ms':>13} {'p99 feed, ms':>13} {'cpu/feed, ms':>13}"
+    )
+    for result in report:
+        terminalreporter.write_line(
+            f"{result.name:<40} {result.feeds:>7} {result.posts:>8} "
+            f"{result.feeds_per_s:>9.1f} {result.posts_per_s:>9.1f} "
+            f"{result.feed_latencies.p50 * 1000:>13.1f} {result.feed_latencies.p99 * 1000:>13.1f} "
+            f"{result.cpu_per_feed * 1000:>13.2f}"
+        )
@@ -0,0 +1,190 @@
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from typing import Any, Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pytest_localserver.http import WSGIServer
+from werkzeug.serving import WSGIRequestHandler
+
+FeedFormat = Literal["rss", "atom"]
+
+BASE_PUBLISHED_AT = datetime(2023, 9, 1, tzinfo=UTC)
+
+
+class FeedServerSettings(BaseSettings):
+    """
+    Shape of the synthetic feeds, to be tweaked through the environment for a particular run.
+    """
+
+    feeds: int = 1000
+    items_per_feed: int = 20
+    # size of the summary of each item, the bulk of a feed
+    item_summary_b: int = 500
+    # time the server takes to respond to each request
+    latency_s: float = 0.05
+    # share of the requests failed with a 500
+    error_rate: float = 0.02
+    # share of the feeds that respond with a 304 to a conditional request for their content
+    not_modified_rate: float = 0.2
+    # share of the feeds served as atom, the rest are rss
+    atom_rate: float = 0.3
+    seed: int = 42
+
+    model_config = SettingsConfigDict(env_prefix="BENCH_FEED_SERVER_")
+
+
+@dataclass
+class _Feed:
+    content: bytes
+    etag: str
+    supports_not_modified: bool
+
+
+@dataclass
+class SyntheticFeedApp:
+    """
+    WSGI app serving the synthetic feeds at /feeds/<number>.
+    The feeds are generated upfront, so their generation does not take part in the measurements.
+    """
+
+    settings: FeedServerSettings
+
+    responses: Counter[int] = field(default_factory=Counter, init=False)
+    _feeds: list[_Feed] = field(default_factory=list, init=False)
+    _random: random.Random = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.settings.seed)
+        self._feeds = [self._generate_feed(number) for number in range(self.settings.feeds)]
+
+    def __call__(self, environ: dict[str, Any], start_response: Any) -> Iterable[bytes]:
+        time.sleep(self.settings.latency_s)
+
+        feed = self._get_feed(environ["PATH_INFO"])
+        with self._lock:
+            failed = self._random.random() < self.settings.error_rate
+
+        if feed is None:
+            return self._respond(start_response, 404, b"not found")
+        if failed:
+            return self._respond(start_response, 500, b"internal server error")
+        if feed.supports_not_modified and environ.get("HTTP_IF_NONE_MATCH") == feed.etag:
+            return self._respond(start_response, 304, b"", [("ETag", feed.etag)])
+
+        return self._respond(
+            start_response,
+            200,
+            feed.content,
+            [("Content-Type", "application/xml; charset=utf-8"), ("ETag", feed.etag)],
+        )
+
+    def _respond(
+        self,
+        start_response: Any,
+        status: int,
+        body: bytes,
+        headers: list[tuple[str, str]] | None = None,
+    ) -> list[bytes]:
+        with self._lock:
+            self.responses[status] += 1
+
+        start_response(f"{status} Status", [("Content-Length", str(len(body))), *(headers or [])])
+        return [body]
+
+    def _get_feed(self, path: str) -> _Feed | None:
+        prefix, _, number = path.rpartition("/")
+        if prefix != "/feeds" or not number.isdigit() or int(number) >= len(self._feeds):
+            return None
+        return self._feeds[int(number)]
+
+    def _generate_feed(self, number: int) -> _Feed:
+        feed_format: FeedFormat = (
+            "atom" if self._random.random() < self.settings.atom_rate else "rss"
+        )
+        content = render_feed(
+            number,
+            feed_format=feed_format,
+            items=self.settings.items_per_feed,
+            item_summary=self._random.randbytes(self.settings.item_summary_b // 2).hex(),
+        )
+        return _Feed(
+            content=content,
+            etag=hashlib.md5(content).hexdigest(),
+            supports_not_modified=self._random.random() < self.settings.not_modified_rate,
+        )
+
+
+def render_feed(number: int, *, feed_format: FeedFormat, items: int, item_summary: str) -> bytes:
+    # the posts are listed newest first, as most feeds do
+    published = [
+        (item, BASE_PUBLISHED_AT + timedelta(minutes=item)) for item in reversed(range(items))
+    ]
+
+    if feed_format == "atom":
+        entries = "".join(
+            f"""
+            <entry>
+              <title>Post {item} of feed {number}</title>
+              <link href="https://example.com/feeds/{number}/posts/{item}"/>
+              <id>urn:feed:{number}:post:{item}</id>
+              <updated>{published_at.isoformat()}</updated>
+              <published>{published_at.isoformat()}</published>
+              <summary>{item_summary}</summary>
+            </entry>"""
+            for item, published_at in published
+        )
+        return f"""<?xml version="1.0" encoding="utf-8"?>
+        <feed xmlns="http://www.w3.org/2005/Atom">
+          <title>Feed {number}</title>
+          <id>urn:feed:{number}</id>
+          <updated>{published[0][1].isoformat() if published else ""}</updated>{entries}
+        </feed>""".encode()
+
+    items_xml = "".join(
+        f"""
+        <item>
+          <title>Post {item} of feed {number}</title>
+          <link>https://example.com/feeds/{number}/posts/{item}</link>
+          <guid isPermaLink="false">urn:feed:{number}:post:{item}</guid>
+          <pubDate>{format_datetime(published_at)}</pubDate>
+          <description>{item_summary}</description>
+        </item>"""
+        for item, published_at in published
+    )
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+    <rss version="2.0">
+      <channel>
+        <title>Feed {number}</title>
+        <link>https://example.com/feeds/{number}</link>
+        <description>Synthetic feed {number}</description>{items_xml}
+      </channel>
+    </rss>""".encode()
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    # thousands of requests are made per run, logging each of them is only noise
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+
+class SyntheticFeedServer(WSGIServer):
+    def __init__(self, settings: FeedServerSettings) -> None:
+        self.feed_app = SyntheticFeedApp(settings)
+        # the feeds are requested concurrently, as the worker does it
+        super().__init__(
+            application=self.feed_app,
+            threaded=True,
+            request_handler=_QuietRequestHandler,
+        )
+        self.daemon = True
+
+    def get_feed_url(self, number: int) -> str:
+        return f"{self.url}/feeds/{number}"
@@ -0,0 +1,367 @@
+"""
+Load test of the api against a large dataset.
+
+Seed an empty database, then drive a running api server with it:
+
+    python -m benchmarks.load_test seed --feeds 100000 --posts 50000000 --users 1000000
+    python -m benchmarks.load_test run --base-url http://127.0.0.1:8000 --concurrency 50
+
+Both commands use the same POSTGRES_DB_* and AUTH_* settings as the api.
+"""
+import asyncio
+import itertools
+import math
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from hashlib import md5
+from typing import Any
+
+import click
+import httpx
+import sqlalchemy as sa
+from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.application import di
+from awesome_rss_reader.core.usecase.list_feed_posts import ListFeedPostsInput
+from benchmarks.timing import Timings
+
+# rows inserted per statement, so the seeding transactions stay reasonably small
+_seed_chunk_size = 1_000_000
+
+# every combination of the post list filters, the feed is picked at random
+_post_filters: list[dict[str, str | None]] = [
+    {"read_status": read_status, "follow_status": follow_status, "feed_id": feed_id}
+    for read_status, follow_status, feed_id in itertools.product(
+        [None, "read", "unread"],
+        [None, "following", "not_following"],
+        [None, "random"],
+    )
+]
+
+
+def _get_user_uid(number: int) -> uuid.UUID:
+    # the same as md5(number::text)::uuid in postgres, so the seeded users can be recreated here
+    return uuid.UUID(md5(str(number).encode()).hexdigest())
+
+
+def _zipf(rng: random.Random, size: int) -> int:
+    """
+    Pick a number from 1 to size, the smaller ones being picked much more often (zipf with s=1).
+    """
+    return min(int(math.exp(rng.random() * math.log(size))), size)
+
+
+@click.group()
+def load_test() -> None:
+    ...
+
+
+@load_test.command()
+@click.option("--feeds", default=100_000, type=click.INT, help="Number of feeds")
+@click.option("--posts", default=50_000_000, type=click.INT, help="Number of posts")
+@click.option("--users", default=1_000_000, type=click.INT, help="Number of users")
+@click.option("--follows-per-user", default=20, type=click.INT, help="Feeds followed per user")
+@click.option("--reads-per-user", default=50, type=click.INT, help="Posts read per user")
+def seed(feeds: int, posts: int, users: int, follows_per_user: int, reads_per_user: int) -> None:
+    """
+    Seed an empty database with feeds, posts, follows and read posts.
+    Popular feeds are followed and popular posts are read by many more users than the rest.
+    """
+    container = di.init()
+    engine = container.database.engine()
+    asyncio.run(
+        _seed(
+            engine,
+            feeds=feeds,
+            posts=posts,
+            users=users,
+            follows_per_user=follows_per_user,
+            reads_per_user=reads_per_user,
+        )
+    )
+
+
+async def _seed(
+    engine: AsyncEngine,
+    *,
+    feeds: int,
+    posts: int,
+    users: int,
+    follows_per_user: int,
+    reads_per_user: int,
+) -> None:
+    async with engine.connect() as conn:
+        if (await conn.execute(sa.text("SELECT EXISTS (SELECT 1 FROM feed)"))).scalar():
+            raise click.ClickException("The database must be empty to be seeded")
+
+    # fmt: off
+    steps = [
+        ("feeds", feeds, """
+            INSERT INTO feed (id, url, title, published_at)
+            SELECT n, 'https://feeds.example.com/' || n, 'Feed ' || n, now()
+            FROM generate_series(:start, :stop) n
+        """),
+        ("posts", posts, """
+            INSERT INTO feed_post (id, feed_id, title, summary, url, guid, published_at)
+            SELECT
+                n, 1 + n % :feeds, 'Post ' || n, repeat('Summary of the post. ', 10),
+                'https://posts.example.com/' || n, 'post-' || n,
+                now() - random() * interval '365 days'
+            FROM generate_series(:start, :stop) n
+        """),
+        ("follows", users * follows_per_user, """
+            INSERT INTO user_feed (user_uid, feed_id)
+            SELECT md5((1 + n / :follows_per_user)::text)::uuid,
+                   least(floor(exp(random() * ln(:feeds)))::int, :feeds)
+            FROM generate_series(:start, :stop) n
+            ON CONFLICT DO NOTHING
+        """),
+        ("reads", users * reads_per_user, """
+            INSERT INTO user_post (user_uid, post_id, read_at)
+            SELECT md5((1 + n / :reads_per_user)::text)::uuid,
+                   :posts + 1 - least(floor(exp(random() * ln(:posts)))::int, :posts),
+                   now()
+            FROM generate_series(:start, :stop) n
+            ON CONFLICT DO NOTHING
+        """),
+    ]
+    # fmt: on
+    params = {
+        "feeds": feeds,
+        "posts": posts,
+        "follows_per_user": follows_per_user,
+        "reads_per_user": reads_per_user,
+    }
+
+    for name, total, statement in steps:
+        started_at = time.perf_counter()
+        for start in range(0, total, _seed_chunk_size):
+            stop = min(start + _seed_chunk_size, total)
+            async with engine.begin() as conn:
+                await conn.execute(sa.text(statement), {**params, "start": start, "stop": stop - 1})
+            click.echo(f"{name}: {stop}/{total}, {time.perf_counter() - started_at:.0f}s")
+
+    async with engine.connect() as conn:
+        # the ids were set explicitly, the sequences have to catch up
+        for table in ("feed", "feed_post"):
+            await conn.execute(
+                sa.text(f"SELECT setval('{table}_id_seq', (SELECT max(id) FROM {table}))")
+            )
+        await conn.execute(sa.text("ANALYZE"))
+        await conn.commit()
+
+    await engine.dispose()
+
+
+@dataclass
+class _Scenario:
+    name: str
+    request: Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+    timings: Timings = field(init=False)
+    wall_s: float = 0
+    errors: int = 0
+
+    def __post_init__(self) -> None:
+        self.timings = Timings(name=self.name)
+
+
+@load_test.command()
+@click.option("--base-url", default="http://127.0.0.1:8000", help="Url of the api server")
+@click.option("--concurrency", default=50, type=click.INT, help="Requests in flight at a time")
+@click.option("--requests", default=1000, type=click.INT, help="Requests made per scenario")
+@click.option("--feeds", default=100_000, type=click.INT, help="Number of the seeded feeds")
+@click.option("--posts", default=50_000_000, type=click.INT, help="Number of the seeded posts")
+@click.option("--users", default=1_000_000, type=click.INT, help="Number of the seeded users")
+@click.option("--explain/--no-explain", default=True, help="Report the plans of the post queries")
+def run(
+    base_url: str,
+    concurrency: int,
+    requests: int,
+    feeds: int,
+    posts: int,
+    users: int,
+    explain: bool,  # noqa: FBT001
+) -> None:
+    """
+    Drive the api endpoints with the users of the seeded dataset, reporting latency percentiles.
+    """
+    container = di.init()
+    scenarios = _get_scenarios(container, feeds=feeds, posts=posts, users=users)
+    asyncio.run(
+        _run_scenarios(scenarios, base_url=base_url, concurrency=concurrency, requests=requests)
+    )
+
+    click.echo(
+        f"{'scenario':<60} {'rps':>8} {'errors':>7} "
+        f"{'p50, ms':>9} {'p95, ms':>9} {'p99, ms':>9} {'max, ms':>9}"
+    )
+    for scenario in scenarios:
+        timings = scenario.timings
+        click.echo(
+            f"{scenario.name:<60} {timings.rounds / scenario.wall_s:>8.1f} "
+            f"{scenario.errors:>7} {timings.p50 * 1000:>9.1f} "
+            f"{timings.percentile(95) * 1000:>9.1f} {timings.p99 * 1000:>9.1f} "
+            f"{max(timings.samples) * 1000:>9.1f}"
+        )
+
+    if explain:
+        asyncio.run(_explain_post_queries(container))
+
+
+def _get_scenarios(
+    container: di.Container,
+    *,
+    feeds: int,
+    posts: int,
+    users: int,
+) -> list[_Scenario]:
+    auth_settings = container.settings.auth()
+    tokens: dict[int, str] = {}
+
+    def auth_headers(rng: random.Random) -> dict[str, str]:
+        # active users make most of the requests
+        user = _zipf(rng, users)
+        if (token := tokens.get(user)) is None:
+            claims = {
+                "sub": str(_get_user_uid(user)),
+                "exp": datetime.now(tz=UTC) + timedelta(hours=1),
+            }
+            token = jwt.encode(claims, auth_settings.secret_key, auth_settings.algorithm)
+            tokens[user] = token
+        return {"Authorization": f"Bearer {token}"}
+
+    def list_posts(filters: dict[str, str | None]) -> Callable[..., Awaitable[httpx.Response]]:
+        async def request(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+            params: dict[str, Any] = {name: value for name, value in filters.items() if value}
+            if "feed_id" in params:
+                params["feed_id"] = _zipf(rng, feeds)
+            return await client.get("/api/posts", params=params, headers=auth_headers(rng))
+
+        return request
+
+    async def list_feeds(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get("/api/feeds", headers=auth_headers(rng))
+
+    async def read_post(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        post_id = rng.randint(1, posts)
+        return await client.put(f"/api/posts/{post_id}/read", headers=auth_headers(rng))
+
+    async def unread_post(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        post_id = rng.randint(1, posts)
+        return await client.delete(f"/api/posts/{post_id}/unread", headers=auth_headers(rng))
+
+    return [
+        *[
+            _Scenario(
+                name=f"GET /api/posts {_describe_filters(filters)}", request=list_posts(filters)
+            )
+            for filters in _post_filters
+        ],
+        _Scenario(name="GET /api/feeds", request=list_feeds),
+        _Scenario(name="PUT /api/posts/{id}/read", request=read_post),
+        _Scenario(name="DELETE /api/posts/{id}/unread", request=unread_post),
+    ]
+
+
+def _describe_filters(filters: dict[str, str | None]) -> str:
+    return ", ".join(f"{name}={value}" for name, value in filters.items() if value) or "no filters"
+
+
+async def _run_scenarios(
+    scenarios: list[_Scenario],
+    *,
+    base_url: str,
+    concurrency: int,
+    requests: int,
+) -> None:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for scenario in scenarios:
+            click.echo(f"running {scenario.name}")
+            semaphore = asyncio.Semaphore(concurrency)
+            rng = random.Random(scenario.name)
+
+            started_at = time.perf_counter()
+            await asyncio.gather(
+                *[_make_request(scenario, client, rng, semaphore) for _ in range(requests)]
+            )
+            scenario.wall_s = time.perf_counter() - started_at
+
+
+async def _make_request(
+    scenario: _Scenario,
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    async with semaphore:
+        started_at = time.perf_counter()
+        resp = await scenario.request(client, rng)
+        scenario.timings.samples.append(time.perf_counter() - started_at)
+        # the randomly picked posts may well be missing, which is fine for the measurements
+        if resp.status_code >= 400 and resp.status_code != 404:
+            scenario.errors += 1
+
+
+@contextmanager
+def _capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        _conn: Any,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        *_args: Any,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def _explain_post_queries(container: di.Container) -> None:
+    """
+    Run the post listing of an active user with every filter combination,
+    and report the plans postgres chose for the queries, along with the actual timings.
+    """
+    engine = container.database.engine()
+    uc = container.use_cases.list_feed_posts()
+    user_uid = _get_user_uid(1)
+
+    for filters in _post_filters:
+        uc_input = ListFeedPostsInput(
+            offset=0,
+            limit=100,
+            feed_id=1 if filters["feed_id"] else None,
+            followed_by=user_uid if filters["follow_status"] == "following" else None,
+            not_followed_by=user_uid if filters["follow_status"] == "not_following" else None,
+            read_by=user_uid if filters["read_status"] == "read" else None,
+            not_read_by=user_uid if filters["read_status"] == "unread" else None,
+        )
+        with _capture_statements(engine) as statements:
+            await uc.execute(uc_input)
+
+        for statement, parameters in statements:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                )
+                plan = "\n".join(row[0] for row in result)
+            click.echo(f"\n--- GET /api/posts {_describe_filters(filters)}\n{statement}\n\n{plan}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    load_test()
@@ -0,0 +1,100 @@
+from collections.abc import Iterator
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.feed import Feed
+from awesome_rss_reader.core.entity.feed_post import FeedPost
+from awesome_rss_reader.core.usecase.list_feed_posts import (
+    ListFeedPostsOutput,
+    ListFeedPostsUseCase,
+)
+from awesome_rss_reader.core.usecase.list_user_feeds import (
+    ListUserFeedsOutput,
+    ListUserFollowedFeedsUseCase,
+)
+from awesome_rss_reader.fastapi.api.schemas import ApiFeed, ApiFeedPost
+from benchmarks.timing import Timings, measure
+from tests.factories import FeedFactory, FeedPostFactory
+
+PAGE_SIZE = 100
+ROUNDS = 500
+
+
+@pytest.fixture()
+def posts() -> list[FeedPost]:
+    return FeedPostFactory.batch(PAGE_SIZE)
+
+
+@pytest.fixture()
+def feeds() -> list[Feed]:
+    return FeedFactory.batch(PAGE_SIZE)
+
+
+@pytest.fixture()
+def _list_posts_uc(container: Container, posts: list[FeedPost]) -> Iterator[None]:
+    uc = mock.Mock(spec=ListFeedPostsUseCase)
+    uc.execute.return_value = ListFeedPostsOutput(posts=posts)
+
+    with container.use_cases.list_feed_posts.override(uc):
+        yield
+
+
+@pytest.fixture()
+def _list_feeds_uc(container: Container, feeds: list[Feed]) -> Iterator[None]:
+    uc = mock.Mock(spec=ListUserFollowedFeedsUseCase)
+    uc.execute.return_value = ListUserFeedsOutput(feeds=feeds)
+
+    with container.use_cases.list_followed_feeds.override(uc):
+        yield
+
+
+@pytest.fixture()
+def _legacy_routes(fastapi_app: FastAPI, posts: list[FeedPost], feeds: list[Feed]) -> None:
+    """
+    Register routes that serialize the entities the way the list endpoints used to:
+    by validating them against the api schema and then letting fastapi serialize the response model.
+    """
+
+    @fastapi_app.get("/legacy/posts", response_model=list[ApiFeedPost])
+    async def legacy_list_posts() -> list[ApiFeedPost]:
+        return [ApiFeedPost.model_validate(post) for post in posts]
+
+    @fastapi_app.get("/legacy/feeds", response_model=list[ApiFeed])
+    async def legacy_list_feeds() -> list[ApiFeed]:
+        return [ApiFeed.model_validate(feed) for feed in feeds]
+
+
+@pytest.mark.usefixtures("_list_posts_uc", "_legacy_routes")
+def test_list_posts_page(user_api_client: TestClient, bench_report: list[Timings]) -> None:
+    def legacy() -> None:
+        resp = user_api_client.get("/legacy/posts")
+        assert len(resp.json()) == PAGE_SIZE
+
+    def current() -> None:
+        resp = user_api_client.get("/api/posts", params={"limit": PAGE_SIZE})
+        assert len(resp.json()) == PAGE_SIZE
+
+    bench_report.append(
+        measure("GET /api/posts, 100 items (response model)", legacy, rounds=ROUNDS)
+    )
+    bench_report.append(measure("GET /api/posts, 100 items (direct json)", current, rounds=ROUNDS))
+
+
+@pytest.mark.usefixtures("_list_feeds_uc", "_legacy_routes")
+def test_list_feeds_page(user_api_client: TestClient, bench_report: list[Timings]) -> None:
+    def legacy() -> None:
+        resp = user_api_client.get("/legacy/feeds")
+        assert len(resp.json()) == PAGE_SIZE
+
+    def current() -> None:
+        resp = user_api_client.get("/api/feeds", params={"limit": PAGE_SIZE})
+        assert len(resp.json()) == PAGE_SIZE
+
+    bench_report.append(
+        measure("GET /api/feeds, 100 items (response model)", legacy, rounds=ROUNDS)
+    )
+    bench_report.append(measure("GET /api/feeds, 100 items (direct json)", current, rounds=ROUNDS))
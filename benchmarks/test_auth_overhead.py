@@ -0,0 +1,93 @@
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from jose import jwt
+from starlette.testclient import TestClient
+
+from awesome_rss_reader.application.auth import (
+    JoseTokenDecoder,
+    PyJWTTokenDecoder,
+    TokenDecoder,
+    TokenVerifier,
+)
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.settings import AuthSettings
+from awesome_rss_reader.core.entity.user import User
+from awesome_rss_reader.fastapi.depends.auth import get_current_user
+from benchmarks.timing import Timings, measure
+
+ROUNDS = 2000
+
+
+@pytest.fixture()
+def auth_settings(container: Container) -> Iterator[AuthSettings]:
+    auth_settings = AuthSettings(secret_key=uuid.uuid4().hex)
+
+    with container.settings.auth.override(auth_settings):
+        yield auth_settings
+
+
+@pytest.fixture()
+def token(auth_settings: AuthSettings) -> str:
+    claims = {
+        "sub": str(uuid.uuid4()),
+        "exp": datetime.now(tz=UTC) + timedelta(hours=1),
+    }
+    return jwt.encode(claims, key=auth_settings.secret_key, algorithm=auth_settings.algorithm)
+
+
+@pytest.fixture()
+def _routes(fastapi_app: FastAPI) -> None:
+    @fastapi_app.get("/bench/anonymous")
+    async def anonymous() -> None:
+        ...
+
+    @fastapi_app.get("/bench/authenticated")
+    async def authenticated(user: User = Depends(get_current_user)) -> None:
+        ...
+
+
+@pytest.mark.parametrize("decoder_class", [JoseTokenDecoder, PyJWTTokenDecoder])
+def test_verify_token(
+    auth_settings: AuthSettings,
+    token: str,
+    decoder_class: type[TokenDecoder],
+    bench_report: list[Timings],
+) -> None:
+    decoder = decoder_class()
+    uncached = TokenVerifier(
+        settings=auth_settings.model_copy(update={"token_cache_size": 0}),
+        decoder=decoder,
+    )
+    cached = TokenVerifier(settings=auth_settings, decoder=decoder)
+
+    name = decoder_class.__name__
+    bench_report.append(
+        measure(f"verify token, {name}", lambda: uncached.verify(token), rounds=ROUNDS)
+    )
+    bench_report.append(
+        measure(f"verify token, {name}, cached", lambda: cached.verify(token), rounds=ROUNDS)
+    )
+
+
+@pytest.mark.usefixtures("_routes")
+def test_request_auth_overhead(
+    api_client: TestClient,
+    token: str,
+    bench_report: list[Timings],
+) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def anonymous() -> None:
+        resp = api_client.get("/bench/anonymous")
+        assert resp.status_code == 200
+
+    def authenticated() -> None:
+        resp = api_client.get("/bench/authenticated", headers=headers)
+        assert resp.status_code == 200
+
+    bench_report.append(measure("GET without auth", anonymous, rounds=ROUNDS))
+    bench_report.append(measure("GET with auth (cached token)", authenticated, rounds=ROUNDS))
@@ -0,0 +1,136 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from dependency_injector import providers
+from fastapi import Depends, FastAPI
+from starlette.requests import Request
+from starlette.testclient import TestClient
+from structlog.stdlib import BoundLogger
+
+from awesome_rss_reader.application import di
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.user import User
+from awesome_rss_reader.core.usecase.list_feed_posts import ListFeedPostsUseCase
+from awesome_rss_reader.fastapi import entrypoint as api_entrypoint
+from awesome_rss_reader.fastapi.depends.auth import get_current_user
+from awesome_rss_reader.fastapi.depends.di import get_container
+from awesome_rss_reader.fastapi.depends.logging import get_logger
+from benchmarks.timing import Timings, measure
+
+ROUNDS = 2000
+STARTUP_ROUNDS = 50
+RESOLUTIONS = 1000
+
+# the use cases the api serves
+API_USE_CASES = [
+    "create_feed",
+    "list_followed_feeds",
+    "follow_feed",
+    "unfollow_feed",
+    "refresh_feed",
+    "list_feed_posts",
+    "stream_feed_posts",
+    "read_post",
+    "unread_post",
+]
+
+
+def _legacy_get_container(request: Request) -> Container:
+    return request.app.state.container
+
+
+def _legacy_get_logger(request: Request) -> BoundLogger:
+    return request.app.state.logger
+
+
+@pytest.fixture()
+def legacy_list_feed_posts(container: Container) -> providers.Factory:
+    """
+    Build the use case the way it used to be built: anew for every call.
+    """
+    return providers.Factory(
+        ListFeedPostsUseCase,
+        post_repository=container.repositories.feed_posts,
+    )
+
+
+@pytest.fixture()
+def _routes(fastapi_app: FastAPI, legacy_list_feed_posts: providers.Factory) -> None:
+    @fastapi_app.get("/bench/legacy")
+    async def legacy(
+        user: User = Depends(get_current_user),
+        container: Container = Depends(_legacy_get_container),
+        logger: BoundLogger = Depends(_legacy_get_logger),
+    ) -> None:
+        legacy_list_feed_posts()
+
+    @fastapi_app.get("/bench/current")
+    async def current(
+        user: User = Depends(get_current_user),
+        container: Container = Depends(get_container),
+        logger: BoundLogger = Depends(get_logger),
+    ) -> None:
+        container.use_cases.list_feed_posts()
+
+
+def test_startup(bench_report: list[Timings]) -> None:
+    def lazy() -> None:
+        container = di.init()
+        api_entrypoint.init(container)
+
+    def prebuilt() -> None:
+        container = di.init()
+        api_entrypoint.init(container)
+        for name in API_USE_CASES:
+            getattr(container.use_cases, name)()
+
+    bench_report.append(measure("startup", lazy, rounds=STARTUP_ROUNDS))
+    bench_report.append(measure("startup, api use cases prebuilt", prebuilt, rounds=STARTUP_ROUNDS))
+
+
+def test_use_case_resolution(
+    container: Container,
+    legacy_list_feed_posts: providers.Factory,
+    bench_report: list[Timings],
+) -> None:
+    def repeat(func: Callable[[], Any]) -> Callable[[], None]:
+        # a single call is too fast to be timed on its own
+        def repeated() -> None:
+            for _ in range(RESOLUTIONS):
+                func()
+
+        return repeated
+
+    bench_report.append(
+        measure(
+            f"list_feed_posts x{RESOLUTIONS}, factory",
+            repeat(legacy_list_feed_posts),
+            rounds=ROUNDS // 10,
+        )
+    )
+    bench_report.append(
+        measure(
+            f"list_feed_posts x{RESOLUTIONS}, singleton",
+            repeat(container.use_cases.list_feed_posts),
+            rounds=ROUNDS // 10,
+        )
+    )
+
+
+@pytest.mark.usefixtures("_routes")
+def test_request_di_overhead(user_api_client: TestClient, bench_report: list[Timings]) -> None:
+    def legacy() -> None:
+        resp = user_api_client.get("/bench/legacy")
+        assert resp.status_code == 200
+
+    def current() -> None:
+        resp = user_api_client.get("/bench/current")
+        assert resp.status_code == 200
+
+    bench_report.append(
+        measure("GET, sync dependencies and factory use case", legacy, rounds=ROUNDS)
+    )
+    bench_report.append(
+        measure("GET, async dependencies and singleton use case", current, rounds=ROUNDS)
+    )
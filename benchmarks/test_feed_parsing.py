@@ -0,0 +1,228 @@
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from typing import Literal
+
+import dateutil.parser
+import feedparser
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.application.settings import ApplicationSettings
+from awesome_rss_reader.core.entity.feed_post import FeedPost, NewFeedPost
+from awesome_rss_reader.data.external.dates import parse_published_at
+from awesome_rss_reader.data.external.feed_content import ExternalFeedContentRepository
+from awesome_rss_reader.data.external.parsers import init_feed_content_parser
+from awesome_rss_reader.data.postgres import models as mdl
+from benchmarks.feed_server import BASE_PUBLISHED_AT, FeedFormat, render_feed
+from benchmarks.timing import Throughput, Timings, measure
+from tests.factories import NewFeedFactory
+from tests.pytest_fixtures.types import InsertFeedPostsFixtureT, InsertFeedsFixtureT
+
+CORPUS_DIR = Path(__file__).parents[1] / "tests" / "corpus"
+# the edge case samples in the subdirectories are for the tests only
+CORPUS_FILES = sorted(path for path in CORPUS_DIR.iterdir() if path.is_file())
+ROUNDS = 200
+
+
+@pytest.fixture(params=CORPUS_FILES, ids=lambda path: path.name)
+def feed_sample(request: pytest.FixtureRequest) -> tuple[str, bytes]:
+    path: Path = request.param
+    return path.name, path.read_bytes()
+
+
+@pytest.fixture()
+def repo() -> ExternalFeedContentRepository:
+    return ExternalFeedContentRepository()
+
+
+@pytest.fixture()
+def new_posts(
+    feed_sample: tuple[str, bytes],
+    repo: ExternalFeedContentRepository,
+) -> list[NewFeedPost]:
+    name, content = feed_sample
+    result = repo._parse_feed_contents(url=name, content=BytesIO(content))
+    return [
+        NewFeedPost(
+            feed_id=1,
+            title=item.title,
+            summary=item.summary,
+            url=str(item.url),
+            guid=item.guid,
+            published_at=item.published_at,
+        )
+        for item in result.items
+    ]
+
+
+def test_parse_feed_contents(
+    repo: ExternalFeedContentRepository,
+    feed_sample: tuple[str, bytes],
+    bench_report: list[Timings],
+) -> None:
+    name, content = feed_sample
+
+    def parse() -> None:
+        repo._parse_feed_contents(url=name, content=BytesIO(content))
+
+    bench_report.append(measure(f"parse feed contents, {name}", parse, rounds=ROUNDS))
+
+
+@pytest.mark.parametrize("engine", ["feedparser", "expat", "lxml"])
+def test_parser_engine_throughput(
+    engine: Literal["feedparser", "expat", "lxml"], throughput_report: list[Throughput]
+) -> None:
+    if engine == "lxml":
+        pytest.importorskip("lxml")
+    settings = ApplicationSettings(feed_parser_engine=engine)
+    repo = ExternalFeedContentRepository(parser=init_feed_content_parser(settings))
+    samples = [(path.name, path.read_bytes()) for path in CORPUS_FILES]
+
+    latencies = Timings(name=f"feed latency, {engine}")
+    posts = 0
+    wall_started_at = time.perf_counter()
+    cpu_started_at = time.process_time()
+    for _ in range(ROUNDS // 10):
+        for name, content in samples:
+            started_at = time.perf_counter()
+            result = repo._parse_feed_contents(url=name, content=BytesIO(content))
+            latencies.samples.append(time.perf_counter() - started_at)
+            posts += len(result.items)
+    wall_s = time.perf_counter() - wall_started_at
+    cpu_s = time.process_time() - cpu_started_at
+
+    throughput_report.append(
+        Throughput(
+            name=f"parse corpus feeds, {engine}",
+            feeds=latencies.rounds,
+            posts=posts,
+            wall_s=wall_s,
+            cpu_s=cpu_s,
+            feed_latencies=latencies,
+        )
+    )
+
+
+@pytest.mark.parametrize("feed_format", ["rss", "atom"])
+def test_parse_feed_contents_with_few_new_posts(
+    repo: ExternalFeedContentRepository,
+    feed_format: FeedFormat,
+    bench_report: list[Timings],
+) -> None:
+    items = 200
+    content = render_feed(1, feed_format=feed_format, items=items, item_summary="summary " * 250)
+    # only the latest 2 posts are new
+    published_since = BASE_PUBLISHED_AT + timedelta(minutes=items - 2)
+
+    def parse(stop_after_outdated: int) -> Callable[[], None]:
+        def parse_feed() -> None:
+            result = repo._parse_feed_contents(
+                url="https://example.com",
+                content=BytesIO(content),
+                ignore_before=published_since,
+                stop_after_outdated=stop_after_outdated,
+            )
+            assert len(result.items) == 2
+
+        return parse_feed
+
+    name = f"{len(content) // 1024}kb {feed_format} feed, 2/{items} posts new"
+    bench_report.append(measure(f"parse {name}", parse(0), rounds=ROUNDS // 10))
+    bench_report.append(measure(f"parse {name}, stop after 20", parse(20), rounds=ROUNDS // 10))
+
+
+def test_parse_feed_posts(
+    repo: ExternalFeedContentRepository,
+    feed_sample: tuple[str, bytes],
+    bench_report: list[Timings],
+) -> None:
+    name, content = feed_sample
+    # only the conversion of the already parsed entries to the result items is measured
+    entries = feedparser.parse(BytesIO(content))["entries"]
+    assert entries
+
+    def parse() -> None:
+        for entry in entries:
+            repo._parse_feed_post(entry)
+
+    bench_report.append(measure(f"parse feed posts, {name}", parse, rounds=ROUNDS))
+
+
+def test_parse_published_at(
+    feed_sample: tuple[str, bytes],
+    bench_report: list[Timings],
+) -> None:
+    name, content = feed_sample
+    entries = feedparser.parse(BytesIO(content))["entries"]
+    published = [(entry["published"], entry["published_parsed"]) for entry in entries]
+
+    def parse_dateutil() -> None:
+        for value, _ in published:
+            dateutil.parser.parse(value)
+
+    def parse_struct_time() -> None:
+        for value, parsed in published:
+            parse_published_at(value, parsed)
+
+    def parse_string() -> None:
+        for value, _ in published:
+            parse_published_at(value)
+
+    bench_report.append(measure(f"parse dates, dateutil, {name}", parse_dateutil, rounds=ROUNDS))
+    bench_report.append(
+        measure(f"parse dates, struct_time, {name}", parse_struct_time, rounds=ROUNDS)
+    )
+    bench_report.append(
+        measure(f"parse dates, rfc822/iso8601, {name}", parse_string, rounds=ROUNDS)
+    )
+
+
+def test_new_feed_post_construction(
+    repo: ExternalFeedContentRepository,
+    feed_sample: tuple[str, bytes],
+    bench_report: list[Timings],
+) -> None:
+    name, content = feed_sample
+    items = repo._parse_feed_contents(url=name, content=BytesIO(content)).items
+
+    # the same conversion the feed update use case does before saving the posts
+    def construct() -> None:
+        for item in items:
+            NewFeedPost(
+                feed_id=1,
+                title=item.title,
+                summary=item.summary,
+                url=str(item.url),
+                guid=item.guid,
+                published_at=item.published_at,
+            )
+
+    bench_report.append(measure(f"construct new feed posts, {name}", construct, rounds=ROUNDS))
+
+
+async def test_feed_post_row_hydration(
+    postgres_database: AsyncEngine,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    feed_sample: tuple[str, bytes],
+    new_posts: list[NewFeedPost],
+    bench_report: list[Timings],
+) -> None:
+    name, _ = feed_sample
+    (feed,) = await insert_feeds(NewFeedFactory.build())
+    await insert_feed_posts(*[post.model_copy(update={"feed_id": feed.id}) for post in new_posts])
+
+    async with postgres_database.connect() as conn:
+        result = await conn.execute(sa.select(*mdl.FEED_POST_COLUMNS))
+        rows = result.mappings().all()
+
+    # the same hydration the post repository does for the fetched rows
+    def hydrate() -> None:
+        for row in rows:
+            FeedPost.model_validate(dict(row))
+
+    bench_report.append(measure(f"hydrate feed post rows, {name}", hydrate, rounds=ROUNDS))
@@ -0,0 +1,95 @@
+import itertools
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.data.postgres import models as mdl
+from awesome_rss_reader.data.postgres.repositories.feed_posts import PostgresFeedPostRepository
+from benchmarks.timing import Timings, ameasure
+from tests.factories import NewFeedFactory, NewFeedPostFactory, faker
+from tests.pytest_fixtures.types import InsertFeedsFixtureT
+
+# the same number of posts a feed update saves at a time for a typical feed
+POSTS = 50
+ROUNDS = 50
+
+
+@pytest.fixture(
+    # a typical summary, the most of a summary the search vector is built of, and way past that
+    params=[0, 500, mdl.FEED_POST_SEARCH_SUMMARY_CHARS, 20 * mdl.FEED_POST_SEARCH_SUMMARY_CHARS],
+    ids=lambda chars: f"summary {chars} chars",
+)
+def summary(request: pytest.FixtureRequest) -> str:
+    chars: int = request.param
+    text = faker.paragraph(nb_sentences=20)
+    return (text * (chars // len(text) + 1))[:chars]
+
+
+@pytest.fixture()
+def repo(postgres_database: AsyncEngine) -> PostgresFeedPostRepository:
+    return PostgresFeedPostRepository(db=postgres_database)
+
+
+async def test_create_many(
+    repo: PostgresFeedPostRepository,
+    insert_feeds: InsertFeedsFixtureT,
+    summary: str,
+    bench_report: list[Timings],
+) -> None:
+    """
+    Measure saving the new posts of a feed, search vector and its index included,
+    the same benchmark run before the search vector was there tells how much it costs.
+    """
+    (feed,) = await insert_feeds(NewFeedFactory.build())
+    guids = itertools.count()
+
+    async def create_many() -> None:
+        posts = [
+            NewFeedPostFactory.build(feed_id=feed.id, guid=f"post-{next(guids)}", summary=summary)
+            for _ in range(POSTS)
+        ]
+        await repo.create_many(posts)
+
+    bench_report.append(
+        await ameasure(
+            f"create_many x{POSTS}, summary {len(summary)} chars",
+            create_many,
+            rounds=ROUNDS,
+            warmup=5,
+        )
+    )
+
+
+async def test_search_vector(
+    postgres_database: AsyncEngine,
+    summary: str,
+    bench_report: list[Timings],
+) -> None:
+    """
+    Measure building the search vectors of the posts alone, without saving them anywhere,
+    which is the part of the ingest cost that grows with the size of the summaries.
+    """
+    posts = NewFeedPostFactory.batch(POSTS, summary=summary)
+    new_posts = sa.values(
+        sa.column("title", sa.Text),
+        sa.column("summary", sa.Text),
+        name="new_post",
+    ).data([(post.title, post.summary) for post in posts])
+    vectors_q = sa.select(
+        sa.func.sum(sa.func.length(sa.literal_column(mdl.FEED_POST_SEARCH_VECTOR)))
+    ).select_from(new_posts)
+
+    async with postgres_database.connect() as conn:
+
+        async def build_vectors() -> None:
+            await conn.execute(vectors_q)
+
+        bench_report.append(
+            await ameasure(
+                f"search vector x{POSTS}, summary {len(summary)} chars",
+                build_vectors,
+                rounds=ROUNDS,
+                warmup=5,
+            )
+        )
@@ -0,0 +1,111 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from pydantic import PostgresDsn
+from sqlalchemy import URL
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.core.entity.feed import FeedFiltering, FeedUpdates
+from awesome_rss_reader.data.postgres.database import PostgresSettings, init_async_engine
+from awesome_rss_reader.data.postgres.repositories.atomic import PostgresAtomicProvider
+from awesome_rss_reader.data.postgres.repositories.feeds import PostgresFeedRepository
+from benchmarks.timing import Timings, ameasure
+from tests.factories import NewFeedFactory
+from tests.pytest_fixtures.types import InsertFeedsFixtureT
+
+# as many clients as the worker saves feeds at a time, and as many as its pool takes
+CLIENTS = 15
+ROUNDS = 50
+
+
+@pytest.fixture(params=["pooled", "transaction pooling", "transaction pooling, pgbouncer"])
+def mode(request: pytest.FixtureRequest) -> str:
+    """
+    The engine set up for a direct connection, the same engine set up for a transaction pooler
+    but connecting directly, which tells the cost of the setup alone,
+    and the one connecting through the pgbouncer of the development stack.
+    """
+    return request.param
+
+
+@pytest_asyncio.fixture()
+async def engine(
+    request: pytest.FixtureRequest,
+    mode: str,
+    db_dsn: URL,
+    db: AsyncEngine,
+) -> AsyncIterator[AsyncEngine]:
+    dsn = request.getfixturevalue("pgbouncer_dsn") if mode.endswith("pgbouncer") else db_dsn
+    settings = PostgresSettings(
+        dsn=PostgresDsn(dsn.render_as_string(hide_password=False)),
+        pool_role="worker",
+        transaction_pooling=mode.startswith("transaction pooling"),
+        # the listener is not used here, it only has to be there behind a transaction pooler
+        listener_dsn=PostgresDsn(db_dsn.render_as_string(hide_password=False)),
+    )
+    engine = init_async_engine(settings)
+    yield engine
+    await engine.dispose()
+
+
+async def test_reads(
+    engine: AsyncEngine,
+    mode: str,
+    insert_feeds: InsertFeedsFixtureT,
+    bench_report: list[Timings],
+) -> None:
+    """
+    Measure the concurrent reads, every one of them costing a connection and a statement
+    to prepare once the connections are not pooled and the statements are not cached.
+    """
+    feeds = await insert_feeds(*NewFeedFactory.batch(CLIENTS))
+    repo = PostgresFeedRepository(db=engine)
+
+    async def read_feed(feed_id: int) -> None:
+        await repo.get_list(filter_by=FeedFiltering(feed_ids=[feed_id]), limit=1, offset=0)
+
+    async def read_feeds() -> None:
+        await asyncio.gather(*[read_feed(feed.id) for feed in feeds])
+
+    bench_report.append(
+        await ameasure(
+            f"reads x{CLIENTS} clients, {mode}",
+            read_feeds,
+            rounds=ROUNDS,
+            warmup=5,
+        )
+    )
+
+
+async def test_transactions(
+    engine: AsyncEngine,
+    mode: str,
+    insert_feeds: InsertFeedsFixtureT,
+    bench_report: list[Timings],
+) -> None:
+    """
+    Measure the concurrent transactions, each of them reading and updating a feed the way
+    the worker saves one.
+    """
+    feeds = await insert_feeds(*NewFeedFactory.batch(CLIENTS))
+    atomic = PostgresAtomicProvider(db=engine)
+    repo = PostgresFeedRepository(db=engine)
+
+    async def update_feed(feed_id: int) -> None:
+        async with atomic.transaction():
+            feed = await repo.get_by_id(feed_id)
+            await repo.update(feed_id=feed_id, updates=FeedUpdates(title=feed.title))
+
+    async def update_feeds() -> None:
+        await asyncio.gather(*[update_feed(feed.id) for feed in feeds])
+
+    bench_report.append(
+        await ameasure(
+            f"transactions x{CLIENTS} clients, {mode}",
+            update_feeds,
+            rounds=ROUNDS,
+            warmup=5,
+        )
+    )
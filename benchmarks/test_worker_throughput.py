@@ -0,0 +1,110 @@
+import math
+import time
+from collections.abc import Iterator
+from datetime import timedelta
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+from structlog.testing import capture_logs
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.feed_refresh_job import FeedRefreshJobState, NewFeedRefreshJob
+from awesome_rss_reader.core.usecase.update_feed_content import (
+    UpdateFeedContentInput,
+    UpdateFeedContentUseCase,
+)
+from awesome_rss_reader.data.postgres import models as mdl
+from awesome_rss_reader.utils.dtime import now_aware
+from benchmarks.feed_server import FeedServerSettings, SyntheticFeedServer
+from benchmarks.timing import Throughput, Timings
+from tests.factories import NewFeedFactory
+from tests.pytest_fixtures.types import (
+    FetchOneFixtureT,
+    InsertFeedsFixtureT,
+    InsertRefreshJobsFixtureT,
+)
+
+# the same number of jobs the worker processes at a time by default
+BATCH_SIZE = 50
+
+
+@pytest.fixture()
+def feed_server() -> Iterator[SyntheticFeedServer]:
+    server = SyntheticFeedServer(FeedServerSettings())
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def uc(container: Container, postgres_database: AsyncEngine) -> UpdateFeedContentUseCase:
+    return container.use_cases.update_feed_content()
+
+
+async def test_worker_throughput(
+    uc: UpdateFeedContentUseCase,
+    feed_server: SyntheticFeedServer,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_refresh_jobs: InsertRefreshJobsFixtureT,
+    fetchone: FetchOneFixtureT,
+    throughput_report: list[Throughput],
+) -> None:
+    server_settings = feed_server.feed_app.settings
+
+    feeds = await insert_feeds(
+        *[
+            NewFeedFactory.build(url=feed_server.get_feed_url(number), published_at=None)
+            for number in range(server_settings.feeds)
+        ]
+    )
+    await insert_refresh_jobs(
+        *[
+            NewFeedRefreshJob(
+                feed_id=feed.id,
+                state=FeedRefreshJobState.pending,
+                execute_after=now_aware() - timedelta(seconds=1),
+                retries=0,
+            )
+            for feed in feeds
+        ]
+    )
+
+    # the per feed timings are collected from the logs,
+    # capturing them is cheaper than rendering them, so it does not skew the measurements
+    with capture_logs() as logs:
+        wall_started_at = time.perf_counter()
+        cpu_started_at = time.process_time()
+        # every job is picked once, the failed ones are retried minutes later
+        for _ in range(math.ceil(server_settings.feeds / BATCH_SIZE)):
+            await uc.execute(UpdateFeedContentInput(batch_size=BATCH_SIZE))
+        wall_s = time.perf_counter() - wall_started_at
+        cpu_s = time.process_time() - cpu_started_at
+
+    feed_latencies = Timings(
+        name="feed latency",
+        samples=[
+            log["download_s"] + log["parse_s"] + log["persist_s"]
+            for log in logs
+            if "persist_s" in log and log["download_s"] is not None
+        ],
+    )
+    posts = await fetchone(sa.select(sa.func.count().label("count")).select_from(mdl.FeedPost))
+
+    assert feed_latencies.rounds > 0
+    assert posts["count"] > 0
+
+    responses = feed_server.feed_app.responses
+    throughput_report.append(
+        Throughput(
+            name=(
+                f"worker, {server_settings.feeds} feeds x {server_settings.items_per_feed} items, "
+                f"{responses[500]} errors"
+            ),
+            feeds=server_settings.feeds,
+            posts=posts["count"],
+            wall_s=wall_s,
+            cpu_s=cpu_s,
+            feed_latencies=feed_latencies,
+        )
+    )
@@ -0,0 +1,93 @@
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Timings:
+    name: str
+    samples: list[float] = field(default_factory=list)
+
+    @property
+    def rounds(self) -> int:
+        return len(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def percentile(self, pct: int) -> float:
+        # statistics.quantiles needs at least two samples
+        if len(self.samples) < 2:
+            return self.samples[0]
+        return statistics.quantiles(self.samples, n=100, method="inclusive")[pct - 1]
+
+
+@dataclass
+class Throughput:
+    name: str
+    feeds: int
+    posts: int
+    wall_s: float
+    cpu_s: float
+    feed_latencies: Timings
+
+    @property
+    def feeds_per_s(self) -> float:
+        return self.feeds / self.wall_s
+
+    @property
+    def posts_per_s(self) -> float:
+        return self.posts / self.wall_s
+
+    @property
+    def cpu_per_feed(self) -> float:
+        return self.cpu_s / self.feeds
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    *,
+    rounds: int,
+    warmup: int = 10,
+) -> Timings:
+    for _ in range(warmup):
+        func()
+
+    timings = Timings(name=name)
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        func()
+        timings.samples.append(time.perf_counter() - started_at)
+
+    return timings
+
+
+async def ameasure(
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    *,
+    rounds: int,
+    warmup: int = 10,
+) -> Timings:
+    for _ in range(warmup):
+        await func()
+
+    timings = Timings(name=name)
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await func()
+        timings.samples.append(time.perf_counter() - started_at)
+
+    return timings
@@ -1,4 +1,6 @@
 import asyncio
+import os
+import socket
 from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
 
@@ -14,6 +16,7 @@ from sqlalchemy_utils import create_database, database_exists, drop_database
 from awesome_rss_reader.application import di
 from awesome_rss_reader.application.di import Container
 from awesome_rss_reader.data.postgres.database import PostgresSettings
+from awesome_rss_reader.data.postgres.instrumentation import instrument_engine
 from awesome_rss_reader.data.postgres.models import metadata
 from awesome_rss_reader.fastapi import entrypoint as api_entrypoint
 
@@ -42,6 +45,20 @@ def db_dsn(db_settings: PostgresSettings) -> URL:
     return actual_dsn.set(database=f"{actual_dsn.database}_test")
 
 
+@pytest.fixture(scope="session")
+def pgbouncer_dsn(db_dsn: URL) -> URL:
+    """
+    Connect to the test database through the pgbouncer of the development stack,
+    the tests that need it are skipped unless it's running.
+    """
+    port = int(os.environ.get("PGBOUNCER_PORT", "6432"))
+    try:
+        socket.create_connection((db_dsn.host or "localhost", port), timeout=1).close()
+    except OSError:
+        pytest.skip(f"pgbouncer is not listening on port {port}")
+    return db_dsn.set(port=port)
+
+
 @pytest.fixture(scope="session")
 def _setup_db(db_dsn: URL) -> None:
     sync_dsn = db_dsn.set(drivername="postgresql+psycopg")
@@ -60,8 +77,13 @@ def _setup_db(db_dsn: URL) -> None:
 
 
 @pytest_asyncio.fixture(scope="session")
-async def db_engine(_setup_db: None, db_dsn: URL) -> Iterator[AsyncEngine]:
+async def db_engine(
+    _setup_db: None,
+    db_dsn: URL,
+    db_settings: PostgresSettings,
+) -> Iterator[AsyncEngine]:
     engine = create_async_engine(db_dsn, poolclass=NullPool)
+    instrument_engine(engine.sync_engine, slow_statement_s=db_settings.slow_statement_s)
 
     async with engine.begin() as conn:
         logger.info("creating tables in the test database", dsn=db_dsn)
@@ -99,6 +121,16 @@ def container() -> Container:
     return di.init()
 
 
+@pytest.fixture(autouse=True)
+def _reset_use_cases(container: Container) -> Iterator[None]:
+    """
+    Use cases are singletons,
+    so the instances built with the overrides of one test must not leak into another.
+    """
+    yield
+    container.use_cases.reset_singletons()
+
+
 @pytest.fixture()
 def postgres_database(container: Container, db: AsyncEngine) -> Iterator[AsyncEngine]:
     with container.database.engine.override(db):
@@ -299,3 +299,43 @@ async def test_list_posts_requires_auth(
     resp = api_client.get("/api/feeds")
     assert resp.status_code == 401
     assert resp.json() == {"detail": "Not authenticated"}
+
+
+async def test_list_posts_not_modified(
+    postgres_database: AsyncEngine,
+    user: User,
+    user_api_client: TestClient,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+) -> None:
+    feed, *_ = await insert_feeds(
+        NewFeedFactory.build(url="https://example.com/feed.xml"),
+    )
+    post, *_ = await insert_feed_posts(
+        NewFeedPostFactory.build(
+            title="The Best High DPI Gaming Mice",
+            feed_id=feed.id,
+        )
+    )
+    params = {"read_status": "unread"}
+
+    resp = user_api_client.get("/api/posts", params=params)
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+    etag = resp.headers["ETag"]
+
+    resp = user_api_client.get("/api/posts", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+
+    # other listings have their own versions
+    resp = user_api_client.get("/api/posts", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+    await insert_user_posts(NewUserPostFactory.build(user_uid=user.uid, post_id=post.id))
+
+    resp = user_api_client.get("/api/posts", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json() == []
+    assert resp.headers["ETag"] != etag
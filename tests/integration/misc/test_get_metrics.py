@@ -0,0 +1,33 @@
+import prometheus_client
+from starlette.testclient import TestClient
+
+
+def _get_request_count(route: str, status: str) -> float:
+    value = prometheus_client.REGISTRY.get_sample_value(
+        "http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status},
+    )
+    return value or 0
+
+
+def test_get_metrics(api_client: TestClient) -> None:
+    requests_before = _get_request_count("/info", "200")
+
+    api_client.get("/info")
+
+    response = api_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds" in response.text
+    assert "feed_fetch_duration_seconds" in response.text
+
+    assert _get_request_count("/info", "200") == requests_before + 1
+
+
+def test_get_metrics_unmatched_route(api_client: TestClient) -> None:
+    requests_before = _get_request_count("unmatched", "404")
+
+    response = api_client.get("/no/such/route")
+    assert response.status_code == 404
+
+    assert _get_request_count("unmatched", "404") == requests_before + 1
@@ -0,0 +1,80 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest_asyncio
+from pydantic import PostgresDsn
+from sqlalchemy import URL
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.core.entity.feed import FeedFiltering
+from awesome_rss_reader.data.postgres.database import PostgresSettings, init_async_engine
+from awesome_rss_reader.data.postgres.repositories.atomic import PostgresAtomicProvider
+from awesome_rss_reader.data.postgres.repositories.feed_posts import PostgresFeedPostRepository
+from awesome_rss_reader.data.postgres.repositories.feeds import PostgresFeedRepository
+from tests.factories import NewFeedFactory, NewFeedPostFactory
+from tests.pytest_fixtures.types import InsertFeedsFixtureT
+
+# many more clients than the server connections pgbouncer of the development stack keeps
+CLIENTS = 50
+
+
+@pytest_asyncio.fixture()
+async def pgbouncer_engine(
+    pgbouncer_dsn: URL, db_dsn: URL, db: AsyncEngine
+) -> AsyncIterator[AsyncEngine]:
+    settings = PostgresSettings(
+        dsn=PostgresDsn(pgbouncer_dsn.render_as_string(hide_password=False)),
+        transaction_pooling=True,
+        # the listener is not used here, it only has to be there behind pgbouncer
+        listener_dsn=PostgresDsn(db_dsn.render_as_string(hide_password=False)),
+    )
+    engine = init_async_engine(settings)
+    yield engine
+    await engine.dispose()
+
+
+async def test_statements_are_run_on_shared_server_connections(
+    pgbouncer_engine: AsyncEngine,
+    insert_feeds: InsertFeedsFixtureT,
+) -> None:
+    feeds = await insert_feeds(*NewFeedFactory.batch(3))
+    repo = PostgresFeedRepository(db=pgbouncer_engine)
+
+    async def get_feeds() -> list[int]:
+        # the same statement, prepared over and over again on whatever server connection is free
+        listed = []
+        for _ in range(5):
+            page = await repo.get_list(
+                filter_by=FeedFiltering(feed_ids=[feed.id for feed in feeds]),
+                limit=10,
+                offset=0,
+            )
+            listed.append(len(page))
+        return listed
+
+    results = await asyncio.gather(*[get_feeds() for _ in range(CLIENTS)])
+
+    assert results == [[3] * 5] * CLIENTS
+
+
+async def test_transactions_are_run_on_shared_server_connections(
+    pgbouncer_engine: AsyncEngine,
+    insert_feeds: InsertFeedsFixtureT,
+) -> None:
+    feeds = await insert_feeds(*NewFeedFactory.batch(CLIENTS))
+    atomic = PostgresAtomicProvider(db=pgbouncer_engine)
+    repo = PostgresFeedPostRepository(db=pgbouncer_engine)
+
+    async def save_posts(feed_id: int) -> int:
+        async with atomic.transaction():
+            posts = await repo.create_many(
+                [
+                    NewFeedPostFactory.build(feed_id=feed_id, guid=f"post-{number}")
+                    for number in range(3)
+                ]
+            )
+        return len(posts)
+
+    results = await asyncio.gather(*[save_posts(feed.id) for feed in feeds])
+
+    assert results == [3] * CLIENTS
@@ -26,6 +26,7 @@ from awesome_rss_reader.data.postgres import models as mdl
 from awesome_rss_reader.utils.dtime import now_aware
 from tests.factories import NewFeedFactory, NewFeedPostFactory
 from tests.pytest_fixtures.types import (
+    AssertMaxQueriesFixtureT,
     FetchManyFixtureT,
     FetchOneFixtureT,
     InsertFeedPostsFixtureT,
@@ -859,6 +860,34 @@ async def test_update_feed_content_outdated_posts_ignored(
     )
 
 
+@pytest.mark.parametrize(
+    "posts",
+    [
+        [POST_GARMIN],
+        [POST_GARMIN, POST_MIMIMI, POST_GOOGLE, POST_DOLBY],
+    ],
+)
+async def test_update_feed_content_queries_do_not_depend_on_post_count(
+    uc: UpdateFeedContentUseCase,
+    wrap_rss_content: Callable,
+    rss_feed_server: ContentServer,
+    feed_pending_job: FeedRefreshJob,
+    assert_max_queries: AssertMaxQueriesFixtureT,
+    posts: list[str],
+) -> None:
+    rss_feed_server.serve_content(
+        wrap_rss_content(channel_title="Tweakers", content="".join(posts)),
+        200,
+        headers={"Content-Type": "text/xml; charset=UTF-8"},
+    )
+
+    uc_input = UpdateFeedContentInput(batch_size=10)
+    # the batch takes a few queries to pick the jobs and their feeds,
+    # then every feed takes a few more to complete its job and save its posts at once
+    with assert_max_queries(10):
+        await uc.execute(uc_input)
+
+
 async def test_update_feed_content_no_feed_no_jobs(uc: UpdateFeedContentUseCase) -> None:
     uc_input = UpdateFeedContentInput(batch_size=50)
     # no exception
@@ -1,10 +1,21 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
+import pytest
 import pytest_asyncio
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from .types import FetchManyFixtureT, FetchOneFixtureT, InsertManyFixtureT, InsertOneFixtureT
+from awesome_rss_reader.data.postgres.instrumentation import QueryCounter, count_queries
+
+from .types import (
+    AssertMaxQueriesFixtureT,
+    FetchManyFixtureT,
+    FetchOneFixtureT,
+    InsertManyFixtureT,
+    InsertOneFixtureT,
+)
 
 
 @pytest_asyncio.fixture()
@@ -45,3 +56,23 @@ async def insert_many(db: AsyncEngine) -> InsertManyFixtureT:
             return [dict(row) for row in result.mappings().fetchall()]
 
     return inserter
+
+
+@pytest.fixture()
+def assert_max_queries() -> AssertMaxQueriesFixtureT:
+    """
+    Fail if the code in the block executes more statements than expected,
+    so a repository doing a query per item does not go unnoticed.
+    """
+
+    @contextmanager
+    def asserter(max_count: int) -> Iterator[QueryCounter]:
+        with count_queries(keep_statements=True) as queries:
+            yield queries
+
+        statements = "\n".join(queries.statements or [])
+        assert (
+            queries.count <= max_count
+        ), f"expected at most {max_count} queries, {queries.count} executed:\n{statements}"
+
+    return asserter
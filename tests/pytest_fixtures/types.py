@@ -1,4 +1,5 @@
 from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager
 from typing import Any, TypeAlias
 
 import sqlalchemy as sa
@@ -9,12 +10,14 @@ from awesome_rss_reader.core.entity.feed_post import FeedPost, NewFeedPost
 from awesome_rss_reader.core.entity.feed_refresh_job import FeedRefreshJob, NewFeedRefreshJob
 from awesome_rss_reader.core.entity.user_feed import NewUserFeed, UserFeed
 from awesome_rss_reader.core.entity.user_post import NewUserPost, UserPost
+from awesome_rss_reader.data.postgres.instrumentation import QueryCounter
 
 # fmt: off
 FetchOneFixtureT: TypeAlias = Callable[[sa.Select], Awaitable[dict[str, Any]]]
 FetchManyFixtureT: TypeAlias = Callable[[sa.Select], Awaitable[list[dict[str, Any]]]]
 InsertOneFixtureT: TypeAlias = Callable[[sa.Insert], Awaitable[dict[str, Any]]]
 InsertManyFixtureT: TypeAlias = Callable[[sa.Insert], Awaitable[list[dict[str, Any]]]]
+AssertMaxQueriesFixtureT: TypeAlias = Callable[[int], AbstractContextManager[QueryCounter]]
 
 InsertFeedsFixtureT: TypeAlias = Callable[[VarArg(NewFeed)], Awaitable[list[Feed]]]
 InsertUserFeedsFixtureT: TypeAlias = Callable[[VarArg(NewUserFeed)], Awaitable[list[UserFeed]]]
@@ -0,0 +1,124 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest import mock
+
+import pytest
+from jose import jwt
+
+from awesome_rss_reader.application.auth import (
+    JoseTokenDecoder,
+    PyJWTTokenDecoder,
+    TokenDecoder,
+    TokenVerificationError,
+    TokenVerifier,
+)
+from awesome_rss_reader.application.settings import AuthSettings
+from awesome_rss_reader.core.entity.user import User
+
+
+@pytest.fixture()
+def auth_settings() -> AuthSettings:
+    return AuthSettings(secret_key="secret", token_cache_size=2, token_cache_ttl_s=60)
+
+
+@pytest.fixture()
+def decoder() -> mock.Mock:
+    return mock.Mock(wraps=JoseTokenDecoder())
+
+
+@pytest.fixture()
+def verifier(auth_settings: AuthSettings, decoder: mock.Mock) -> TokenVerifier:
+    return TokenVerifier(settings=auth_settings, decoder=decoder)
+
+
+def _make_token(
+    *, key: str = "secret", expires_in: timedelta = timedelta(hours=1), **claims: Any
+) -> str:
+    claims.setdefault("sub", str(uuid.uuid4()))
+    claims["exp"] = datetime.now(tz=UTC) + expires_in
+    return jwt.encode(claims, key=key, algorithm="HS256")
+
+
+@pytest.mark.parametrize("decoder_class", [JoseTokenDecoder, PyJWTTokenDecoder])
+def test_decoders(decoder_class: type[TokenDecoder]) -> None:
+    decoder = decoder_class()
+    user_uid = str(uuid.uuid4())
+
+    claims = decoder.decode(_make_token(sub=user_uid), key="secret", algorithm="HS256")
+    assert claims["sub"] == user_uid
+
+    with pytest.raises(TokenVerificationError):
+        decoder.decode(_make_token(key="other secret"), key="secret", algorithm="HS256")
+
+    with pytest.raises(TokenVerificationError):
+        decoder.decode(
+            _make_token(expires_in=timedelta(seconds=-1)), key="secret", algorithm="HS256"
+        )
+
+    with pytest.raises(TokenVerificationError):
+        decoder.decode("not a token", key="secret", algorithm="HS256")
+
+
+def test_verify_caches_user(verifier: TokenVerifier, decoder: mock.Mock) -> None:
+    user_uid = uuid.uuid4()
+    token = _make_token(sub=str(user_uid))
+
+    assert verifier.verify(token) == User(uid=user_uid)
+    assert verifier.verify(token) == User(uid=user_uid)
+    assert decoder.decode.call_count == 1
+
+
+def test_verify_cache_is_bounded(verifier: TokenVerifier, decoder: mock.Mock) -> None:
+    token1, token2, token3 = _make_token(), _make_token(), _make_token()
+
+    verifier.verify(token1)
+    verifier.verify(token2)
+    # token1 becomes the most recently used one
+    verifier.verify(token1)
+    # and token2 is evicted in favor of token3
+    verifier.verify(token3)
+    assert decoder.decode.call_count == 3
+
+    verifier.verify(token1)
+    verifier.verify(token3)
+    assert decoder.decode.call_count == 3
+
+    verifier.verify(token2)
+    assert decoder.decode.call_count == 4
+
+
+def test_verify_cache_is_capped_at_token_expiry(
+    verifier: TokenVerifier,
+    decoder: mock.Mock,
+) -> None:
+    token = _make_token(expires_in=timedelta(seconds=10))
+
+    monotonic_path = "awesome_rss_reader.application.auth.time.monotonic"
+
+    with mock.patch(monotonic_path, return_value=1000):
+        verifier.verify(token)
+    with mock.patch(monotonic_path, return_value=1009):
+        verifier.verify(token)
+    assert decoder.decode.call_count == 1
+
+    # the cache ttl is not over yet, but the token has expired by now
+    with mock.patch(monotonic_path, return_value=1011):
+        verifier.verify(token)
+    assert decoder.decode.call_count == 2
+
+
+@pytest.mark.parametrize("sub", [None, ""])
+def test_verify_no_subject(verifier: TokenVerifier, sub: str | None) -> None:
+    with pytest.raises(TokenVerificationError):
+        verifier.verify(_make_token(sub=sub))
+
+
+def test_verify_invalid_token_is_not_cached(verifier: TokenVerifier, decoder: mock.Mock) -> None:
+    token = _make_token(key="other secret")
+
+    for _ in range(2):
+        with pytest.raises(TokenVerificationError):
+            verifier.verify(token)
+
+    assert decoder.decode.call_count == 2
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import prometheus_client
+from structlog.testing import capture_logs
+
+from awesome_rss_reader.application.loop_monitor import LoopMonitor
+
+
+def _get_metric_samples() -> dict[str, float]:
+    registry = prometheus_client.REGISTRY
+    samples = {
+        "lag_measurements": registry.get_sample_value("event_loop_lag_seconds_count"),
+        "lag_sum": registry.get_sample_value("event_loop_lag_seconds_sum"),
+        "blocks": registry.get_sample_value("event_loop_blocks_total"),
+    }
+    return {name: value or 0 for name, value in samples.items()}
+
+
+def _block_loop() -> None:
+    time.sleep(0.3)
+
+
+async def test_blocked_loop_is_reported() -> None:
+    metrics_before = _get_metric_samples()
+    monitor = LoopMonitor(interval_s=0.01, block_threshold_s=0.1)
+
+    with capture_logs() as logs:
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            _block_loop()
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+    metrics_after = _get_metric_samples()
+    assert metrics_after["lag_measurements"] > metrics_before["lag_measurements"]
+    # the lag caused by the blocking call is measured
+    assert metrics_after["lag_sum"] - metrics_before["lag_sum"] >= 0.2
+    # the block is reported only once, even though it lasts for a few watchdog checks
+    assert metrics_after["blocks"] - metrics_before["blocks"] == 1
+
+    (blocked_log,) = (log for log in logs if log["event"] == "Event loop is blocked")
+    assert blocked_log["log_level"] == "warning"
+    assert blocked_log["blocked_s"] >= 0.1
+    # the stack shows what the loop is busy with
+    assert "in _block_loop" in blocked_log["stack"]
+
+
+async def test_idle_loop_is_not_reported() -> None:
+    monitor = LoopMonitor(interval_s=0.01, block_threshold_s=0.1)
+
+    with capture_logs() as logs:
+        monitor.start()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await monitor.stop()
+
+    assert [log for log in logs if log["event"] == "Event loop is blocked"] == []
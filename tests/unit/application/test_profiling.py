@@ -0,0 +1,47 @@
+import asyncio
+import pstats
+import time
+from pathlib import Path
+
+from awesome_rss_reader.application.profiling import start_profiling
+from awesome_rss_reader.application.settings import ProfilingSettings
+
+
+def _block_loop() -> None:
+    time.sleep(0.05)
+
+
+async def test_profiling_disabled_by_default() -> None:
+    assert start_profiling(ProfilingSettings(), service_name="test") is None
+    assert not asyncio.get_running_loop().get_debug()
+
+
+async def test_profiles_and_slow_callbacks_are_saved(tmp_path: Path) -> None:
+    settings = ProfilingSettings(
+        output_dir=tmp_path / "profiles",
+        window_s=0.1,
+        interval_s=60,
+        slow_callback_s=0.01,
+    )
+
+    profiler = start_profiling(settings, service_name="test")
+    assert profiler is not None
+    try:
+        asyncio.get_running_loop().call_soon(_block_loop)
+        # let the first profiling window end
+        await asyncio.sleep(0.2)
+    finally:
+        await profiler.stop()
+
+    assert not asyncio.get_running_loop().get_debug()
+
+    (profile_path,) = (tmp_path / "profiles").glob("test-*.prof")
+    stats_profile = pstats.Stats(str(profile_path)).get_stats_profile()
+    assert "_block_loop" in stats_profile.func_profiles
+
+    (summary_path,) = (tmp_path / "profiles").glob("test-*.txt")
+    assert "_block_loop" in summary_path.read_text()
+
+    # the blocking callback is reported by asyncio
+    (slow_callbacks_path,) = (tmp_path / "profiles").glob("test-*-slow-callbacks.log")
+    assert "_block_loop" in slow_callbacks_path.read_text()
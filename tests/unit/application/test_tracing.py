@@ -0,0 +1,172 @@
+import json
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pytest_localserver.http import ContentServer
+from starlette.testclient import TestClient
+
+from awesome_rss_reader.application import tracing
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.settings import TracingSettings
+from awesome_rss_reader.core.entity.feed_content import FeedContentBatchRequest, FeedContentRequest
+from awesome_rss_reader.core.usecase.list_feed_posts import ListFeedPostsInput
+from awesome_rss_reader.data.external.feed_content import ExternalFeedContentRepository
+from awesome_rss_reader.data.postgres.repositories.base import BasePostgresRepository
+from tests.factories import FeedPostFactory
+
+
+@pytest.fixture()
+def span_exporter() -> Iterator[InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    tracing.use_tracer_provider(provider)
+    yield exporter
+    tracing.use_tracer_provider(None)
+
+
+@dataclass
+class _ExampleRepository(BasePostgresRepository):
+    async def get_answer(self) -> int:
+        return 42
+
+    async def _get_private_answer(self) -> int:
+        return 42
+
+
+def test_no_spans_unless_enabled() -> None:
+    assert not tracing.is_enabled()
+
+    with tracing.start_span("noop") as span:
+        assert span is None
+
+
+async def test_repository_calls_are_traced(
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    repo = _ExampleRepository(db=mock.Mock())
+
+    assert await repo.get_answer() == 42
+    assert await repo._get_private_answer() == 42
+
+    # private methods are called by the public ones, they are not traced on their own
+    assert [span.name for span in span_exporter.get_finished_spans()] == [
+        "_ExampleRepository.get_answer",
+    ]
+
+
+async def test_use_case_execution_is_traced(
+    span_exporter: InMemorySpanExporter,
+    container: Container,
+    post_repository: mock.Mock,
+) -> None:
+    post_repository.get_list_version.return_value = "1"
+    post_repository.get_list.return_value = []
+    uc = container.use_cases.list_feed_posts()
+
+    await uc.execute(ListFeedPostsInput(offset=0, limit=10))
+
+    (span,) = span_exporter.get_finished_spans()
+    assert span.name == "ListFeedPostsUseCase.execute"
+
+
+def test_api_request_is_traced(
+    span_exporter: InMemorySpanExporter,
+    user_api_client: TestClient,
+    post_repository: mock.Mock,
+) -> None:
+    post_repository.get_list_version.return_value = "1"
+    post_repository.get_list.return_value = [FeedPostFactory.build()]
+    trace_id = "0af7651916cd43dd8448eb211c80319c"
+
+    resp = user_api_client.get(
+        "/api/posts",
+        headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"},
+    )
+    assert resp.status_code == 200
+
+    uc_span, request_span = span_exporter.get_finished_spans()
+
+    assert request_span.name == "GET /api/posts"
+    assert dict(request_span.attributes or {}) == {
+        "http.request.method": "GET",
+        "url.path": "/api/posts",
+        "http.route": "/api/posts",
+        "http.response.status_code": 200,
+    }
+    # the trace of the caller is continued
+    assert format(request_span.context.trace_id, "032x") == trace_id
+
+    assert uc_span.name == "ListFeedPostsUseCase.execute"
+    assert uc_span.parent == request_span.context
+
+
+async def test_feed_fetches_are_traced(
+    span_exporter: InMemorySpanExporter,
+    create_httpservers: Callable[[int], AbstractContextManager[list[ContentServer]]],
+) -> None:
+    repo = ExternalFeedContentRepository()
+
+    with create_httpservers(2) as (ok_server, failing_server):
+        ok_server.serve_content("<rss><channel><title>Feed</title></channel></rss>")
+        failing_server.serve_content("Internal Server Error", code=500)
+
+        with tracing.start_span("batch"):
+            await repo.fetch_many(
+                FeedContentBatchRequest(
+                    requests=[
+                        FeedContentRequest(
+                            request_id=uuid.uuid4(), url=server.url, published_since=None
+                        )
+                        for server in (ok_server, failing_server)
+                    ],
+                    timeout_s=1,
+                    max_body_size_b=1024,
+                )
+            )
+
+    spans = span_exporter.get_finished_spans()
+    batch_span = next(span for span in spans if span.name == "batch")
+    fetch_spans = {
+        (span.attributes or {})["http.url"]: span for span in spans if span.name == "feed.fetch"
+    }
+    assert set(fetch_spans) == {ok_server.url, failing_server.url}
+    assert all(span.parent == batch_span.context for span in fetch_spans.values())
+
+    ok_span = fetch_spans[ok_server.url]
+    assert ok_span.status.is_ok
+    assert dict(ok_span.attributes or {}) == {
+        "http.url": ok_server.url,
+        "http.response.body.size": len("<rss><channel><title>Feed</title></channel></rss>"),
+    }
+    # failed fetches are marked as such, along with the exception
+    failed_span = fetch_spans[failing_server.url]
+    assert not failed_span.status.is_ok
+    assert [event.name for event in failed_span.events] == ["exception"]
+
+
+def test_file_exporter(tmp_path: Path) -> None:
+    file_path = tmp_path / "traces.jsonl"
+    settings = TracingSettings(exporter="file", file_path=str(file_path))
+
+    provider = tracing.init_tracing(settings, service_name="test")
+    assert provider is not None
+    try:
+        with tracing.start_span("first"), tracing.start_span("second"):
+            ...
+    finally:
+        provider.shutdown()
+        tracing.use_tracer_provider(None)
+
+    spans = [json.loads(line) for line in file_path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["second", "first"]
+    assert {span["resource"]["attributes"]["service.name"] for span in spans} == {"test"}
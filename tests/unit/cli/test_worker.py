@@ -0,0 +1,29 @@
+from unittest import mock
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.cli.worker import update_feed_content
+from awesome_rss_reader.core.usecase.update_feed_content import UpdateFeedContentUseCase
+from awesome_rss_reader.data.postgres.routing import ReplicaRouter
+
+
+async def test_worker_reads_from_primary(container: Container) -> None:
+    primary = create_async_engine("postgresql+asyncpg://primary/db")
+    router = ReplicaRouter(
+        primary=primary, replica=create_async_engine("postgresql+asyncpg://replica/db")
+    )
+    readers: list[AsyncEngine] = []
+
+    async def execute(*_: object) -> None:
+        readers.append(router.get_reader())
+
+    uc_mock = mock.Mock(spec=UpdateFeedContentUseCase)
+    uc_mock.execute.side_effect = execute
+
+    with container.use_cases.update_feed_content.override(uc_mock):
+        await update_feed_content(container, concurrency=10, max_concurrent_saves=5)
+
+    assert readers == [primary]
+    # the reads outside of the worker batch are not affected
+    assert router.get_reader() is not primary
@@ -8,7 +8,10 @@ from awesome_rss_reader.core.repository.atomic import AtomicProvider
 from awesome_rss_reader.core.repository.feed import FeedRepository
 from awesome_rss_reader.core.repository.feed_content import FeedContentRepository
 from awesome_rss_reader.core.repository.feed_post import FeedPostRepository
+from awesome_rss_reader.core.repository.feed_post_event import FeedPostEventRepository
+from awesome_rss_reader.core.repository.feed_post_partition import FeedPostPartitionRepository
 from awesome_rss_reader.core.repository.feed_refresh_job import FeedRefreshJobRepository
+from awesome_rss_reader.core.repository.replication import ReplicationRepository
 from awesome_rss_reader.core.repository.user_feed import UserFeedRepository
 from awesome_rss_reader.core.repository.user_post import UserPostRepository
 
@@ -45,6 +48,30 @@ def post_repository(container: Container) -> Iterator[mock.Mock]:
         yield repo_mock
 
 
+@pytest.fixture()
+def post_event_repository(container: Container) -> Iterator[mock.Mock]:
+    repo_mock = mock.Mock(spec=FeedPostEventRepository)
+
+    with container.repositories.feed_post_events.override(repo_mock):
+        yield repo_mock
+
+
+@pytest.fixture()
+def partition_repository(container: Container) -> Iterator[mock.Mock]:
+    repo_mock = mock.Mock(spec=FeedPostPartitionRepository)
+
+    with container.repositories.feed_post_partitions.override(repo_mock):
+        yield repo_mock
+
+
+@pytest.fixture()
+def replication_repository(container: Container) -> Iterator[mock.Mock]:
+    repo_mock = mock.Mock(spec=ReplicationRepository)
+
+    with container.repositories.replication.override(repo_mock):
+        yield repo_mock
+
+
 @pytest.fixture()
 def user_post_repository(container: Container) -> Iterator[mock.Mock]:
     repo_mock = mock.Mock(spec=UserPostRepository)
@@ -0,0 +1,157 @@
+import gzip
+import os
+import zlib
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+import pytest
+
+from awesome_rss_reader.data.external.body import (
+    FeedBodyError,
+    FeedBodyTooLargeError,
+    read_feed_body,
+)
+
+CONTENT = b"<rss><channel><title>Feed</title></channel></rss>" * 100
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    """a body without content length, that keeps track of how much of it was read"""
+
+    def __init__(self, content: bytes, chunk_size: int = 256) -> None:
+        self.content = content
+        self.chunk_size = chunk_size
+        self.read_b = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for offset in range(0, len(self.content), self.chunk_size):
+            chunk = self.content[offset : offset + self.chunk_size]
+            self.read_b += len(chunk)
+            yield chunk
+
+
+async def _read(
+    response: httpx.Response,
+    *,
+    max_size: int = 1024 * 1024,
+    max_compressed_size: int = 1024 * 1024,
+) -> bytes:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return response
+
+    async with (
+        httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client,
+        client.stream("GET", "https://example.com/feed") as resp,
+    ):
+        body = await read_feed_body(
+            resp, max_size=max_size, max_compressed_size=max_compressed_size
+        )
+        return body.getvalue()
+
+
+@pytest.mark.parametrize(
+    "encoding,compress",
+    [
+        ("", lambda content: content),
+        ("identity", lambda content: content),
+        ("gzip", gzip.compress),
+        ("x-gzip", gzip.compress),
+        ("deflate", zlib.compress),
+        # raw deflate streams without the zlib header
+        ("deflate", lambda content: zlib.compress(content, wbits=-zlib.MAX_WBITS)),
+    ],
+)
+async def test_body_is_decompressed(encoding: str, compress: Callable[[bytes], bytes]) -> None:
+    response = httpx.Response(
+        200,
+        headers={"Content-Encoding": encoding},
+        stream=_ChunkedStream(compress(CONTENT)),
+    )
+
+    assert await _read(response, max_size=len(CONTENT)) == CONTENT
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip, deflate"])
+async def test_unsupported_encodings_are_rejected(encoding: str) -> None:
+    response = httpx.Response(
+        200, headers={"Content-Encoding": encoding}, stream=_ChunkedStream(CONTENT)
+    )
+
+    with pytest.raises(FeedBodyError):
+        await _read(response)
+
+
+async def test_corrupt_body_is_rejected() -> None:
+    response = httpx.Response(
+        200, headers={"Content-Encoding": "gzip"}, stream=_ChunkedStream(CONTENT)
+    )
+
+    with pytest.raises(FeedBodyError):
+        await _read(response)
+
+
+async def test_compressed_body_exceeding_content_length_limit_is_not_downloaded() -> None:
+    stream = _ChunkedStream(gzip.compress(CONTENT))
+    response = httpx.Response(
+        200,
+        headers={"Content-Encoding": "gzip", "Content-Length": str(len(stream.content))},
+        stream=stream,
+    )
+
+    with pytest.raises(FeedBodyTooLargeError):
+        await _read(response, max_compressed_size=len(stream.content) - 1)
+
+    assert stream.read_b == 0
+
+
+async def test_identity_body_exceeding_size_limit_is_not_downloaded() -> None:
+    stream = _ChunkedStream(CONTENT)
+    response = httpx.Response(200, headers={"Content-Length": str(len(CONTENT))}, stream=stream)
+
+    with pytest.raises(FeedBodyTooLargeError):
+        await _read(response, max_size=len(CONTENT) - 1)
+
+    assert stream.read_b == 0
+
+
+@pytest.mark.parametrize("content_length", [True, False])
+async def test_identity_body_is_not_held_to_compressed_size_limit(content_length: bool) -> None:
+    headers = {"Content-Length": str(len(CONTENT))} if content_length else {}
+    response = httpx.Response(200, headers=headers, stream=_ChunkedStream(CONTENT))
+
+    content = await _read(response, max_size=len(CONTENT), max_compressed_size=len(CONTENT) // 2)
+
+    assert content == CONTENT
+
+
+async def test_download_stops_at_compressed_size_limit() -> None:
+    # random data does not compress, so it does not take much of it to reach the limit
+    stream = _ChunkedStream(gzip.compress(os.urandom(4096)))
+    response = httpx.Response(200, headers={"Content-Encoding": "gzip"}, stream=stream)
+
+    with pytest.raises(FeedBodyTooLargeError):
+        await _read(response, max_compressed_size=1024)
+
+    assert stream.read_b <= 1024 + stream.chunk_size
+
+
+async def test_identity_download_stops_at_size_limit() -> None:
+    stream = _ChunkedStream(CONTENT)
+    response = httpx.Response(200, stream=stream)
+
+    with pytest.raises(FeedBodyTooLargeError):
+        await _read(response, max_size=1024)
+
+    assert stream.read_b <= 1024 + stream.chunk_size
+
+
+async def test_decompression_stops_at_size_limit() -> None:
+    # a small compressed body that decompresses to a lot of data
+    stream = _ChunkedStream(gzip.compress(b"\x00" * 64 * 1024 * 1024), chunk_size=4096)
+    response = httpx.Response(200, headers={"Content-Encoding": "gzip"}, stream=stream)
+
+    with pytest.raises(FeedBodyTooLargeError):
+        await _read(response, max_size=1024)
+
+    # the first chunk is enough to tell the body is too large
+    assert stream.read_b == stream.chunk_size
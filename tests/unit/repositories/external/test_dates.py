@@ -0,0 +1,92 @@
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from awesome_rss_reader.data.external import dates
+from awesome_rss_reader.data.external.dates import parse_published_at
+
+
+@pytest.fixture()
+def fuzzy_parse() -> Iterator[mock.Mock]:
+    dates._parse_fuzzy.cache_clear()
+    with mock.patch("dateutil.parser.parse", wraps=dates.dateutil.parser.parse) as parse:
+        yield parse
+    dates._parse_fuzzy.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("Wed, 30 Aug 2023 12:29:25 GMT", datetime(2023, 8, 30, 12, 29, 25, tzinfo=UTC)),
+        (
+            "Wed, 30 Aug 2023 12:29:25 +0200",
+            datetime(2023, 8, 30, 12, 29, 25, tzinfo=timezone(timedelta(hours=2))),
+        ),
+        ("30 Aug 2023 12:29 +0000", datetime(2023, 8, 30, 12, 29, tzinfo=UTC)),
+        ("2023-08-30T12:29:25Z", datetime(2023, 8, 30, 12, 29, 25, tzinfo=UTC)),
+        (
+            " 2023-08-30T12:29:25.123-04:00 ",
+            datetime(2023, 8, 30, 12, 29, 25, 123000, tzinfo=timezone(timedelta(hours=-4))),
+        ),
+    ],
+)
+def test_rfc822_and_iso8601_dates_are_parsed_without_dateutil(
+    fuzzy_parse: mock.Mock,
+    value: str,
+    expected: datetime,
+) -> None:
+    published_at = parse_published_at(value)
+
+    assert published_at == expected
+    assert published_at.utcoffset() == expected.utcoffset()
+    fuzzy_parse.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Wed, 30 Aug 2023 12:29:25 +0200",
+        "Wed, 30 Aug 2023 06:29:25 EDT",
+        "2023-08-30T12:29:25+02:00",
+        "2023-08-30T10:29:25Z",
+    ],
+)
+def test_date_parsed_by_feedparser_is_used(fuzzy_parse: mock.Mock, value: str) -> None:
+    parsed = time.struct_time((2023, 8, 30, 10, 29, 25, 2, 242, 0))
+
+    with mock.patch("awesome_rss_reader.data.external.dates.datetime", wraps=datetime) as dt:
+        published_at = parse_published_at(value, parsed)
+
+    assert published_at == datetime(2023, 8, 30, 10, 29, 25, tzinfo=UTC)
+    # the struct time is taken as it is, the value is not parsed again
+    dt.fromisoformat.assert_not_called()
+    fuzzy_parse.assert_not_called()
+
+
+def test_other_dates_are_parsed_with_dateutil_once(fuzzy_parse: mock.Mock) -> None:
+    for _ in range(3):
+        published_at = parse_published_at("Wednesday, August 30th 2023 12:29:25 UTC")
+        assert published_at == datetime(2023, 8, 30, 12, 29, 25, tzinfo=UTC)
+
+    fuzzy_parse.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "value", ["Aug 2023 06:59:00", "2023-08-30T12:29:25", "2023-08-30", "Aug 30 2023 12:29 PM"]
+)
+def test_dates_without_timezone_are_left_naive(fuzzy_parse: mock.Mock, value: str) -> None:
+    # feedparser takes them for UTC ones
+    parsed = time.struct_time((2023, 8, 30, 12, 29, 25, 2, 242, 0))
+
+    # such dates are rejected by the post validation later on
+    assert parse_published_at(value).tzinfo is None
+    assert parse_published_at(value, parsed).tzinfo is None
+
+
+@pytest.mark.parametrize("value", [None, "", "   ", "not a date", "99999999999999999999"])
+def test_invalid_dates_are_rejected(fuzzy_parse: mock.Mock, value: str | None) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        parse_published_at(value)
@@ -0,0 +1,141 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from io import BytesIO
+
+import pytest
+
+from awesome_rss_reader.data.external.feed_content import ExternalFeedContentRepository
+from awesome_rss_reader.data.external.outdated import cut_outdated_items
+
+LATEST_PUBLISHED_AT = datetime(2023, 9, 1, tzinfo=UTC)
+
+
+def _rss(items: list[datetime], *, title_first: bool = True) -> BytesIO:
+    title = "<title>Example Feed</title>"
+    items_xml = "".join(
+        f"""
+        <item>
+          <title>Post {number}</title>
+          <link>https://example.com/posts/{number}</link>
+          <guid isPermaLink="false">post-{number}</guid>
+          <pubDate>{format_datetime(published_at)}</pubDate>
+        </item>"""
+        for number, published_at in enumerate(items)
+    )
+    return BytesIO(
+        f"""<?xml version="1.0" encoding="utf-8"?>
+        <rss version="2.0">
+          <channel>
+            {title if title_first else ""}
+            <link>https://example.com</link>{items_xml}
+            {"" if title_first else title}
+          </channel>
+        </rss>""".encode()
+    )
+
+
+def _atom(items: list[datetime]) -> BytesIO:
+    entries = "".join(
+        f"""
+        <entry>
+          <title>Post {number}</title>
+          <link href="https://example.com/posts/{number}"/>
+          <id>post-{number}</id>
+          <updated>{published_at.isoformat()}</updated>
+          <published>{published_at.isoformat()}</published>
+        </entry>"""
+        for number, published_at in enumerate(items)
+    )
+    return BytesIO(
+        f"""<?xml version="1.0" encoding="utf-8"?>
+        <feed xmlns="http://www.w3.org/2005/Atom">
+          <title>Example Feed</title>
+          <id>urn:example</id>{entries}
+        </feed>""".encode()
+    )
+
+
+def _newest_first(count: int) -> list[datetime]:
+    return [LATEST_PUBLISHED_AT - timedelta(hours=hours) for hours in range(count)]
+
+
+@pytest.mark.parametrize("render", [_rss, _atom])
+def test_outdated_items_are_cut_off(render: Callable[[list[datetime]], BytesIO]) -> None:
+    repo = ExternalFeedContentRepository()
+    content = render(_newest_first(30))
+    # the first 3 posts are new
+    published_since = LATEST_PUBLISHED_AT - timedelta(hours=2)
+
+    shortened = cut_outdated_items(content, published_since=published_since, stop_after=5)
+
+    assert shortened is not None
+    full_result = repo._parse_feed_contents(
+        url="https://example.com",
+        content=BytesIO(content.getvalue()),
+        ignore_before=published_since,
+    )
+    shortened_result = repo._parse_feed_contents(
+        url="https://example.com",
+        content=shortened,
+        ignore_before=published_since,
+    )
+    assert shortened_result == full_result
+    assert [item.guid for item in shortened_result.items] == ["post-2", "post-1", "post-0"]
+    # the new posts and the 5 outdated posts that stopped the scan
+    assert shortened.getvalue().count(b"<title>Post") == 8
+
+
+def test_feed_is_shortened_when_parsed() -> None:
+    repo = ExternalFeedContentRepository()
+    published_since = LATEST_PUBLISHED_AT - timedelta(hours=1)
+
+    result = repo._parse_feed_contents(
+        url="https://example.com",
+        content=_rss(_newest_first(200)),
+        ignore_before=published_since,
+        stop_after_outdated=5,
+    )
+
+    assert [item.guid for item in result.items] == ["post-1", "post-0"]
+
+
+def test_new_items_among_outdated_ones_are_kept() -> None:
+    published_at = _newest_first(30)
+    # a new post among the outdated ones resets the count
+    published_at[3] = LATEST_PUBLISHED_AT
+
+    shortened = cut_outdated_items(
+        _rss(published_at),
+        published_since=LATEST_PUBLISHED_AT - timedelta(hours=1),
+        stop_after=3,
+    )
+
+    assert shortened is not None
+    assert b"<title>Post 3</title>" in shortened.getvalue()
+    assert b"<title>Post 6</title>" in shortened.getvalue()
+    assert b"<title>Post 7</title>" not in shortened.getvalue()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # not enough outdated items
+        _rss(_newest_first(6)),
+        # the channel title follows the items, it would be cut off along with them
+        _rss(_newest_first(30), title_first=False),
+        # malformed documents are left for the parser to deal with
+        BytesIO(b"<rss><channel><title>Example</title><item></channel></rss>"),
+        BytesIO(b"not a feed"),
+        BytesIO(b""),
+        BytesIO(_rss(_newest_first(30)).getvalue().decode().encode("utf-16")),
+    ],
+)
+def test_feed_is_not_cut(content: BytesIO) -> None:
+    shortened = cut_outdated_items(
+        content,
+        published_since=LATEST_PUBLISHED_AT,
+        stop_after=10,
+    )
+
+    assert shortened is None
@@ -0,0 +1,158 @@
+from io import BytesIO
+from pathlib import Path
+from typing import Literal
+from unittest import mock
+
+import pytest
+
+from awesome_rss_reader.application.settings import ApplicationSettings
+from awesome_rss_reader.data.external.feed_content import ExternalFeedContentRepository
+from awesome_rss_reader.data.external.parsers import (
+    ExpatContentParser,
+    FeedContentParser,
+    FeedParseError,
+    FeedparserContentParser,
+    LxmlContentParser,
+    init_feed_content_parser,
+)
+
+CORPUS_DIR = Path(__file__).parents[3] / "corpus"
+
+# the fields of the entries the feed posts are made of
+ENTRY_FIELDS = ["title", "link", "guid", "summary", "published", "published_parsed"]
+
+
+@pytest.fixture()
+def fallback() -> mock.Mock:
+    return mock.Mock(spec=FeedContentParser, wraps=FeedparserContentParser())
+
+
+@pytest.fixture(params=["expat", "lxml"])
+def fast_parser(request: pytest.FixtureRequest, fallback: mock.Mock) -> FeedContentParser:
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+        return LxmlContentParser(fallback=fallback)
+    return ExpatContentParser(fallback=fallback)
+
+
+@pytest.mark.parametrize(
+    "path",
+    sorted(path for path in CORPUS_DIR.rglob("*") if path.is_file()),
+    ids=lambda path: path.name,
+)
+def test_fast_parsers_match_feedparser(
+    fast_parser: FeedContentParser,
+    fallback: mock.Mock,
+    path: Path,
+) -> None:
+    content = path.read_bytes()
+    expected = FeedparserContentParser().parse(BytesIO(content))
+
+    parsed = fast_parser.parse(BytesIO(content))
+
+    fallback.parse.assert_not_called()
+    assert parsed.title == expected.title
+    assert [{key: entry.get(key) for key in ENTRY_FIELDS} for entry in parsed.entries] == [
+        {key: entry.get(key) for key in ENTRY_FIELDS} for entry in expected.entries
+    ]
+
+    # the same holds for the posts the feed content ends up with
+    expected_result = ExternalFeedContentRepository()._parse_feed_contents(
+        url=path.name, content=BytesIO(content)
+    )
+    result = ExternalFeedContentRepository(parser=fast_parser)._parse_feed_contents(
+        url=path.name, content=BytesIO(content)
+    )
+    assert result == expected_result
+    assert result.items
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # rdf feeds
+        b"""<?xml version="1.0"?>
+        <rdf:RDF
+          xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+          xmlns="http://purl.org/rss/1.0/"
+        >
+          <channel rdf:about="https://example.com"><title>Feed</title></channel>
+          <item rdf:about="https://example.com/1"><title>Post</title></item>
+        </rdf:RDF>""",
+        # embedded xhtml
+        b"""<feed xmlns="http://www.w3.org/2005/Atom">
+          <title>Feed</title>
+          <entry>
+            <title>Post</title>
+            <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Text</p></div></content>
+          </entry>
+        </feed>""",
+        # nested titles
+        b"""<rss xmlns:media="http://search.yahoo.com/mrss/"><channel><title>Feed</title>
+          <item><media:group><media:title>Media</media:title></media:group><title>Post</title></item>
+        </channel></rss>""",
+        # base uris
+        b"""<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://example.com/">
+          <title>Feed</title><entry><title>Post</title><link href="/posts/1"/></entry>
+        </feed>""",
+        # doctypes
+        b"""<?xml version="1.0"?>
+        <!DOCTYPE rss PUBLIC "-//Netscape Communications//DTD RSS 0.91//EN"
+          "http://my.netscape.com/publish/formats/rss-0.91.dtd">
+        <rss version="0.91">
+          <channel><title>Feed</title><item><title>Post</title></item></channel>
+        </rss>""",
+        # encodings other than utf-8
+        """<?xml version="1.0" encoding="iso-8859-1"?>
+        <rss><channel><title>Caf\xe9</title></channel></rss>""".encode(
+            "iso-8859-1"
+        ),
+        # several feed titles
+        b"<rss><channel><title>Feed</title><title>Other</title></channel></rss>",
+    ],
+)
+def test_unsupported_feeds_are_left_to_feedparser(
+    fast_parser: FeedContentParser,
+    fallback: mock.Mock,
+    content: bytes,
+) -> None:
+    expected = FeedparserContentParser().parse(BytesIO(content))
+
+    parsed = fast_parser.parse(BytesIO(content))
+
+    fallback.parse.assert_called_once()
+    assert parsed == expected
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"<rss><channel><title>Feed</title><item></channel></rss>",
+        b"<rss><channel><title>Feed &nbsp;</title></channel></rss>",
+        b"not a feed",
+    ],
+)
+def test_malformed_feeds_are_left_to_feedparser(
+    fast_parser: FeedContentParser,
+    fallback: mock.Mock,
+    content: bytes,
+) -> None:
+    with pytest.raises(FeedParseError):
+        fast_parser.parse(BytesIO(content))
+
+    fallback.parse.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "engine,parser_class",
+    [
+        ("feedparser", FeedparserContentParser),
+        ("expat", ExpatContentParser),
+    ],
+)
+def test_init_feed_content_parser(
+    engine: Literal["feedparser", "expat"], parser_class: type[FeedContentParser]
+) -> None:
+    settings = ApplicationSettings(feed_parser_engine=engine)
+
+    assert isinstance(init_feed_content_parser(settings), parser_class)
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+from pydantic import PostgresDsn, ValidationError
+from sqlalchemy import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from awesome_rss_reader.data.postgres.database import (
+    PoolRole,
+    PostgresSettings,
+    init_async_engine,
+    init_async_listener_engine,
+)
+from awesome_rss_reader.data.postgres.instrumentation import InstrumentedAsyncQueuePool
+
+
+@pytest.mark.parametrize(
+    "pool_role, expected_size, expected_max_overflow",
+    [
+        ("api", 5, 5),
+        ("worker", 20, 10),
+        ("scheduler", 2, 2),
+        ("retention", 2, 0),
+    ],
+)
+async def test_engine_is_pooled_per_role(
+    pool_role: PoolRole,
+    expected_size: int,
+    expected_max_overflow: int,
+) -> None:
+    # the engine does not connect to the database until it's used
+    engine = init_async_engine(PostgresSettings(pool_role=pool_role))
+
+    assert isinstance(engine.pool, InstrumentedAsyncQueuePool)
+    assert engine.pool.size() == expected_size
+    assert engine.pool.overflow() == -expected_size
+    assert PostgresSettings(pool_role=pool_role).get_pool_profile().max_connections == (
+        expected_size + expected_max_overflow
+    )
+
+
+async def test_engine_is_not_pooled_behind_transaction_pooler() -> None:
+    settings = PostgresSettings(
+        pool_role="worker",
+        transaction_pooling=True,
+        listener_dsn=PostgresDsn("postgresql+asyncpg://user@pgbouncer-free/db"),
+    )
+
+    with mock.patch(
+        "awesome_rss_reader.data.postgres.database.create_async_engine",
+        wraps=create_async_engine,
+    ) as create_engine_mock:
+        engine = init_async_engine(settings)
+
+    assert isinstance(engine.pool, NullPool)
+    connect_args = create_engine_mock.call_args.kwargs["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    # every statement is prepared under a name of its own
+    get_name = connect_args["prepared_statement_name_func"]
+    assert len({get_name() for _ in range(100)}) == 100
+
+
+def test_listener_is_required_behind_transaction_pooler() -> None:
+    with pytest.raises(ValidationError, match="listener_dsn"):
+        PostgresSettings(transaction_pooling=True)
+
+
+async def test_listener_engine_is_only_there_once_set() -> None:
+    assert init_async_listener_engine(PostgresSettings()) is None
+
+    engine = init_async_listener_engine(
+        PostgresSettings(listener_dsn=PostgresDsn("postgresql+asyncpg://user@pgbouncer-free/db"))
+    )
+
+    assert engine is not None
+    assert isinstance(engine.pool, NullPool)
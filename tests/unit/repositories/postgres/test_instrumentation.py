@@ -0,0 +1,113 @@
+import asyncio
+from unittest import mock
+
+import prometheus_client
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.util import greenlet_spawn
+from structlog.testing import capture_logs
+
+from awesome_rss_reader.data.postgres.instrumentation import (
+    InstrumentedAsyncQueuePool,
+    count_queries,
+    instrument_engine,
+)
+
+
+def _get_statement_count(operation: str) -> float:
+    registry = prometheus_client.REGISTRY
+    labels = {"operation": operation}
+    return registry.get_sample_value("db_statement_duration_seconds_count", labels) or 0
+
+
+@pytest.fixture()
+def engine() -> Engine:
+    # the hooks are the same for any engine, an in-memory one does not need a database server
+    engine = sa.create_engine("sqlite://")
+    instrument_engine(engine, slow_statement_s=60)
+    return engine
+
+
+def test_statements_are_counted(engine: Engine) -> None:
+    selects_before = _get_statement_count("SELECT")
+
+    with count_queries(keep_statements=True) as outer, engine.connect() as conn:
+        conn.execute(sa.text("SELECT 1"))
+        with count_queries() as inner:
+            conn.execute(sa.text("SELECT 2"))
+            conn.execute(sa.text("SELECT 3"))
+
+    # statements are only counted within a counting block
+    with engine.connect() as conn:
+        conn.execute(sa.text("SELECT 4"))
+
+    assert outer.count == 3
+    assert outer.statements == ["SELECT 1", "SELECT 2", "SELECT 3"]
+    assert outer.duration_s > 0
+    assert inner.count == 2
+    assert inner.statements is None
+    assert _get_statement_count("SELECT") - selects_before == 4
+
+
+async def test_statements_of_spawned_tasks_are_counted(engine: Engine) -> None:
+    async def query() -> None:
+        with engine.connect() as conn:
+            conn.execute(sa.text("SELECT 1"))
+
+    with count_queries() as queries:
+        await asyncio.gather(query(), query(), query())
+
+    assert queries.count == 3
+
+
+def test_slow_statements_are_logged() -> None:
+    slow_engine = sa.create_engine("sqlite://")
+    instrument_engine(slow_engine, slow_statement_s=0)
+
+    with slow_engine.begin() as conn:
+        conn.execute(sa.text("CREATE TABLE post (id INTEGER, title TEXT)"))
+        with capture_logs() as logs:
+            conn.execute(
+                sa.text("INSERT INTO post (id, title) VALUES (:id, :title)"),
+                [{"id": 1, "title": "secret"}, {"id": 2, "title": "secret"}],
+            )
+            conn.execute(
+                sa.text("SELECT * FROM post WHERE id IN :ids").bindparams(
+                    sa.bindparam("ids", expanding=True)
+                ),
+                {"ids": list(range(25))},
+            )
+
+    insert_log, select_log = logs
+    assert insert_log["event"] == "Slow statement"
+    assert insert_log["log_level"] == "warning"
+    assert insert_log["statement"] == "INSERT INTO post (id, title) VALUES (?, ?)"
+    # the values are never logged, only their types
+    assert insert_log["parameters"] == {"rows": 2, "first_row": ["int", "str"]}
+    assert select_log["parameters"] == [*(["int"] * 20), "... 5 more"]
+
+
+def _get_pool_samples() -> tuple[float, float]:
+    registry = prometheus_client.REGISTRY
+    return (
+        registry.get_sample_value("db_pool_wait_seconds_count") or 0,
+        registry.get_sample_value("db_pool_timeouts_total") or 0,
+    )
+
+
+async def test_pool_waits_are_timed() -> None:
+    # the pool never makes it to a database, it hands out the connections the creator makes up
+    pool = InstrumentedAsyncQueuePool(mock.Mock, pool_size=1, max_overflow=0, timeout=0.01)
+    waits_before, timeouts_before = _get_pool_samples()
+
+    conn = await greenlet_spawn(pool.connect)
+    with pytest.raises(sa_exc.TimeoutError):
+        await greenlet_spawn(pool.connect)
+    await greenlet_spawn(conn.close)
+    await greenlet_spawn(pool.connect)
+
+    waits, timeouts = _get_pool_samples()
+    assert waits - waits_before == 3
+    assert timeouts - timeouts_before == 1
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest_asyncio
+import sqlalchemy as sa
+from sqlalchemy import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated
+from awesome_rss_reader.data.postgres.repositories.feed_post_events import (
+    PostgresFeedPostEventRepository,
+)
+
+
+@pytest_asyncio.fixture()
+async def repo(db: AsyncEngine) -> PostgresFeedPostEventRepository:
+    repo = PostgresFeedPostEventRepository(db=db)
+    yield repo
+    await repo.close()
+
+
+async def test_publish_and_subscribe(repo: PostgresFeedPostEventRepository) -> None:
+    async with repo.subscribe() as events1, repo.subscribe() as events2:
+        await repo.publish(FeedPostsCreated(feed_id=1, post_ids=[10, 11]))
+        await repo.publish(FeedPostsCreated(feed_id=2, post_ids=[12]))
+
+        for events in (events1, events2):
+            got = [await asyncio.wait_for(anext(events), timeout=5) for _ in range(2)]
+            assert got == [
+                FeedPostsCreated(feed_id=1, post_ids=[10, 11]),
+                FeedPostsCreated(feed_id=2, post_ids=[12]),
+            ]
+
+
+async def test_publish_many_posts(repo: PostgresFeedPostEventRepository) -> None:
+    post_ids = list(range(1_000_000, 1_001_200))
+
+    async with repo.subscribe() as events:
+        await repo.publish(FeedPostsCreated(feed_id=1, post_ids=post_ids))
+
+        # the posts are split up between several notifications
+        got: list[int] = []
+        while len(got) < len(post_ids):
+            event = await asyncio.wait_for(anext(events), timeout=5)
+            assert event.feed_id == 1
+            got.extend(event.post_ids)
+
+    assert got == post_ids
+
+
+async def test_close_ends_subscriptions(repo: PostgresFeedPostEventRepository) -> None:
+    async with repo.subscribe() as events:
+        await repo.close()
+        assert [event async for event in events] == []
+
+
+async def test_terminated_listener_is_given_back_to_pool(db: AsyncEngine, db_dsn: URL) -> None:
+    # one connection for the listener and one for the publisher,
+    # the next listener only gets a connection once the dead one is given back
+    pooled_db = create_async_engine(db_dsn, pool_size=2, max_overflow=0, pool_timeout=5)
+    repo = PostgresFeedPostEventRepository(db=pooled_db)
+
+    try:
+        async with repo.subscribe() as events:
+            async with db.connect() as conn:
+                await conn.execute(
+                    sa.select(sa.func.pg_terminate_backend(sa.column("pid")))
+                    .select_from(sa.table("pg_stat_activity", sa.column("pid"), sa.column("query")))
+                    .where(sa.column("query").like("LISTEN %"))
+                )
+            # the subscription ends along with its connection
+            assert [event async for event in events] == []
+
+        async with repo.subscribe() as events:
+            await repo.publish(FeedPostsCreated(feed_id=1, post_ids=[10]))
+            got = await asyncio.wait_for(anext(events), timeout=5)
+            assert got == FeedPostsCreated(feed_id=1, post_ids=[10])
+    finally:
+        await repo.close()
+        await pooled_db.dispose()
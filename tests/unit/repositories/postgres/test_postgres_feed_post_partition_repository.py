@@ -0,0 +1,190 @@
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import pytest_asyncio
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from awesome_rss_reader.core.entity.feed import Feed
+from awesome_rss_reader.core.entity.feed_post_partition import FeedPostPartition
+from awesome_rss_reader.data.postgres import models as mdl
+from awesome_rss_reader.data.postgres.repositories.feed_post_partitions import (
+    PostgresFeedPostPartitionRepository,
+)
+from awesome_rss_reader.data.postgres.repositories.feed_posts import PostgresFeedPostRepository
+from tests.factories import NewFeedFactory, NewFeedPostFactory, NewUserPostFactory
+from tests.pytest_fixtures.types import (
+    FetchManyFixtureT,
+    InsertFeedPostsFixtureT,
+    InsertFeedsFixtureT,
+    InsertUserPostsFixtureT,
+)
+
+SEPTEMBER = FeedPostPartition(
+    name="feed_post_y2023m09",
+    starts_at=datetime(2023, 9, 1, tzinfo=UTC),
+    ends_at=datetime(2023, 10, 1, tzinfo=UTC),
+)
+OCTOBER = FeedPostPartition(
+    name="feed_post_y2023m10",
+    starts_at=datetime(2023, 10, 1, tzinfo=UTC),
+    ends_at=datetime(2023, 11, 1, tzinfo=UTC),
+)
+
+
+@pytest_asyncio.fixture()
+async def repo(db: AsyncEngine) -> Iterator[PostgresFeedPostPartitionRepository]:
+    repo = PostgresFeedPostPartitionRepository(db=db)
+
+    yield repo
+
+    # the test database starts off with the default partition alone
+    async with db.begin() as conn:
+        for partition in (SEPTEMBER, OCTOBER):
+            await conn.execute(sa.text(f"DROP TABLE IF EXISTS {partition.name}"))
+
+
+@pytest_asyncio.fixture()
+async def feed(insert_feeds: InsertFeedsFixtureT) -> Feed:
+    feed, *_ = await insert_feeds(NewFeedFactory.build())
+    return feed
+
+
+async def _count_posts(fetchmany: FetchManyFixtureT, table_name: str) -> int:
+    (row,) = await fetchmany(sa.select(sa.func.count()).select_from(sa.table(table_name)))
+    return row["count"]
+
+
+async def test_create(
+    repo: PostgresFeedPostPartitionRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+    feed: Feed,
+) -> None:
+    await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 9, 1, tzinfo=UTC)),
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 10, 1, tzinfo=UTC)),
+    )
+    assert await repo.get_list() == []
+
+    partition = await repo.create(starts_at=SEPTEMBER.starts_at, ends_at=SEPTEMBER.ends_at)
+
+    assert partition == SEPTEMBER
+    assert await repo.get_list() == [SEPTEMBER]
+    # the post of the month is moved out of the default partition
+    assert await _count_posts(fetchmany, SEPTEMBER.name) == 1
+    assert await _count_posts(fetchmany, mdl.FEED_POST_DEFAULT_PARTITION) == 1
+    assert await _count_posts(fetchmany, mdl.FeedPost.name) == 2
+
+    # the new posts of the month go to the partition
+    await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 9, 30, tzinfo=UTC)),
+    )
+    assert await _count_posts(fetchmany, SEPTEMBER.name) == 2
+
+
+async def test_get_list_is_sorted(repo: PostgresFeedPostPartitionRepository) -> None:
+    await repo.create(starts_at=OCTOBER.starts_at, ends_at=OCTOBER.ends_at)
+    await repo.create(starts_at=SEPTEMBER.starts_at, ends_at=SEPTEMBER.ends_at)
+
+    assert await repo.get_list() == [SEPTEMBER, OCTOBER]
+
+
+async def test_drop(
+    repo: PostgresFeedPostPartitionRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+    feed: Feed,
+) -> None:
+    await repo.create(starts_at=SEPTEMBER.starts_at, ends_at=SEPTEMBER.ends_at)
+    await repo.create(starts_at=OCTOBER.starts_at, ends_at=OCTOBER.ends_at)
+    september_post, october_post = await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 9, 1, tzinfo=UTC)),
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 10, 1, tzinfo=UTC)),
+    )
+    await insert_user_posts(
+        NewUserPostFactory.build(post_id=september_post.id),
+        NewUserPostFactory.build(post_id=october_post.id),
+    )
+
+    await repo.drop(SEPTEMBER)
+
+    assert await repo.get_list() == [OCTOBER]
+    post_rows = await fetchmany(sa.select(mdl.FeedPost.c.id))
+    assert [row["id"] for row in post_rows] == [october_post.id]
+    # the read marks of the dropped posts are gone along with them
+    user_post_rows = await fetchmany(sa.select(mdl.UserPost.c.post_id))
+    assert [row["post_id"] for row in user_post_rows] == [october_post.id]
+
+
+async def test_detach(
+    repo: PostgresFeedPostPartitionRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+    feed: Feed,
+) -> None:
+    await repo.create(starts_at=SEPTEMBER.starts_at, ends_at=SEPTEMBER.ends_at)
+    await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 9, 1, tzinfo=UTC)),
+    )
+
+    await repo.detach(SEPTEMBER)
+
+    assert await repo.get_list() == []
+    assert await _count_posts(fetchmany, mdl.FeedPost.name) == 0
+    # the posts are kept in the detached table to be archived
+    assert await _count_posts(fetchmany, SEPTEMBER.name) == 1
+
+
+async def test_delete_published_before(
+    repo: PostgresFeedPostPartitionRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+    feed: Feed,
+) -> None:
+    old_post, new_post = await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2005, 1, 1, tzinfo=UTC)),
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 9, 1, tzinfo=UTC)),
+    )
+    await insert_user_posts(NewUserPostFactory.build(post_id=old_post.id))
+
+    deleted = await repo.delete_published_before(datetime(2023, 1, 1, tzinfo=UTC))
+
+    assert deleted == 1
+    post_rows = await fetchmany(sa.select(mdl.FeedPost.c.id))
+    assert [row["id"] for row in post_rows] == [new_post.id]
+    assert await fetchmany(sa.select(mdl.UserPost)) == []
+
+
+async def test_post_list_version_changes_once_posts_are_removed(
+    db: AsyncEngine,
+    repo: PostgresFeedPostPartitionRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    feed: Feed,
+) -> None:
+    post_repo = PostgresFeedPostRepository(db=db)
+    await repo.create(starts_at=SEPTEMBER.starts_at, ends_at=SEPTEMBER.ends_at)
+    await repo.create(starts_at=OCTOBER.starts_at, ends_at=OCTOBER.ends_at)
+    # the latest post is kept, so the id boundaries alone would not tell the others are gone
+    await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2005, 1, 1, tzinfo=UTC)),
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 9, 1, tzinfo=UTC)),
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 10, 1, tzinfo=UTC)),
+        NewFeedPostFactory.build(feed_id=feed.id, published_at=datetime(2023, 12, 1, tzinfo=UTC)),
+    )
+    versions = [await post_repo.get_list_version()]
+
+    assert await repo.delete_published_before(datetime(2023, 1, 1, tzinfo=UTC)) == 1
+    versions.append(await post_repo.get_list_version())
+    # nothing deleted, nothing changed
+    assert await repo.delete_published_before(datetime(2023, 1, 1, tzinfo=UTC)) == 0
+    assert await post_repo.get_list_version() == versions[-1]
+
+    await repo.drop(SEPTEMBER)
+    versions.append(await post_repo.get_list_version())
+    await repo.detach(OCTOBER)
+    versions.append(await post_repo.get_list_version())
+
+    assert len(set(versions)) == len(versions)
@@ -1,3 +1,4 @@
+import functools
 import uuid
 from collections.abc import Callable
 from datetime import timedelta
@@ -9,7 +10,11 @@ import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from awesome_rss_reader.core.entity.feed import Feed
-from awesome_rss_reader.core.entity.feed_post import FeedPostFiltering, FeedPostOrdering
+from awesome_rss_reader.core.entity.feed_post import (
+    FeedPostFiltering,
+    FeedPostOrdering,
+    FeedPostSearchCursor,
+)
 from awesome_rss_reader.core.repository.feed_post import FeedPostNotFoundError
 from awesome_rss_reader.data.postgres import models as mdl
 from awesome_rss_reader.data.postgres.repositories.feed_posts import PostgresFeedPostRepository
@@ -517,3 +522,265 @@ async def test_create_many(
     assert new_db_row2["feed_id"] == feed.id
     assert new_db_row2["guid"] == "https://www.makeuseof.com/wellness-practices-for-standing-desk-users/"  # noqa: E501
     # fmt: on
+
+
+async def test_create_many_skips_republished_posts(
+    repo: PostgresFeedPostRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+    feed: Feed,
+) -> None:
+    (existing_post,) = await insert_feed_posts(
+        NewFeedPostFactory.build(feed_id=feed.id, guid="post-1"),
+    )
+
+    # the posts republished at a different time may end up in different partitions
+    created_posts = await repo.create_many(
+        [
+            NewFeedPostFactory.build(
+                feed_id=feed.id,
+                guid="post-1",
+                published_at=existing_post.published_at - timedelta(days=90),
+            ),
+            NewFeedPostFactory.build(feed_id=feed.id, guid="post-2"),
+            NewFeedPostFactory.build(
+                feed_id=feed.id,
+                guid="post-2",
+                published_at=existing_post.published_at + timedelta(days=1),
+            ),
+        ]
+    )
+    assert [post.guid for post in created_posts] == ["post-2"]
+
+    db_rows = await fetchmany(sa.select(mdl.FeedPost).order_by(mdl.FeedPost.c.guid))
+    assert [row["guid"] for row in db_rows] == ["post-1", "post-2"]
+
+
+async def test_create_many_trims_posts_beyond_cap(
+    repo: PostgresFeedPostRepository,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+) -> None:
+    now = now_aware()
+    feed, other_feed = await insert_feeds(*NewFeedFactory.batch(2))
+    old_posts = await insert_feed_posts(
+        *(
+            NewFeedPostFactory.build(
+                feed_id=some_feed.id,
+                guid=f"{some_feed.id}-{days}",
+                published_at=now - timedelta(days=days),
+            )
+            for some_feed in (feed, other_feed)
+            for days in (10, 20)
+        )
+    )
+    await insert_user_posts(
+        *(NewUserPostFactory.build(user_uid=uuid.uuid4(), post_id=post.id) for post in old_posts)
+    )
+
+    created_posts = await repo.create_many(
+        [
+            NewFeedPostFactory.build(
+                feed_id=feed.id, guid=f"{feed.id}-1", published_at=now - timedelta(days=1)
+            ),
+            # the new post older than the cap lets in is trimmed along with the old ones
+            NewFeedPostFactory.build(
+                feed_id=feed.id, guid=f"{feed.id}-30", published_at=now - timedelta(days=30)
+            ),
+        ],
+        max_posts_per_feed=2,
+    )
+    assert [post.guid for post in created_posts] == [f"{feed.id}-1"]
+
+    # the posts of the other feed are left alone, however many there are
+    post_rows = await fetchmany(sa.select(mdl.FeedPost))
+    assert sorted(row["guid"] for row in post_rows) == sorted(
+        [f"{feed.id}-1", f"{feed.id}-10", f"{other_feed.id}-10", f"{other_feed.id}-20"]
+    )
+    user_post_rows = await fetchmany(sa.select(mdl.UserPost))
+    assert sorted(row["post_id"] for row in user_post_rows) == sorted(
+        post.id for post in old_posts if post.guid != f"{feed.id}-20"
+    )
+
+
+async def test_delete_outdated(
+    repo: PostgresFeedPostRepository,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+    fetchmany: FetchManyFixtureT,
+) -> None:
+    now = now_aware()
+    feed1, feed2, other_feed = await insert_feeds(*NewFeedFactory.batch(3))
+    posts = await insert_feed_posts(
+        *(
+            NewFeedPostFactory.build(
+                feed_id=feed.id, guid=f"{feed.id}-{days}", published_at=now - timedelta(days=days)
+            )
+            for feed in (feed1, feed2, other_feed)
+            for days in (1, 10, 20, 30)
+        )
+    )
+    user_uid = uuid.uuid4()
+    await insert_user_posts(
+        *(NewUserPostFactory.build(user_uid=user_uid, post_id=post.id) for post in posts)
+    )
+
+    delete_outdated = functools.partial(
+        repo.delete_outdated,
+        feed_ids=[feed1.id, feed2.id],
+        published_before=now - timedelta(days=5),
+        keep_latest=2,
+    )
+    # the posts of the two feeds older than 5 days beyond their latest 2 ones
+    # are the 20 and 30 days old ones
+    assert await delete_outdated(limit=3) == 3
+    assert await delete_outdated(limit=3) == 1
+    assert await delete_outdated(limit=3) == 0
+
+    post_rows = await fetchmany(sa.select(mdl.FeedPost))
+    assert sorted(row["guid"] for row in post_rows) == sorted(
+        [f"{feed.id}-{days}" for feed in (feed1, feed2) for days in (1, 10)]
+        + [f"{other_feed.id}-{days}" for days in (1, 10, 20, 30)]
+    )
+    # the read marks are gone along with their posts
+    user_post_rows = await fetchmany(sa.select(mdl.UserPost))
+    assert sorted(row["post_id"] for row in user_post_rows) == sorted(
+        row["id"] for row in post_rows
+    )
+
+
+async def test_search(
+    repo: PostgresFeedPostRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+    feed: Feed,
+) -> None:
+    now = now_aware()
+    title_match, summary_match, older_summary_match, _ = await insert_feed_posts(
+        NewFeedPostFactory.build(
+            feed_id=feed.id, title="Python 3.12 released", summary=None, published_at=now
+        ),
+        NewFeedPostFactory.build(
+            feed_id=feed.id,
+            title="Release notes",
+            summary="What's new in Python",
+            published_at=now - timedelta(days=1),
+        ),
+        NewFeedPostFactory.build(
+            feed_id=feed.id,
+            title="Release notes",
+            summary="What's new in Python",
+            published_at=now - timedelta(days=2),
+        ),
+        NewFeedPostFactory.build(
+            feed_id=feed.id, title="Rust 1.72 released", summary="Rust", published_at=now
+        ),
+    )
+
+    # the title matches rank higher, the equally ranked ones go the latest first
+    hits = await repo.search(query="pythons", limit=10)
+    assert [hit.post.id for hit in hits] == [
+        title_match.id,
+        summary_match.id,
+        older_summary_match.id,
+    ]
+    assert hits[0].rank > hits[1].rank == hits[2].rank
+    assert hits[0].post == title_match
+
+    # the pages continue right after the last hit of the previous one
+    first_page = await repo.search(query="python", limit=2)
+    second_page = await repo.search(
+        query="python",
+        after=FeedPostSearchCursor(
+            rank=first_page[-1].rank,
+            published_at=first_page[-1].post.published_at,
+            id=first_page[-1].post.id,
+        ),
+        limit=2,
+    )
+    assert [hit.post.id for hit in first_page + second_page] == [hit.post.id for hit in hits]
+
+    # the web search syntax is understood, and the filters apply the same way as to the listing
+    assert [hit.post.id for hit in await repo.search(query="python -notes", limit=10)] == [
+        title_match.id
+    ]
+    user_uid = uuid.uuid4()
+    await insert_user_posts(NewUserPostFactory.build(user_uid=user_uid, post_id=title_match.id))
+    unread_hits = await repo.search(
+        query="python", filter_by=FeedPostFiltering(not_read_by=user_uid), limit=10
+    )
+    assert [hit.post.id for hit in unread_hits] == [summary_match.id, older_summary_match.id]
+    assert await repo.search(query="golang", limit=10) == []
+
+
+async def test_get_list_version(
+    repo: PostgresFeedPostRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    insert_user_feeds: InsertUserFeedsFixtureT,
+    insert_user_posts: InsertUserPostsFixtureT,
+    feed: Feed,
+) -> None:
+    user = UserFactory.build()
+    other_user = UserFactory.build()
+
+    follow_filter = FeedPostFiltering(followed_by=user.uid)
+    read_filter = FeedPostFiltering(not_read_by=user.uid)
+
+    empty_version = await repo.get_list_version()
+    assert empty_version == await repo.get_list_version()
+
+    post, *_ = await insert_feed_posts(*NewFeedPostFactory.batch(3, feed_id=feed.id))
+    posts_version = await repo.get_list_version()
+    assert posts_version != empty_version
+
+    follow_version = await repo.get_list_version(filter_by=follow_filter)
+    read_version = await repo.get_list_version(filter_by=read_filter)
+
+    # other users' activity does not affect the version
+    await insert_user_feeds(NewUserFeedFactory.build(user_uid=other_user.uid, feed_id=feed.id))
+    await insert_user_posts(NewUserPostFactory.build(user_uid=other_user.uid, post_id=post.id))
+    assert await repo.get_list_version(filter_by=follow_filter) == follow_version
+    assert await repo.get_list_version(filter_by=read_filter) == read_version
+
+    await insert_user_feeds(NewUserFeedFactory.build(user_uid=user.uid, feed_id=feed.id))
+    assert await repo.get_list_version(filter_by=follow_filter) != follow_version
+    assert await repo.get_list_version(filter_by=read_filter) == read_version
+
+    await insert_user_posts(NewUserPostFactory.build(user_uid=user.uid, post_id=post.id))
+    assert await repo.get_list_version(filter_by=read_filter) != read_version
+    # reading posts does not affect the listings not filtered by read status
+    assert await repo.get_list_version() == posts_version
+
+
+async def test_get_list_version_changes_on_delete_outdated(
+    repo: PostgresFeedPostRepository,
+    insert_feed_posts: InsertFeedPostsFixtureT,
+    feed: Feed,
+) -> None:
+    now = now_aware()
+    # the outdated post is neither the first nor the last one inserted
+    await insert_feed_posts(
+        *(
+            NewFeedPostFactory.build(feed_id=feed.id, published_at=now - timedelta(days=days))
+            for days in (1, 30, 2)
+        )
+    )
+    delete_outdated = functools.partial(
+        repo.delete_outdated,
+        feed_ids=[feed.id],
+        published_before=now - timedelta(days=5),
+        keep_latest=1,
+        limit=10,
+    )
+
+    posts_version = await repo.get_list_version()
+    assert await delete_outdated() == 1
+    deleted_version = await repo.get_list_version()
+    assert deleted_version != posts_version
+
+    # nothing deleted, nothing changed
+    assert await delete_outdated() == 0
+    assert await repo.get_list_version() == deleted_version
@@ -6,12 +6,13 @@ import pytest_asyncio
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from awesome_rss_reader.core.entity.feed import FeedFiltering, FeedOrdering, NewFeed
+from awesome_rss_reader.core.entity.feed import FeedFiltering, FeedOrdering, FeedUpdates, NewFeed
 from awesome_rss_reader.core.entity.user_feed import NewUserFeed
 from awesome_rss_reader.core.repository.feed import FeedNotFoundError
 from awesome_rss_reader.data.postgres import models as mdl
 from awesome_rss_reader.data.postgres.repositories.feeds import PostgresFeedRepository
-from tests.factories import NewFeedFactory, UserFactory
+from awesome_rss_reader.utils.dtime import now_aware
+from tests.factories import NewFeedFactory, NewUserFeedFactory, UserFactory
 from tests.pytest_fixtures.types import (
     FetchOneFixtureT,
     InsertFeedsFixtureT,
@@ -386,3 +387,75 @@ async def test_get_list_by_ids(
         offset=0,
     )
     assert no_feeds == []
+
+
+async def test_get_list_after_id(
+    repo: PostgresFeedRepository,
+    insert_feeds: InsertFeedsFixtureT,
+) -> None:
+    feed1, feed2, feed3 = await insert_feeds(*NewFeedFactory.batch(3))
+
+    feeds = await repo.get_list(
+        filter_by=FeedFiltering(id_after=feed1.id),
+        order_by=FeedOrdering.id_asc,
+        limit=10,
+        offset=0,
+    )
+    assert [f.id for f in feeds] == [feed2.id, feed3.id]
+
+    no_feeds = await repo.get_list(
+        filter_by=FeedFiltering(id_after=feed3.id),
+        order_by=FeedOrdering.id_asc,
+        limit=10,
+        offset=0,
+    )
+    assert no_feeds == []
+
+
+async def test_get_list_version(
+    repo: PostgresFeedRepository,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_user_feeds: InsertUserFeedsFixtureT,
+) -> None:
+    user_uid = uuid.uuid4()
+    filter_by = FeedFiltering(followed_by=user_uid)
+
+    feed1, feed2 = await insert_feeds(*NewFeedFactory.batch(2))
+    await insert_user_feeds(NewUserFeedFactory.build(user_uid=user_uid, feed_id=feed1.id))
+
+    version = await repo.get_list_version(filter_by=filter_by)
+    assert version == await repo.get_list_version(filter_by=filter_by)
+
+    # the feed is not followed by the user
+    await repo.update(feed_id=feed2.id, updates=FeedUpdates(published_at=now_aware()))
+    assert await repo.get_list_version(filter_by=filter_by) == version
+
+    await repo.update(feed_id=feed1.id, updates=FeedUpdates(published_at=now_aware()))
+    new_version = await repo.get_list_version(filter_by=filter_by)
+    assert new_version != version
+
+    await insert_user_feeds(NewUserFeedFactory.build(user_uid=user_uid, feed_id=feed2.id))
+    assert await repo.get_list_version(filter_by=filter_by) != new_version
+
+
+async def test_get_list_version_changes_on_update_of_older_feed(
+    repo: PostgresFeedRepository,
+    insert_feeds: InsertFeedsFixtureT,
+) -> None:
+    now = now_aware()
+    older_feed, _ = await insert_feeds(
+        NewFeedFactory.build(published_at=now - timedelta(days=2)),
+        NewFeedFactory.build(published_at=now),
+    )
+    version = await repo.get_list_version()
+
+    # neither the newest publication date nor the latest id move
+    await repo.update(
+        feed_id=older_feed.id,
+        updates=FeedUpdates(title="New title", published_at=now - timedelta(days=1)),
+    )
+    new_version = await repo.get_list_version()
+    assert new_version != version
+
+    await repo.update(feed_id=older_feed.id, updates=FeedUpdates(title="Newer title"))
+    assert await repo.get_list_version() != new_version
@@ -350,6 +350,30 @@ async def test_get_list(
     assert actual_feed_ids == expected_feed_ids
 
 
+async def test_count_by_state(
+    repo: PostgresFeedRefreshJobRepository,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_refresh_jobs: InsertRefreshJobsFixtureT,
+) -> None:
+    feed1, feed2, feed3 = await insert_feeds(
+        NewFeedFactory.build(url="https://example.com/feed.xml"),
+        NewFeedFactory.build(url="https://example.com/feed.rss"),
+        NewFeedFactory.build(url="https://example.com/feed.atom"),
+    )
+    await insert_refresh_jobs(
+        NewFeedRefreshJob(feed_id=feed1.id, state=FeedRefreshJobState.pending),
+        NewFeedRefreshJob(feed_id=feed2.id, state=FeedRefreshJobState.pending),
+        NewFeedRefreshJob(feed_id=feed3.id, state=FeedRefreshJobState.complete),
+    )
+
+    assert await repo.count_by_state() == {
+        FeedRefreshJobState.pending: 2,
+        FeedRefreshJobState.in_progress: 0,
+        FeedRefreshJobState.complete: 1,
+        FeedRefreshJobState.failed: 0,
+    }
+
+
 async def test_update_ok(
     repo: PostgresFeedRefreshJobRepository,
     insert_feeds: InsertFeedsFixtureT,
@@ -139,6 +139,38 @@ async def test_get_for_user_and_feed(
             await repo.get_for_user_and_feed(user_uid=user_uid, feed_id=feed_id)
 
 
+async def test_get_followed_feed_ids(
+    repo: PostgresUserFeedRepository,
+    insert_feeds: InsertFeedsFixtureT,
+    insert_user_feeds: InsertUserFeedsFixtureT,
+) -> None:
+    feed1, feed2, feed3 = await insert_feeds(
+        NewFeedFactory.build(url="https://example.com/feed.xml"),
+        NewFeedFactory.build(url="https://example.com/feed.rss"),
+        NewFeedFactory.build(url="https://example.com/feed.atom"),
+    )
+    await insert_user_feeds(
+        NewUserFeed(
+            user_uid=uuid.UUID("decade00-0000-4000-a000-000000000000"),
+            feed_id=feed1.id,
+        ),
+        NewUserFeed(
+            user_uid=uuid.UUID("decade00-0000-4000-a000-000000000000"),
+            feed_id=feed3.id,
+        ),
+        NewUserFeed(
+            user_uid=uuid.UUID("facade00-0000-4000-a000-000000000000"),
+            feed_id=feed2.id,
+        ),
+    )
+
+    got = await repo.get_followed_feed_ids(uuid.UUID("decade00-0000-4000-a000-000000000000"))
+    assert sorted(got) == [feed1.id, feed3.id]
+
+    got = await repo.get_followed_feed_ids(uuid.UUID("5ca1ab1e-0000-4000-a000-000000000000"))
+    assert got == []
+
+
 async def test_get_or_create_new(
     repo: PostgresUserFeedRepository,
     insert_feeds: InsertFeedsFixtureT,
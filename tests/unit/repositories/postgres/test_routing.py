@@ -0,0 +1,119 @@
+import contextvars
+import uuid
+from unittest import mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from awesome_rss_reader.data.postgres.routing import ReplicaRouter, bind_session, pin_to_primary
+
+
+def _commit(engine: AsyncEngine) -> None:
+    # the engines are never connected to, the commits are only dispatched to their listeners
+    engine.sync_engine.dispatch.commit(mock.Mock())
+
+
+def _in_session(key: uuid.UUID, router: ReplicaRouter) -> AsyncEngine:
+    def get_reader() -> AsyncEngine:
+        bind_session(key)
+        return router.get_reader()
+
+    # every api request runs in its own context
+    return contextvars.copy_context().run(get_reader)
+
+
+@pytest.fixture()
+def primary() -> AsyncEngine:
+    return create_async_engine("postgresql+asyncpg://primary/db")
+
+
+@pytest.fixture()
+def replica() -> AsyncEngine:
+    return create_async_engine("postgresql+asyncpg://replica/db")
+
+
+@pytest.fixture()
+def router(primary: AsyncEngine, replica: AsyncEngine) -> ReplicaRouter:
+    return ReplicaRouter(primary=primary, replica=replica, sticky_s=5, max_sessions=2)
+
+
+def test_reads_go_to_primary_without_replica(primary: AsyncEngine) -> None:
+    router = ReplicaRouter(primary=primary)
+
+    assert router.get_reader() is primary
+
+
+def test_reads_go_to_replica(replica: AsyncEngine, router: ReplicaRouter) -> None:
+    assert router.get_reader() is replica
+    assert _in_session(uuid.uuid4(), router) is replica
+
+
+def test_reads_within_transaction_go_to_primary(
+    primary: AsyncEngine,
+    replica: AsyncEngine,
+    router: ReplicaRouter,
+) -> None:
+    with pin_to_primary():
+        assert router.get_reader() is primary
+
+    assert router.get_reader() is replica
+
+
+def test_session_reads_go_to_primary_after_write(
+    primary: AsyncEngine,
+    replica: AsyncEngine,
+    router: ReplicaRouter,
+) -> None:
+    writer_uid, other_uid = uuid.uuid4(), uuid.uuid4()
+
+    def write() -> None:
+        bind_session(writer_uid)
+        _commit(primary)
+
+    contextvars.copy_context().run(write)
+
+    assert _in_session(writer_uid, router) is primary
+    # the other sessions are not affected by the writes of the one
+    assert _in_session(other_uid, router) is replica
+    assert router.get_reader() is replica
+
+
+def test_session_reads_go_back_to_replica_once_sticky_window_passes(
+    primary: AsyncEngine,
+    replica: AsyncEngine,
+    router: ReplicaRouter,
+) -> None:
+    session_uid = uuid.uuid4()
+
+    def write() -> None:
+        bind_session(session_uid)
+        _commit(primary)
+
+    with mock.patch("time.monotonic", return_value=100):
+        contextvars.copy_context().run(write)
+        assert _in_session(session_uid, router) is primary
+
+    with mock.patch("time.monotonic", return_value=105):
+        assert _in_session(session_uid, router) is replica
+
+
+def test_oldest_sticky_sessions_are_forgotten(
+    primary: AsyncEngine,
+    replica: AsyncEngine,
+    router: ReplicaRouter,
+) -> None:
+    session_uids = [uuid.uuid4() for _ in range(3)]
+
+    for session_uid in session_uids:
+
+        def write(key: uuid.UUID = session_uid) -> None:
+            bind_session(key)
+            _commit(primary)
+
+        contextvars.copy_context().run(write)
+
+    assert [_in_session(session_uid, router) for session_uid in session_uids] == [
+        replica,
+        primary,
+        primary,
+    ]
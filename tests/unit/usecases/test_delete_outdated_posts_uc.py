@@ -0,0 +1,119 @@
+from datetime import UTC, datetime
+from unittest import mock
+
+import pytest
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.feed import FeedFiltering, FeedOrdering
+from awesome_rss_reader.core.usecase.delete_outdated_posts import (
+    DeleteOutdatedPostsInput,
+    DeleteOutdatedPostsProgress,
+    DeleteOutdatedPostsUseCase,
+)
+from tests.factories import FeedFactory
+
+PUBLISHED_BEFORE = datetime(2023, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture()
+def uc(
+    container: Container,
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    replication_repository: mock.Mock,
+) -> DeleteOutdatedPostsUseCase:
+    replication_repository.get_lag_s.return_value = None
+    return container.use_cases.delete_outdated_posts()
+
+
+async def _run(uc: DeleteOutdatedPostsUseCase, **kwargs: int) -> list[DeleteOutdatedPostsProgress]:
+    uc_input = DeleteOutdatedPostsInput(published_before=PUBLISHED_BEFORE, keep_latest=10, **kwargs)
+    output = await uc.execute(uc_input)
+    return [progress async for progress in output.progress]
+
+
+async def test_posts_are_deleted_in_batches(
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    uc: DeleteOutdatedPostsUseCase,
+) -> None:
+    feeds = [FeedFactory.build(id=feed_id) for feed_id in (1, 2, 3)]
+    feed_repository.get_list.side_effect = [feeds[:2], feeds[2:], []]
+    # the first feeds take a couple of full batches to go over
+    post_repository.delete_outdated.side_effect = [5, 5, 2, 0]
+
+    progress = await _run(uc, batch_size=5, feeds_per_batch=2)
+
+    assert progress == [
+        DeleteOutdatedPostsProgress(last_feed_id=2, feeds=2, deleted_posts=12),
+        DeleteOutdatedPostsProgress(last_feed_id=3, feeds=3, deleted_posts=12),
+    ]
+    assert feed_repository.get_list.call_args_list == [
+        mock.call(
+            filter_by=FeedFiltering(id_after=after_id),
+            order_by=FeedOrdering.id_asc,
+            limit=2,
+            offset=0,
+        )
+        for after_id in (0, 2, 3)
+    ]
+    assert post_repository.delete_outdated.call_args_list == [
+        *[mock.call(feed_ids=[1, 2], published_before=PUBLISHED_BEFORE, keep_latest=10, limit=5)]
+        * 3,
+        mock.call(feed_ids=[3], published_before=PUBLISHED_BEFORE, keep_latest=10, limit=5),
+    ]
+
+
+async def test_interrupted_run_is_resumed(
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    uc: DeleteOutdatedPostsUseCase,
+) -> None:
+    feed_repository.get_list.side_effect = [[FeedFactory.build(id=43)], []]
+    post_repository.delete_outdated.return_value = 1
+
+    progress = await _run(uc, after_feed_id=42)
+
+    assert progress == [DeleteOutdatedPostsProgress(last_feed_id=43, feeds=1, deleted_posts=1)]
+    assert feed_repository.get_list.call_args_list[0].kwargs["filter_by"] == FeedFiltering(
+        id_after=42
+    )
+
+
+@mock.patch("awesome_rss_reader.core.usecase.delete_outdated_posts._replication_lag_poll_s", 0)
+async def test_lagging_replicas_are_waited_for(
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    replication_repository: mock.Mock,
+    uc: DeleteOutdatedPostsUseCase,
+) -> None:
+    feed_repository.get_list.side_effect = [[FeedFactory.build(id=1)], []]
+    post_repository.delete_outdated.side_effect = [1, 0]
+    replication_repository.get_lag_s.side_effect = [10.0, 5.0, 0.5, 0.5]
+
+    uc_input = DeleteOutdatedPostsInput(
+        published_before=PUBLISHED_BEFORE,
+        keep_latest=10,
+        batch_size=1,
+        max_replication_lag_s=1,
+    )
+    output = await uc.execute(uc_input)
+    progress = [progress async for progress in output.progress]
+
+    assert progress == [DeleteOutdatedPostsProgress(last_feed_id=1, feeds=1, deleted_posts=1)]
+    # the first batch is not followed by another one until the replicas catch up
+    assert replication_repository.get_lag_s.call_count == 4
+
+
+async def test_replication_lag_is_not_checked_unless_limited(
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    replication_repository: mock.Mock,
+    uc: DeleteOutdatedPostsUseCase,
+) -> None:
+    feed_repository.get_list.side_effect = [[FeedFactory.build(id=1)], []]
+    post_repository.delete_outdated.return_value = 0
+
+    await _run(uc)
+
+    replication_repository.get_lag_s.assert_not_called()
@@ -7,8 +7,8 @@ from awesome_rss_reader.application.di import Container
 from awesome_rss_reader.core.entity.feed_post import FeedPostFiltering, FeedPostOrdering
 from awesome_rss_reader.core.usecase.list_feed_posts import (
     ListFeedPostsInput,
-    ListFeedPostsOutput,
     ListFeedPostsUseCase,
+    PostsNotModifiedError,
 )
 from tests.factories import FeedPostFactory
 
@@ -110,20 +110,26 @@ async def test_happy_path(
         ),
     ]
     post_repository.get_list.return_value = posts
+    post_repository.get_list_version.return_value = "1:100"
 
     uc_result = await uc.execute(uc_input)
-    assert uc_result == ListFeedPostsOutput(posts=posts)
+    assert uc_result.posts == posts
+    assert uc_result.version is not None
 
     assert post_repository.get_list.call_args_list == [get_list_call]
+    post_repository.get_list_version.assert_called_once_with(
+        filter_by=post_repository.get_list.call_args.kwargs["filter_by"]
+    )
 
 
 async def test_empty_list(post_repository: mock.Mock, uc: ListFeedPostsUseCase) -> None:
     post_repository.get_list.return_value = []
+    post_repository.get_list_version.return_value = "None:None"
 
     uc_input = ListFeedPostsInput(offset=0, limit=100)
     uc_result = await uc.execute(uc_input)
 
-    assert uc_result == ListFeedPostsOutput(posts=[])
+    assert uc_result.posts == []
 
     post_repository.get_list.assert_called_once_with(
         order_by=FeedPostOrdering.published_at_desc,
@@ -137,3 +143,55 @@ async def test_empty_list(post_repository: mock.Mock, uc: ListFeedPostsUseCase)
         offset=0,
         limit=100,
     )
+
+
+async def test_known_version(post_repository: mock.Mock, uc: ListFeedPostsUseCase) -> None:
+    post_repository.get_list.return_value = FeedPostFactory.batch(2)
+    post_repository.get_list_version.return_value = "1:100"
+
+    uc_result = await uc.execute(ListFeedPostsInput(offset=0, limit=100))
+    assert uc_result.version is not None
+
+    post_repository.get_list.reset_mock()
+
+    uc_input = ListFeedPostsInput(offset=0, limit=100, known_versions=["foo", uc_result.version])
+    with pytest.raises(PostsNotModifiedError) as exc_info:
+        await uc.execute(uc_input)
+
+    assert exc_info.value.version == uc_result.version
+    post_repository.get_list.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "data_version, uc_input",
+    [
+        ("1:101", ListFeedPostsInput(offset=0, limit=100)),
+        ("1:100", ListFeedPostsInput(offset=100, limit=100)),
+        ("1:100", ListFeedPostsInput(offset=0, limit=100, feed_id=1)),
+        (
+            "1:100",
+            ListFeedPostsInput(
+                read_by=uuid.UUID("facade00-0000-4000-a000-000000000000"),
+                offset=0,
+                limit=100,
+            ),
+        ),
+    ],
+)
+async def test_version_changes(
+    post_repository: mock.Mock,
+    uc: ListFeedPostsUseCase,
+    data_version: str,
+    uc_input: ListFeedPostsInput,
+) -> None:
+    post_repository.get_list.return_value = []
+    post_repository.get_list_version.return_value = "1:100"
+
+    uc_result = await uc.execute(ListFeedPostsInput(offset=0, limit=100))
+    assert uc_result.version is not None
+
+    post_repository.get_list_version.return_value = data_version
+    uc_input.known_versions = [uc_result.version]
+
+    new_uc_result = await uc.execute(uc_input)
+    assert new_uc_result.version != uc_result.version
@@ -6,6 +6,7 @@ import pytest
 from awesome_rss_reader.application.di import Container
 from awesome_rss_reader.core.repository import feed as feed_repo
 from awesome_rss_reader.core.usecase.list_user_feeds import (
+    FeedsNotModifiedError,
     ListUserFeedsInput,
     ListUserFollowedFeedsUseCase,
 )
@@ -26,10 +27,18 @@ async def test_happy_path(feed_repository: mock.Mock, uc: ListUserFollowedFeedsU
     feeds = FeedFactory.batch(5)
 
     feed_repository.get_list.return_value = feeds
+    feed_repository.get_list_version.return_value = "5:10:2023-01-01 00:00:00+00:00:20"
 
     uc_input = ListUserFeedsInput(user_uid=user_uid, offset=0, limit=100)
     uc_result = await uc.execute(uc_input)
     assert uc_result.feeds == feeds
+    assert uc_result.version is not None
+
+    feed_repository.get_list_version.assert_called_once_with(
+        filter_by=feed_repo.FeedFiltering(
+            followed_by=user_uid,
+        ),
+    )
 
     feed_repository.get_list.assert_called_once_with(
         filter_by=feed_repo.FeedFiltering(
@@ -45,6 +54,7 @@ async def test_empty_list(feed_repository: mock.Mock, uc: ListUserFollowedFeedsU
     user_uid = uuid.uuid4()
 
     feed_repository.get_list.return_value = []
+    feed_repository.get_list_version.return_value = "0:None:None:None"
 
     uc_input = ListUserFeedsInput(user_uid=user_uid, offset=0, limit=100)
     uc_result = await uc.execute(uc_input)
@@ -59,3 +69,37 @@ async def test_empty_list(feed_repository: mock.Mock, uc: ListUserFollowedFeedsU
         offset=0,
         limit=100,
     )
+
+
+async def test_known_version(feed_repository: mock.Mock, uc: ListUserFollowedFeedsUseCase) -> None:
+    user_uid = uuid.uuid4()
+
+    feed_repository.get_list.return_value = FeedFactory.batch(2)
+    feed_repository.get_list_version.return_value = "2:10:2023-01-01 00:00:00+00:00:20"
+
+    uc_result = await uc.execute(ListUserFeedsInput(user_uid=user_uid, offset=0, limit=100))
+    assert uc_result.version is not None
+
+    feed_repository.get_list.reset_mock()
+
+    uc_input = ListUserFeedsInput(
+        user_uid=user_uid,
+        offset=0,
+        limit=100,
+        known_versions=[uc_result.version],
+    )
+    with pytest.raises(FeedsNotModifiedError) as exc_info:
+        await uc.execute(uc_input)
+
+    assert exc_info.value.version == uc_result.version
+    feed_repository.get_list.assert_not_called()
+
+    # another user with the same data version gets a different version
+    uc_input = ListUserFeedsInput(
+        user_uid=uuid.uuid4(),
+        offset=0,
+        limit=100,
+        known_versions=[uc_result.version],
+    )
+    other_uc_result = await uc.execute(uc_input)
+    assert other_uc_result.version != uc_result.version
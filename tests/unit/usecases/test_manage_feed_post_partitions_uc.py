@@ -0,0 +1,96 @@
+from datetime import UTC, datetime
+from unittest import mock
+
+import pytest
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.feed_post_partition import FeedPostPartition
+from awesome_rss_reader.core.usecase.manage_feed_post_partitions import (
+    ManageFeedPostPartitionsInput,
+    ManageFeedPostPartitionsOutput,
+    ManageFeedPostPartitionsUseCase,
+)
+
+
+def _partition(year: int, month: int) -> FeedPostPartition:
+    starts_at = datetime(year, month, 1, tzinfo=UTC)
+    ends_at = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=UTC)
+    return FeedPostPartition(
+        name=f"feed_post_y{year}m{month:02d}", starts_at=starts_at, ends_at=ends_at
+    )
+
+
+@pytest.fixture()
+def uc(container: Container, partition_repository: mock.Mock) -> ManageFeedPostPartitionsUseCase:
+    partition_repository.create.side_effect = lambda starts_at, ends_at: _partition(
+        starts_at.year, starts_at.month
+    )
+    partition_repository.delete_published_before.return_value = 0
+    return container.use_cases.manage_feed_post_partitions()
+
+
+@mock.patch(
+    "awesome_rss_reader.core.usecase.manage_feed_post_partitions.now_aware",
+    return_value=datetime(2006, 11, 2, 15, 4, 5, 999999, tzinfo=UTC),
+)
+async def test_missing_partitions_are_created(
+    now_aware_mock: mock.Mock,
+    partition_repository: mock.Mock,
+    uc: ManageFeedPostPartitionsUseCase,
+) -> None:
+    partition_repository.get_list.return_value = [_partition(2006, 10), _partition(2006, 11)]
+
+    output = await uc.execute(ManageFeedPostPartitionsInput(months_ahead=2))
+
+    # the partitions run over to the next year
+    assert output == ManageFeedPostPartitionsOutput(
+        created=[_partition(2006, 12), _partition(2007, 1)],
+    )
+    assert partition_repository.create.call_args_list == [
+        mock.call(
+            starts_at=datetime(2006, 12, 1, tzinfo=UTC), ends_at=datetime(2007, 1, 1, tzinfo=UTC)
+        ),
+        mock.call(
+            starts_at=datetime(2007, 1, 1, tzinfo=UTC), ends_at=datetime(2007, 2, 1, tzinfo=UTC)
+        ),
+    ]
+    # nothing is removed without a retention
+    partition_repository.drop.assert_not_called()
+    partition_repository.detach.assert_not_called()
+    partition_repository.delete_published_before.assert_not_called()
+
+
+@pytest.mark.parametrize("archive", [True, False])
+@mock.patch(
+    "awesome_rss_reader.core.usecase.manage_feed_post_partitions.now_aware",
+    return_value=datetime(2006, 3, 2, 15, 4, 5, 999999, tzinfo=UTC),
+)
+async def test_outdated_partitions_are_removed(
+    now_aware_mock: mock.Mock,
+    partition_repository: mock.Mock,
+    uc: ManageFeedPostPartitionsUseCase,
+    archive: bool,
+) -> None:
+    partitions = [_partition(2005, month) for month in (11, 12)] + [
+        _partition(2006, month) for month in (1, 2, 3)
+    ]
+    partition_repository.get_list.return_value = partitions
+    partition_repository.delete_published_before.return_value = 5
+
+    output = await uc.execute(
+        ManageFeedPostPartitionsInput(months_ahead=0, retention_months=2, archive=archive)
+    )
+
+    # the current month and the two months before it are kept
+    assert output == ManageFeedPostPartitionsOutput(
+        removed=[_partition(2005, 11), _partition(2005, 12)],
+        deleted_posts=5,
+    )
+    removed_with = partition_repository.detach if archive else partition_repository.drop
+    kept_with = partition_repository.drop if archive else partition_repository.detach
+    assert removed_with.call_args_list == [mock.call(partitions[0]), mock.call(partitions[1])]
+    kept_with.assert_not_called()
+    partition_repository.create.assert_not_called()
+    partition_repository.delete_published_before.assert_called_once_with(
+        datetime(2006, 1, 1, tzinfo=UTC)
+    )
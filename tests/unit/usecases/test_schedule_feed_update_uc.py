@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
 from unittest import mock
 
+import prometheus_client
 import pytest
 
 from awesome_rss_reader.application.di import Container
@@ -18,6 +19,7 @@ from tests.factories import FeedRefreshJobFactory
 
 @pytest.fixture()
 def uc(container: Container, job_repository: mock.Mock) -> ScheduleFeedUpdateUseCase:
+    job_repository.count_by_state.return_value = {state: 0 for state in FeedRefreshJobState}
     return container.use_cases.schedule_feed_update()
 
 
@@ -123,3 +125,31 @@ async def test_no_jobs_scheduled(
         old_state=FeedRefreshJobState.complete,
         new_state=FeedRefreshJobState.pending,
     )
+
+
+async def test_queue_depth_is_reported(
+    job_repository: mock.Mock,
+    uc: ScheduleFeedUpdateUseCase,
+) -> None:
+    job_repository.count_by_state.return_value = {
+        FeedRefreshJobState.pending: 10,
+        FeedRefreshJobState.in_progress: 2,
+        FeedRefreshJobState.complete: 100,
+        FeedRefreshJobState.failed: 0,
+    }
+    job_repository.get_list.return_value = []
+
+    await uc.execute(ScheduleFeedUpdateInput(batch_size=100))
+
+    # fmt: off
+    job_counts = {
+        state: prometheus_client.REGISTRY.get_sample_value("feed_refresh_jobs", {"state": state})
+        for state in ["pending", "in_progress", "complete", "failed"]
+    }
+    # fmt: on
+    assert job_counts == {
+        "pending": 10,
+        "in_progress": 2,
+        "complete": 100,
+        "failed": 0,
+    }
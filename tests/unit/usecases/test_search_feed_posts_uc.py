@@ -0,0 +1,93 @@
+import uuid
+from unittest import mock
+
+import pytest
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.feed_post import (
+    FeedPostFiltering,
+    FeedPostSearchCursor,
+    FeedPostSearchHit,
+)
+from awesome_rss_reader.core.usecase.search_feed_posts import (
+    InvalidSearchCursorError,
+    SearchFeedPostsInput,
+    SearchFeedPostsUseCase,
+)
+from tests.factories import FeedPostFactory
+
+
+@pytest.fixture()
+def uc(container: Container, post_repository: mock.Mock) -> SearchFeedPostsUseCase:
+    return container.use_cases.search_feed_posts()
+
+
+async def test_pages_are_fetched_by_cursor(
+    post_repository: mock.Mock,
+    uc: SearchFeedPostsUseCase,
+) -> None:
+    user_uid = uuid.uuid4()
+    posts = FeedPostFactory.batch(3)
+    post_repository.search.side_effect = [
+        [
+            FeedPostSearchHit(post=post, rank=rank)
+            for post, rank in zip(posts[:2], (0.5, 0.25), strict=True)
+        ],
+        [FeedPostSearchHit(post=posts[2], rank=0.125)],
+    ]
+
+    first_page = await uc.execute(
+        SearchFeedPostsInput(query="python", followed_by=user_uid, not_read_by=user_uid, limit=2)
+    )
+    assert first_page.posts == posts[:2]
+    assert first_page.next_cursor is not None
+
+    second_page = await uc.execute(
+        SearchFeedPostsInput(
+            query="python",
+            followed_by=user_uid,
+            not_read_by=user_uid,
+            cursor=first_page.next_cursor,
+            limit=2,
+        )
+    )
+    # the short page is the last one
+    assert second_page.posts == posts[2:]
+    assert second_page.next_cursor is None
+
+    filter_by = FeedPostFiltering(followed_by=user_uid, not_read_by=user_uid)
+    assert post_repository.search.call_args_list == [
+        mock.call(query="python", filter_by=filter_by, after=None, limit=2),
+        mock.call(
+            query="python",
+            filter_by=filter_by,
+            after=FeedPostSearchCursor(
+                rank=0.25, published_at=posts[1].published_at, id=posts[1].id
+            ),
+            limit=2,
+        ),
+    ]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm90IGpzb24=", "eyJyYW5rIjogMX0="])
+async def test_invalid_cursor(
+    post_repository: mock.Mock,
+    uc: SearchFeedPostsUseCase,
+    cursor: str,
+) -> None:
+    with pytest.raises(InvalidSearchCursorError):
+        await uc.execute(SearchFeedPostsInput(query="python", cursor=cursor, limit=10))
+
+    post_repository.search.assert_not_called()
+
+
+def test_mutually_exclusive_filters() -> None:
+    user_uid = uuid.uuid4()
+
+    with pytest.raises(ValueError, match="followed_by"):
+        SearchFeedPostsInput(
+            query="python", followed_by=user_uid, not_followed_by=user_uid, limit=1
+        )
+
+    with pytest.raises(ValueError, match="read_by"):
+        SearchFeedPostsInput(query="python", read_by=user_uid, not_read_by=user_uid, limit=1)
@@ -0,0 +1,73 @@
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from unittest import mock
+
+import pytest
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated
+from awesome_rss_reader.core.usecase.stream_feed_posts import (
+    StreamFeedPostsInput,
+    StreamFeedPostsUseCase,
+)
+
+
+@pytest.fixture()
+def uc(
+    container: Container,
+    user_feed_repository: mock.Mock,
+    post_event_repository: mock.Mock,
+) -> StreamFeedPostsUseCase:
+    return container.use_cases.stream_feed_posts()
+
+
+def _subscription(*events: FeedPostsCreated) -> mock.Mock:
+    @asynccontextmanager
+    async def subscribe() -> AsyncIterator[AsyncIterator[FeedPostsCreated]]:
+        async def iter_events() -> AsyncIterator[FeedPostsCreated]:
+            for event in events:
+                yield event
+
+        yield iter_events()
+
+    return mock.Mock(side_effect=subscribe)
+
+
+async def test_happy_path(
+    uc: StreamFeedPostsUseCase,
+    user_feed_repository: mock.Mock,
+    post_event_repository: mock.Mock,
+) -> None:
+    post_event_repository.subscribe = _subscription(
+        FeedPostsCreated(feed_id=1, post_ids=[10, 11]),
+        FeedPostsCreated(feed_id=2, post_ids=[12]),
+        FeedPostsCreated(feed_id=3, post_ids=[13]),
+        FeedPostsCreated(feed_id=1, post_ids=[14]),
+    )
+    user_feed_repository.get_followed_feed_ids.return_value = [1, 3]
+
+    user_uid = uuid.UUID("decade00-0000-4000-a000-000000000000")
+    uc_result = await uc.execute(StreamFeedPostsInput(user_uid=user_uid))
+
+    events = [event async for event in uc_result.events]
+    assert events == [
+        FeedPostsCreated(feed_id=1, post_ids=[10, 11]),
+        FeedPostsCreated(feed_id=3, post_ids=[13]),
+        FeedPostsCreated(feed_id=1, post_ids=[14]),
+    ]
+    # the followed feeds are looked up once for the whole refresh interval
+    user_feed_repository.get_followed_feed_ids.assert_called_once_with(user_uid)
+
+
+async def test_no_events(
+    uc: StreamFeedPostsUseCase,
+    user_feed_repository: mock.Mock,
+    post_event_repository: mock.Mock,
+) -> None:
+    post_event_repository.subscribe = _subscription()
+
+    uc_result = await uc.execute(StreamFeedPostsInput(user_uid=uuid.uuid4()))
+
+    assert [event async for event in uc_result.events] == []
+    user_feed_repository.get_followed_feed_ids.assert_not_called()
@@ -1,10 +1,14 @@
+import asyncio
 import uuid
 from datetime import UTC, datetime
 from unittest import mock
 
+import prometheus_client
 import pytest
+from structlog.testing import capture_logs
 
 from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.settings import ApplicationSettings
 from awesome_rss_reader.core.entity.feed import FeedFiltering, FeedUpdates
 from awesome_rss_reader.core.entity.feed_content import (
     FeedContentBatchRequest,
@@ -12,8 +16,9 @@ from awesome_rss_reader.core.entity.feed_content import (
     FeedContentRequest,
     FeedContentResult,
     FeedContentResultItem,
+    FeedContentStats,
 )
-from awesome_rss_reader.core.entity.feed_post import NewFeedPost
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated, NewFeedPost
 from awesome_rss_reader.core.entity.feed_refresh_job import (
     FeedRefreshJobFiltering,
     FeedRefreshJobOrdering,
@@ -25,7 +30,29 @@ from awesome_rss_reader.core.usecase.update_feed_content import (
     UpdateFeedContentInput,
     UpdateFeedContentUseCase,
 )
-from tests.factories import FeedFactory, FeedRefreshJobFactory
+from tests.factories import FeedFactory, FeedPostFactory, FeedRefreshJobFactory
+
+
+def _get_metric_samples() -> dict[str, float]:
+    registry = prometheus_client.REGISTRY
+    samples = {
+        "posts_inserted": registry.get_sample_value("feed_posts_total", {"outcome": "inserted"}),
+        "posts_conflicted": registry.get_sample_value(
+            "feed_posts_total", {"outcome": "conflicted"}
+        ),
+        "unchanged": registry.get_sample_value("feed_unchanged_total"),
+        "retries": registry.get_sample_value("feed_refresh_job_retries_total"),
+        "get_feeds_stage": registry.get_sample_value(
+            "feed_update_stage_duration_seconds_count", {"stage": "get_feeds"}
+        ),
+        "fetch_stage": registry.get_sample_value(
+            "feed_update_stage_duration_seconds_count", {"stage": "fetch"}
+        ),
+        "process_stage": registry.get_sample_value(
+            "feed_update_stage_duration_seconds_count", {"stage": "process"}
+        ),
+    }
+    return {name: value or 0 for name, value in samples.items()}
 
 
 @pytest.fixture()
@@ -35,6 +62,7 @@ def uc(
     feed_repository: mock.Mock,
     feed_content_repository: mock.Mock,
     post_repository: mock.Mock,
+    post_event_repository: mock.Mock,
     user_feed_repository: mock.Mock,
 ) -> UpdateFeedContentUseCase:
     return container.use_cases.update_feed_content()
@@ -60,6 +88,7 @@ async def test_happy_path(
     job_repository: mock.Mock,
     feed_repository: mock.Mock,
     post_repository: mock.Mock,
+    post_event_repository: mock.Mock,
     feed_content_repository: mock.Mock,
 ) -> None:
     feed1, feed2, feed3, feed4, feed5 = [
@@ -160,6 +189,8 @@ async def test_happy_path(
     job_repository.transit_state.side_effect = received_jobs
     job_repository.transit_state_batch.return_value = received_jobs
     feed_repository.get_list.return_value = [feed1, feed2, feed3, feed5]
+    # one of the posts is already known
+    post_repository.create_many.return_value = [FeedPostFactory.build(id=20, feed_id=2)]
     feed_content_repository.fetch_many.return_value = FeedContentBatchResponse(
         results={
             uuid.UUID("decade00-0000-4000-a000-000000000000"): FeedContentResult(
@@ -194,6 +225,8 @@ async def test_happy_path(
         },
     )
 
+    metrics_before = _get_metric_samples()
+
     uc_input = UpdateFeedContentInput(batch_size=100)
     await uc.execute(uc_input)
 
@@ -223,6 +256,8 @@ async def test_happy_path(
         FeedContentBatchRequest(
             timeout_s=10,
             max_body_size_b=512 * 1024,
+            max_compressed_body_size_b=256 * 1024,
+            stop_after_outdated=20,
             requests=[
                 FeedContentRequest(
                     request_id=uuid.UUID("decade00-0000-4000-a000-000000000000"),
@@ -331,5 +366,292 @@ async def test_happy_path(
                 guid="http://example.com/feed2/2",
                 published_at=datetime(2023, 9, 9, 9, 9, 9, 999999, tzinfo=UTC),
             ),
-        ]
+        ],
+        max_posts_per_feed=0,
+    )
+
+    # only the posts that were actually created are announced
+    post_event_repository.publish.assert_called_once_with(
+        FeedPostsCreated(feed_id=2, post_ids=[20])
+    )
+
+    metrics_after = _get_metric_samples()
+    assert {name: metrics_after[name] - metrics_before[name] for name in metrics_after} == {
+        "posts_inserted": 1,
+        "posts_conflicted": 1,
+        "unchanged": 1,
+        "retries": 1,
+        # one batch is timed per stage
+        "get_feeds_stage": 1,
+        "fetch_stage": 1,
+        "process_stage": 1,
+    }
+
+
+async def test_publish_failure_does_not_fail_job(
+    uc: UpdateFeedContentUseCase,
+    job_repository: mock.Mock,
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    post_event_repository: mock.Mock,
+    feed_content_repository: mock.Mock,
+) -> None:
+    feed = FeedFactory.build(id=1)
+    job = FeedRefreshJobFactory.build(id=1, feed_id=feed.id, state=FeedRefreshJobState.pending)
+    received_job = FeedRefreshJobFactory.build(
+        id=1,
+        feed_id=feed.id,
+        state=FeedRefreshJobState.in_progress,
+    )
+
+    job_repository.get_list.return_value = [job]
+    job_repository.transit_state_batch.return_value = [received_job]
+    feed_repository.get_list.return_value = [feed]
+    feed_content_repository.fetch_many.side_effect = lambda request: FeedContentBatchResponse(
+        results={
+            request.requests[0].request_id: FeedContentResult(
+                title="Feed",
+                published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                items=[
+                    FeedContentResultItem(
+                        title="Post",
+                        summary=None,
+                        url="http://example.com/feed/1",  # type: ignore[arg-type]
+                        guid="http://example.com/feed/1",
+                        published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                    ),
+                ],
+            ),
+        },
+        errors={},
+    )
+    post_repository.create_many.return_value = [FeedPostFactory.build(id=10, feed_id=feed.id)]
+    post_event_repository.publish.side_effect = Exception("connection is closed")
+
+    await uc.execute(UpdateFeedContentInput(batch_size=100))
+
+    post_event_repository.publish.assert_called_once_with(
+        FeedPostsCreated(feed_id=feed.id, post_ids=[10])
+    )
+    # the job is complete and it's not retried
+    job_repository.transit_state.assert_called_once_with(
+        job_id=1,
+        old_state=FeedRefreshJobState.in_progress,
+        new_state=FeedRefreshJobState.complete,
+    )
+    job_repository.update.assert_called_once_with(
+        job_id=1,
+        updates=FeedRefreshJobUpdates(retries=0),
+    )
+
+
+@pytest.mark.parametrize(
+    "stats, item_count, expected_slow",
+    [
+        (FeedContentStats(download_s=0.1, parse_s=0.01, size_b=1024), 1, None),
+        (FeedContentStats(download_s=6, parse_s=0.01, size_b=1024), 1, ["download"]),
+        (FeedContentStats(download_s=0.1, parse_s=2, size_b=1024), 501, ["parse", "item_count"]),
+        (None, 501, ["item_count"]),
+    ],
+)
+async def test_slow_feeds_are_logged(
+    uc: UpdateFeedContentUseCase,
+    job_repository: mock.Mock,
+    feed_repository: mock.Mock,
+    post_repository: mock.Mock,
+    feed_content_repository: mock.Mock,
+    stats: FeedContentStats | None,
+    item_count: int,
+    expected_slow: list[str] | None,
+) -> None:
+    feed = FeedFactory.build(id=1)
+    job = FeedRefreshJobFactory.build(id=1, feed_id=feed.id, state=FeedRefreshJobState.pending)
+    received_job = FeedRefreshJobFactory.build(
+        id=1,
+        feed_id=feed.id,
+        state=FeedRefreshJobState.in_progress,
+    )
+
+    job_repository.get_list.return_value = [job]
+    job_repository.transit_state_batch.return_value = [received_job]
+    feed_repository.get_list.return_value = [feed]
+    feed_content_repository.fetch_many.side_effect = lambda request: FeedContentBatchResponse(
+        results={
+            request.requests[0].request_id: FeedContentResult(
+                title="Feed",
+                published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                items=[
+                    FeedContentResultItem(
+                        title="Post",
+                        summary=None,
+                        url=f"http://example.com/feed/{i}",  # type: ignore[arg-type]
+                        guid=f"http://example.com/feed/{i}",
+                        published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                    )
+                    for i in range(item_count)
+                ],
+                stats=stats,
+            ),
+        },
+        errors={},
+    )
+    post_repository.create_many.return_value = []
+
+    with capture_logs() as logs:
+        await uc.execute(UpdateFeedContentInput(batch_size=100))
+
+    slow_logs = [log for log in logs if log["event"] == "Slow feed update"]
+    if expected_slow is None:
+        assert slow_logs == []
+    else:
+        assert len(slow_logs) == 1
+        assert slow_logs[0]["log_level"] == "warning"
+        assert slow_logs[0]["feed_id"] == feed.id
+        assert slow_logs[0]["slow"] == expected_slow
+        assert slow_logs[0]["items"] == item_count
+
+    # the batch summary has every stage the batch went through
+    (batch_log,) = (log for log in logs if log["event"] == "Feed update batch timings")
+    assert {"total_s", "get_jobs_s", "receive_jobs_s", "get_feeds_s", "fetch_s", "process_s"} <= (
+        set(batch_log)
+    )
+
+
+@mock.patch(
+    "awesome_rss_reader.core.usecase.update_feed_content.now_aware",
+    return_value=datetime(2006, 3, 2, 15, 4, 5, 999999, tzinfo=UTC),
+)
+async def test_posts_past_retention_are_not_fetched(
+    now_aware_mock: mock.Mock,
+    container: Container,
+    job_repository: mock.Mock,
+    feed_repository: mock.Mock,
+    feed_content_repository: mock.Mock,
+    post_repository: mock.Mock,
+    post_event_repository: mock.Mock,
+) -> None:
+    feeds = [
+        FeedFactory.build(id=1, published_at=None),
+        FeedFactory.build(id=2, published_at=datetime(2005, 1, 1, tzinfo=UTC)),
+        FeedFactory.build(id=3, published_at=datetime(2006, 2, 1, tzinfo=UTC)),
+    ]
+    jobs = [
+        FeedRefreshJobFactory.build(id=feed.id, feed_id=feed.id, state=FeedRefreshJobState.pending)
+        for feed in feeds
+    ]
+
+    job_repository.get_list.return_value = jobs
+    job_repository.transit_state_batch.return_value = jobs
+    feed_repository.get_list.return_value = feeds
+    feed_content_repository.fetch_many.return_value = FeedContentBatchResponse(
+        results={}, errors={}
     )
+
+    with container.settings.app.override(ApplicationSettings(feed_post_retention_months=2)):
+        uc = container.use_cases.update_feed_content()
+        await uc.execute(UpdateFeedContentInput(batch_size=100))
+
+    request = feed_content_repository.fetch_many.call_args[0][0]
+    assert [req.published_since for req in request.requests] == [
+        datetime(2006, 1, 1, tzinfo=UTC),
+        datetime(2006, 1, 1, tzinfo=UTC),
+        datetime(2006, 2, 1, tzinfo=UTC),
+    ]
+
+
+async def test_posts_are_capped_per_feed(
+    container: Container,
+    job_repository: mock.Mock,
+    feed_repository: mock.Mock,
+    feed_content_repository: mock.Mock,
+    post_repository: mock.Mock,
+    post_event_repository: mock.Mock,
+) -> None:
+    feed = FeedFactory.build(id=1)
+    job = FeedRefreshJobFactory.build(id=1, feed_id=feed.id, state=FeedRefreshJobState.pending)
+
+    job_repository.get_list.return_value = [job]
+    job_repository.transit_state_batch.return_value = [job]
+    feed_repository.get_list.return_value = [feed]
+    feed_content_repository.fetch_many.side_effect = lambda request: FeedContentBatchResponse(
+        results={
+            request.requests[0].request_id: FeedContentResult(
+                title="Feed",
+                published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                items=[
+                    FeedContentResultItem(
+                        title="Post",
+                        summary=None,
+                        url="http://example.com/feed/1",  # type: ignore[arg-type]
+                        guid="http://example.com/feed/1",
+                        published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                    ),
+                ],
+            ),
+        },
+        errors={},
+    )
+    post_repository.create_many.return_value = []
+
+    with container.settings.app.override(ApplicationSettings(max_posts_per_feed=100)):
+        uc = container.use_cases.update_feed_content()
+        await uc.execute(UpdateFeedContentInput(batch_size=100))
+
+    # the feed is trimmed by the same call that saves its new posts
+    post_repository.create_many.assert_called_once()
+    assert post_repository.create_many.call_args.kwargs == {"max_posts_per_feed": 100}
+
+
+async def test_saves_are_limited(
+    uc: UpdateFeedContentUseCase,
+    job_repository: mock.Mock,
+    feed_repository: mock.Mock,
+    feed_content_repository: mock.Mock,
+    post_repository: mock.Mock,
+) -> None:
+    feeds = [FeedFactory.build(id=feed_id) for feed_id in range(1, 6)]
+    jobs = [
+        FeedRefreshJobFactory.build(id=feed.id, feed_id=feed.id, state=FeedRefreshJobState.pending)
+        for feed in feeds
+    ]
+
+    job_repository.get_list.return_value = jobs
+    job_repository.transit_state_batch.return_value = jobs
+    feed_repository.get_list.return_value = feeds
+    feed_content_repository.fetch_many.side_effect = lambda request: FeedContentBatchResponse(
+        results={
+            feed_request.request_id: FeedContentResult(
+                title="Feed",
+                published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                items=[
+                    FeedContentResultItem(
+                        title="Post",
+                        summary=None,
+                        url=feed_request.url,  # type: ignore[arg-type]
+                        guid=feed_request.url,
+                        published_at=datetime(2023, 1, 1, 1, 1, 1, 999999, tzinfo=UTC),
+                    ),
+                ],
+            )
+            for feed_request in request.requests
+        },
+        errors={},
+    )
+
+    saving, max_saving = 0, 0
+
+    async def create_many(*_args: object, **_kwargs: object) -> list[object]:
+        nonlocal saving, max_saving
+        saving += 1
+        max_saving = max(max_saving, saving)
+        # let the other saves catch up, if they are let to
+        await asyncio.sleep(0.01)
+        saving -= 1
+        return []
+
+    post_repository.create_many.side_effect = create_many
+
+    await uc.execute(UpdateFeedContentInput(batch_size=100, max_concurrent_saves=2))
+
+    assert post_repository.create_many.call_count == 5
+    assert max_saving == 2
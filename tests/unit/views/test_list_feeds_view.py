@@ -7,6 +7,7 @@ from starlette.testclient import TestClient
 from awesome_rss_reader.application.di import Container
 from awesome_rss_reader.core.entity.user import User
 from awesome_rss_reader.core.usecase.list_user_feeds import (
+    FeedsNotModifiedError,
     ListUserFeedsInput,
     ListUserFeedsOutput,
     ListUserFollowedFeedsUseCase,
@@ -110,3 +111,47 @@ async def test_list_feeds_empty(
     assert resp.json() == []
 
     uc.execute.assert_called_once_with(ListUserFeedsInput(user_uid=user.uid, offset=0, limit=100))
+
+
+async def test_list_feeds_etag(
+    user: User,
+    user_api_client: TestClient,
+    uc: mock.Mock,
+) -> None:
+    uc.execute.return_value = ListUserFeedsOutput(feeds=FeedFactory.batch(2), version="abcdef")
+
+    resp = user_api_client.get("/api/feeds")
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == '"abcdef"'
+
+
+@pytest.mark.parametrize(
+    "if_none_match, known_versions",
+    [
+        ('"abcdef"', ["abcdef"]),
+        ('W/"abcdef"', ["abcdef"]),
+        ('"foobar", W/"abcdef"', ["foobar", "abcdef"]),
+    ],
+)
+async def test_list_feeds_not_modified(
+    user: User,
+    user_api_client: TestClient,
+    uc: mock.Mock,
+    if_none_match: str,
+    known_versions: list[str],
+) -> None:
+    uc.execute.side_effect = FeedsNotModifiedError("abcdef")
+
+    resp = user_api_client.get("/api/feeds", headers={"If-None-Match": if_none_match})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == '"abcdef"'
+    assert resp.content == b""
+
+    uc.execute.assert_called_once_with(
+        ListUserFeedsInput(
+            user_uid=user.uid,
+            offset=0,
+            limit=100,
+            known_versions=known_versions,
+        )
+    )
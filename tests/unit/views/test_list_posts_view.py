@@ -13,6 +13,7 @@ from awesome_rss_reader.core.usecase.list_feed_posts import (
     ListFeedPostsInput,
     ListFeedPostsOutput,
     ListFeedPostsUseCase,
+    PostsNotModifiedError,
 )
 from tests.factories import FeedPostFactory, UserFactory
 
@@ -242,3 +243,26 @@ async def test_list_posts_empty(user_api_client: TestClient, uc: mock.Mock) -> N
             limit=100,
         )
     )
+
+
+async def test_list_posts_etag(user_api_client: TestClient, uc: mock.Mock) -> None:
+    uc.execute.return_value = ListFeedPostsOutput(posts=FeedPostFactory.batch(2), version="abcdef")
+
+    resp = user_api_client.get("/api/posts")
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == '"abcdef"'
+
+
+async def test_list_posts_not_modified(user_api_client: TestClient, uc: mock.Mock) -> None:
+    uc.execute.side_effect = PostsNotModifiedError("abcdef")
+
+    resp = user_api_client.get(
+        "/api/posts",
+        params={"read_status": "unread"},
+        headers={"If-None-Match": '"abcdef"'},
+    )
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == '"abcdef"'
+    assert resp.content == b""
+
+    assert uc.execute.call_args.args[0].known_versions == ["abcdef"]
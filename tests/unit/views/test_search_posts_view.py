@@ -0,0 +1,117 @@
+import uuid
+from collections.abc import Callable
+from typing import Any
+from unittest import mock
+
+import pytest
+from starlette.testclient import TestClient
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.core.entity.user import User
+from awesome_rss_reader.core.usecase.search_feed_posts import (
+    InvalidSearchCursorError,
+    SearchFeedPostsInput,
+    SearchFeedPostsOutput,
+    SearchFeedPostsUseCase,
+)
+from tests.factories import FeedPostFactory, UserFactory
+
+USER_UID = uuid.UUID("facade00-0000-4000-a000-000000000000")
+
+
+@pytest.fixture()
+def uc(container: Container) -> mock.Mock:
+    uc = mock.Mock(spec=SearchFeedPostsUseCase)
+
+    with container.use_cases.search_feed_posts.override(uc):
+        yield uc
+
+
+async def test_search_posts_happy_path(user_api_client: TestClient, uc: mock.Mock) -> None:
+    posts = FeedPostFactory.batch(2)
+    uc.execute.return_value = SearchFeedPostsOutput(posts=posts, next_cursor="next-page")
+
+    resp = user_api_client.get("/api/posts/search", params={"q": "python"})
+
+    assert resp.status_code == 200
+    assert [post["id"] for post in resp.json()] == [post.id for post in posts]
+    assert resp.headers["X-Next-Cursor"] == "next-page"
+
+    uc.execute.assert_called_once_with(SearchFeedPostsInput(query="python", limit=100))
+
+
+async def test_search_posts_last_page(user_api_client: TestClient, uc: mock.Mock) -> None:
+    uc.execute.return_value = SearchFeedPostsOutput(posts=[])
+
+    resp = user_api_client.get("/api/posts/search", params={"q": "python", "cursor": "abc"})
+
+    assert resp.status_code == 200
+    assert resp.json() == []
+    assert "X-Next-Cursor" not in resp.headers
+    assert uc.execute.call_args.args[0].cursor == "abc"
+
+
+@pytest.mark.parametrize(
+    "query_params, expected_input",
+    [
+        (
+            {"q": "python", "read_status": "unread", "follow_status": "following", "limit": 5},
+            SearchFeedPostsInput(
+                query="python", followed_by=USER_UID, not_read_by=USER_UID, limit=5
+            ),
+        ),
+        (
+            {"q": "python", "read_status": "read", "follow_status": "not_following"},
+            SearchFeedPostsInput(
+                query="python", not_followed_by=USER_UID, read_by=USER_UID, limit=100
+            ),
+        ),
+        (
+            {"q": "python", "feed_id": 10},
+            SearchFeedPostsInput(query="python", feed_id=10, limit=100),
+        ),
+    ],
+)
+async def test_search_posts_filters(
+    api_client_factory: Callable[[User], TestClient],
+    uc: mock.Mock,
+    query_params: dict[str, Any],
+    expected_input: SearchFeedPostsInput,
+) -> None:
+    api_client = api_client_factory(UserFactory.build(uid=USER_UID))
+    uc.execute.return_value = SearchFeedPostsOutput(posts=[])
+
+    resp = api_client.get("/api/posts/search", params=query_params)
+
+    assert resp.status_code == 200
+    uc.execute.assert_called_once_with(expected_input)
+
+
+@pytest.mark.parametrize(
+    "query_params",
+    [
+        {},
+        {"q": ""},
+        {"q": "x" * 257},
+        {"q": "python", "limit": 0},
+        {"q": "python", "limit": 101},
+    ],
+)
+async def test_search_posts_validate_params(
+    user_api_client: TestClient,
+    uc: mock.Mock,
+    query_params: dict[str, Any],
+) -> None:
+    resp = user_api_client.get("/api/posts/search", params=query_params)
+
+    assert resp.status_code == 422
+    uc.execute.assert_not_called()
+
+
+async def test_search_posts_invalid_cursor(user_api_client: TestClient, uc: mock.Mock) -> None:
+    uc.execute.side_effect = InvalidSearchCursorError("Invalid search cursor")
+
+    resp = user_api_client.get("/api/posts/search", params={"q": "python", "cursor": "nope"})
+
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,76 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest import mock
+
+import pytest
+from starlette.testclient import TestClient
+
+from awesome_rss_reader.application.di import Container
+from awesome_rss_reader.application.settings import ApplicationSettings
+from awesome_rss_reader.core.entity.feed_post import FeedPostsCreated
+from awesome_rss_reader.core.entity.user import User
+from awesome_rss_reader.core.usecase.stream_feed_posts import (
+    StreamFeedPostsInput,
+    StreamFeedPostsOutput,
+    StreamFeedPostsUseCase,
+)
+
+
+@pytest.fixture()
+def uc(container: Container) -> mock.Mock:
+    uc = mock.Mock(spec=StreamFeedPostsUseCase)
+
+    with container.use_cases.stream_feed_posts.override(uc):
+        yield uc
+
+
+async def _iter_events(
+    *events: FeedPostsCreated,
+    delay_s: float = 0,
+) -> AsyncIterator[FeedPostsCreated]:
+    for event in events:
+        await asyncio.sleep(delay_s)
+        yield event
+
+
+async def test_stream_posts_happy_path(
+    user: User,
+    user_api_client: TestClient,
+    uc: mock.Mock,
+) -> None:
+    uc.execute.return_value = StreamFeedPostsOutput(
+        events=_iter_events(
+            FeedPostsCreated(feed_id=1, post_ids=[10, 11]),
+            FeedPostsCreated(feed_id=3, post_ids=[12]),
+        ),
+    )
+
+    resp = user_api_client.get("/api/posts/stream")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.headers["cache-control"] == "no-cache"
+    assert resp.text == (
+        'event: posts\ndata: {"feed_id":1,"post_ids":[10,11]}\n\n'
+        'event: posts\ndata: {"feed_id":3,"post_ids":[12]}\n\n'
+    )
+
+    uc.execute.assert_called_once_with(StreamFeedPostsInput(user_uid=user.uid))
+
+
+async def test_stream_posts_heartbeat(
+    container: Container,
+    user_api_client: TestClient,
+    uc: mock.Mock,
+) -> None:
+    uc.execute.return_value = StreamFeedPostsOutput(
+        events=_iter_events(FeedPostsCreated(feed_id=1, post_ids=[10]), delay_s=0.2),
+    )
+
+    with container.settings.app.override(ApplicationSettings(post_stream_heartbeat_s=0.05)):
+        resp = user_api_client.get("/api/posts/stream")
+
+    assert resp.status_code == 200
+    # the stream stays alive while waiting for the event
+    assert resp.text.startswith(": heartbeat\n\n")
+    assert resp.text.endswith('event: posts\ndata: {"feed_id":1,"post_ids":[10]}\n\n')